@@ -11,43 +11,131 @@ class PredictionsDashboard
 {
     private const MARGIN_THRESHOLD = 5.0;
 
-    private $predictionHistoryFile;
+    private $predictionHistoryDir;
+    private $rollupsFile;
     private $teamManager;
     private $injuryReport;
 
     public function __construct()
     {
-        $this->predictionHistoryFile = 'CSVFiles/prediction_history.json';
+        $this->predictionHistoryDir = 'CSVFiles/prediction_history';
+        $this->rollupsFile = 'CSVFiles/prediction_rollups.json';
         $this->teamManager = new TeamManager();
         $this->injuryReport = new InjuryReport();
     }
 
     /**
-     * Load prediction history from JSON
+     * Load prediction history from the partitioned JSON files.
+     * Only partitions overlapping [$startDate, $endDate] (YYYY-MM-DD, null = open) are read.
      */
-    private function loadPredictionHistory(): array
+    private function loadPredictionHistory(?string $startDate = null, ?string $endDate = null): array
     {
-        if (!file_exists($this->predictionHistoryFile)) {
+        $manifestFile = $this->predictionHistoryDir . '/manifest.json';
+        if (!file_exists($manifestFile)) {
             return [];
         }
 
-        $json = file_get_contents($this->predictionHistoryFile);
-        $data = json_decode($json, true);
-        
-        return $data ?? [];
+        $manifest = json_decode(file_get_contents($manifestFile), true);
+        $predictions = [];
+        foreach ($manifest['partitions'] ?? [] as $partition) {
+            if ($startDate !== null && $partition['last_date'] < $startDate) {
+                continue;
+            }
+            if ($endDate !== null && $partition['first_date'] > $endDate) {
+                continue;
+            }
+
+            $file = $this->predictionHistoryDir . '/' . $partition['path'];
+            if (!file_exists($file)) {
+                continue;
+            }
+            foreach (json_decode(file_get_contents($file), true) ?? [] as $pred) {
+                if (($startDate === null || $pred['game_date'] >= $startDate) &&
+                    ($endDate === null || $pred['game_date'] <= $endDate)) {
+                    $predictions[] = $pred;
+                }
+            }
+        }
+
+        return $predictions;
+    }
+
+    /**
+     * Load the accuracy rollups maintained by the model run (null when not generated yet)
+     */
+    private function loadRollups(): ?array
+    {
+        if (!file_exists($this->rollupsFile)) {
+            return null;
+        }
+        $rollups = json_decode(file_get_contents($this->rollupsFile), true);
+        return is_array($rollups) ? $rollups : null;
     }
 
     /**
      * Calculate overall accuracy statistics
+     * Graded-game totals come from the rollups summary when available, otherwise from a scan of $predictions.
+     */
+    private function calculateOverallStats(array $predictions, array $teamStats, ?array $rollups = null): array
+    {
+        $overall = $rollups['overall'] ?? null;
+        if ($overall !== null && ($overall['games'] ?? 0) > 0) {
+            $completedGames = (int)$overall['games'];
+            $hoopsightCorrect = (int)$overall['correct'];
+            $espnCorrect = (int)$overall['espn_correct'];
+            $bothCorrect = (int)$overall['both_correct'];
+            $avgMarginError = (float)($overall['mean_margin_error'] ?? 0);
+        } else {
+            [$completedGames, $hoopsightCorrect, $espnCorrect, $bothCorrect, $avgMarginError] =
+                $this->scanOverallStats($predictions);
+        }
+        $total = $completedGames;
+
+        $hoopsightAccuracy = $total > 0 ? ($hoopsightCorrect / $total) * 100 : 0;
+        $espnAccuracy = $total > 0 ? ($espnCorrect / $total) * 100 : 0;
+
+        $teamCount = 0;
+        $teamAccuracySum = 0.0;
+        $teamEspnAccuracySum = 0.0;
+
+        foreach ($teamStats as $stats) {
+            $gamesPlayed = $stats['total'] ?? 0;
+            if ($gamesPlayed > 0) {
+                $teamCount++;
+                $teamAccuracySum += $stats['accuracy'] ?? 0;
+                $teamEspnAccuracySum += $stats['espn_accuracy'] ?? 0;
+            }
+        }
+
+        $teamAvgAccuracy = $teamCount > 0 ? $teamAccuracySum / $teamCount : 0;
+        $teamAvgEspnAccuracy = $teamCount > 0 ? $teamEspnAccuracySum / $teamCount : 0;
+
+        return [
+            'total_predictions' => count($predictions),
+            'completed_games' => $completedGames,
+            'hoopsight_correct' => $hoopsightCorrect,
+            'hoopsight_accuracy' => $hoopsightAccuracy,
+            'espn_correct' => $espnCorrect,
+            'espn_accuracy' => $espnAccuracy,
+            'both_correct' => $bothCorrect,
+            'avg_margin_error' => $avgMarginError,
+            'advantage' => $hoopsightAccuracy - $espnAccuracy,
+            'team_avg_accuracy' => $teamAvgAccuracy,
+            'team_avg_espn_accuracy' => $teamAvgEspnAccuracy,
+            'team_avg_advantage' => $teamAvgAccuracy - $teamAvgEspnAccuracy,
+        ];
+    }
+
+    /**
+     * Count graded games, correct picks and margin error by scanning prediction records
      */
-    private function calculateOverallStats(array $predictions, array $teamStats): array
+    private function scanOverallStats(array $predictions): array
     {
-        $total = 0;
-        $correct = 0;
         $hoopsightCorrect = 0;
         $espnCorrect = 0;
         $bothCorrect = 0;
         $totalMarginError = 0;
+        $marginSamples = 0;
         $completedGames = 0;
 
         foreach ($predictions as $pred) {
@@ -56,11 +144,9 @@ class PredictionsDashboard
             }
 
             $completedGames++;
-            $total++;
 
             // HoopSight accuracy
             if ($pred['predicted_winner'] === $pred['actual_winner']) {
-                $correct++;
                 $hoopsightCorrect++;
             }
 
@@ -77,46 +163,16 @@ class PredictionsDashboard
                 }
             }
 
-            // Margin error
+            // Margin error, averaged over the games that have one (as in the rollups)
             if (isset($pred['margin_error'])) {
                 $totalMarginError += abs($pred['margin_error']);
+                $marginSamples++;
             }
         }
 
-        $hoopsightAccuracy = $total > 0 ? ($hoopsightCorrect / $total) * 100 : 0;
-        $espnAccuracy = $total > 0 ? ($espnCorrect / $total) * 100 : 0;
-        $avgMarginError = $completedGames > 0 ? $totalMarginError / $completedGames : 0;
+        $avgMarginError = $marginSamples > 0 ? $totalMarginError / $marginSamples : 0;
 
-        $teamCount = 0;
-        $teamAccuracySum = 0.0;
-        $teamEspnAccuracySum = 0.0;
-
-        foreach ($teamStats as $stats) {
-            $gamesPlayed = $stats['total'] ?? 0;
-            if ($gamesPlayed > 0) {
-                $teamCount++;
-                $teamAccuracySum += $stats['accuracy'] ?? 0;
-                $teamEspnAccuracySum += $stats['espn_accuracy'] ?? 0;
-            }
-        }
-
-        $teamAvgAccuracy = $teamCount > 0 ? $teamAccuracySum / $teamCount : 0;
-        $teamAvgEspnAccuracy = $teamCount > 0 ? $teamEspnAccuracySum / $teamCount : 0;
-
-        return [
-            'total_predictions' => count($predictions),
-            'completed_games' => $completedGames,
-            'hoopsight_correct' => $hoopsightCorrect,
-            'hoopsight_accuracy' => $hoopsightAccuracy,
-            'espn_correct' => $espnCorrect,
-            'espn_accuracy' => $espnAccuracy,
-            'both_correct' => $bothCorrect,
-            'avg_margin_error' => $avgMarginError,
-            'advantage' => $hoopsightAccuracy - $espnAccuracy,
-            'team_avg_accuracy' => $teamAvgAccuracy,
-            'team_avg_espn_accuracy' => $teamAvgEspnAccuracy,
-            'team_avg_advantage' => $teamAvgAccuracy - $teamAvgEspnAccuracy,
-        ];
+        return [$completedGames, $hoopsightCorrect, $espnCorrect, $bothCorrect, $avgMarginError];
     }
 
     /**
@@ -579,7 +635,7 @@ class PredictionsDashboard
         }
 
     $teamStats = $this->groupByTeam($predictions);
-    $overallStats = $this->calculateOverallStats($predictions, $teamStats);
+    $overallStats = $this->calculateOverallStats($predictions, $teamStats, $this->loadRollups());
 
         $html = '<div class="predictions-dashboard">';
         
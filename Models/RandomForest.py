@@ -1,25 +1,41 @@
 import os
 import csv
-from datetime import date, datetime, timedelta
+import json
+import argparse
+from dataclasses import dataclass
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from sklearn.ensemble import RandomForestRegressor
+import numpy as np
 
 from DataStore import DataStore
 from config import (
     CURRENT_SEASON,
     CURRENT_SEASON_START_YEAR,
+    CURRENT_SEASON_END_YEAR,
     CURRENT_DATA_ROOT,
     HISTORICAL_DATA_ROOT,
+    PLAYOFF_ODDS_CSV,
     PREDICTION_RESULTS_CSV,
+    RF_HYPERPARAMETERS,
+    RUN_REPORT_DIR,
     SCHEDULE_ROOT,
+    SEASON_PROJECTIONS_JSON,
+    SEASON_SIMULATIONS,
     WIN_LOSS_RECORD_CSV,
+    today,
 )
-from espn_predictor import EspnPrediction, fetch_espn_prediction
+from espn_predictor import EspnPrediction, prefetch_espn_predictions
+from hss_index import get_hss_index
 from injury_adjustments import get_injury_adjuster
-from prediction_history import PredictionHistoryManager
-from team_mappings import get_team_identity
+from instrumentation import count, get_instrumentation, is_quiet, log, set_quiet, stage, timed
+from model_store import load_or_train_model
+from playoff_simulator import PlayoffOdds, PlayoffSimulator
+from prediction_history import EspnBatch, PredictionBatch, PredictionHistoryManager
+from schedule_index import ScheduledGame, ScheduleIndex, build_schedule_index
+from season_simulator import SeasonSimulationResult, SeasonSimulator
+from team_mappings import TEAM_CONFERENCE, get_team_identity
 
 # Global variables to mimic static fields in Java
 data_store = None
@@ -28,11 +44,45 @@ prediction_csv_writer = None
 win_loss_writer = None
 prediction_history_manager: Optional[PredictionHistoryManager] = None
 
-def load_training_data(cleaned_data_path):
+# Home-court boost: max(HOME_ADVANTAGE_MIN_BOOST, HOME_ADVANTAGE_RATE * opponent HSS)
+HOME_ADVANTAGE_MIN_BOOST = 2.75
+HOME_ADVANTAGE_RATE = 0.01425
+
+
+@dataclass
+class GameFeatureRow:
+    """Everything needed to score one league game, seen from the home team's side."""
+    game: ScheduledGame
+    home_hss: float
+    away_hss: float
+    home_injury_penalty: float
+    away_injury_penalty: float
+
+
+@dataclass
+class BatchPrediction:
+    """Model output for a batch of GameFeatureRows, aligned by position."""
+    home_hss_adjusted: np.ndarray
+    away_hss_adjusted: np.ndarray
+    home_win_pct: np.ndarray
+
+    def take(self, positions: List[int]) -> "BatchPrediction":
+        """Return the predictions at 'positions' as a new batch."""
+        return BatchPrediction(
+            self.home_hss_adjusted[positions],
+            self.away_hss_adjusted[positions],
+            self.home_win_pct[positions],
+        )
+
+
+@timed("load_training_data")
+def load_training_data(cleaned_data_path, before_year: Optional[int] = None):
+
     """
     Loads training data from CSV files in the provided directory (and sub-directories).
     - WeightedStat is the feature (X)
     - WinPercentage is the target (y)
+    When 'before_year' is given only rows from seasons before it are kept.
     Returns (X, y) for training.
     """
     X = []
@@ -63,6 +113,8 @@ def load_training_data(cleaned_data_path):
                     for row in reader:
                         if len(row) >= 4:
                             try:
+                                if before_year is not None and int(row[2].strip()) >= before_year:
+                                    continue
                                 weighted_stat = float(row[1].strip())
                                 win_percentage = float(row[3].strip())
                                 X.append([weighted_stat])
@@ -77,34 +129,47 @@ def load_training_data(cleaned_data_path):
     return X, y
 
 
-def normalize_game_date(raw_date: str):
-    """Return the cleaned display string, ISO date, and season year for a game."""
-    cleaned = raw_date.strip().strip('"')
-    try:
-        parsed = datetime.strptime(cleaned, "%a, %b %d, %Y")
-    except ValueError:
-        fallback = f"{cleaned}, {CURRENT_SEASON_START_YEAR}"
-        parsed = datetime.strptime(fallback, "%a, %b %d, %Y")
-    return cleaned, parsed.date().isoformat(), parsed.year
+@timed("register_teams")
+def register_teams(cleaned_data_path):
+    """
+    Registers the teams found in the training data folders in the Data_Store index map,
+    in the same order load_training_data would, without parsing the files.
+    """
+    global data_store
+    if data_store is None:
+        data_store = DataStore(30)
 
-def predict_outcomes(
-    team_name,
-    schedule_path,
-    historical_data_path,
-    model,
-    current_date,
-    history_manager=None,
-    target_date: Optional[date] = None,
-):
+    cleaned_path = Path(cleaned_data_path)
+    if not cleaned_path.exists():
+        raise ValueError(f"Directory not found: {cleaned_data_path}")
+
+    team_index = len(data_store.team_index_map)
+    for stat_folder in cleaned_path.iterdir():
+        if stat_folder.is_dir():
+            for team_file in stat_folder.glob("*.csv"):
+                team = team_file.stem
+                if team_index < 30 and team not in data_store.team_index_map:
+                    data_store.add_team_to_index_map(team, team_index)
+                    team_index += 1
+
+
+@timed("train_model")
+def train_model(cleaned_data_path, hyperparameters=None, before_year: Optional[int] = None):
     """
-    Predicts outcomes for each game in 'schedule_path' using the trained Random Forest model.
-    Writes results to 'prediction_results.csv' and aggregated W/L to 'win_loss_records.csv'.
+    Loads the training data (optionally only seasons before 'before_year') and fits a
+    RandomForestRegressor on it. sklearn is imported here so prediction-only runs never load it.
     """
-    if history_manager is None:
-        history_manager = prediction_history_manager
+    from sklearn.ensemble import RandomForestRegressor
+
+    X, y = load_training_data(cleaned_data_path, before_year)
+    rf = RandomForestRegressor(**(hyperparameters or RF_HYPERPARAMETERS))
+    rf.fit(X, y)
+    return rf
+
 
-    # create file writer objects to write game-by-game predictions, final predicted win-loss records
-    global prediction_writer, prediction_csv_writer, win_loss_writer, data_store
+def _open_output_writers():
+    """Lazily open the prediction CSV writer and write its header."""
+    global prediction_writer, prediction_csv_writer
     if prediction_writer is None:
         prediction_writer = PREDICTION_RESULTS_CSV.open("w", encoding="utf-8-sig", newline="")
         prediction_csv_writer = csv.writer(prediction_writer)
@@ -124,237 +189,489 @@ def predict_outcomes(
             "Team ESPN Win %",
             "Opponent ESPN Win %",
         ])
+
+
+@timed("csv_write")
+def write_win_loss_records(records, extra_columns=()):
+    """
+    Writes one 'Team,Wins,Losses,HSS[,extra...]' line per record to win_loss_records.csv.
+    The file is opened (and its header written) on first use.
+    """
+    global win_loss_writer
     if win_loss_writer is None:
         win_loss_writer = WIN_LOSS_RECORD_CSV.open("w", encoding="utf-8-sig", newline="")
-        win_loss_writer.write("Team,Wins,Losses,HSS\n")
+        win_loss_writer.write(",".join(["Team", "Wins", "Losses", "HSS", *extra_columns]) + "\n")
+    for record in records:
+        win_loss_writer.write(",".join(str(value) for value in record) + "\n")
 
-    # if we can't find the team's schedule, break the program
-    schedule_path = Path(schedule_path)
-    if not schedule_path.exists():
-        print(f"Schedule file not found for {team_name}: {schedule_path}")
-        return
 
-    # Read the schedule CSV, convert into Game objects
-    games = []
-    with schedule_path.open("r", encoding="utf-8-sig") as f:
-        reader = csv.reader(f)
-        # Skip header if present
-        next(reader, None)
-        for row in reader:
-            # Expecting something like: [date, ???, opponent, location, ...]
-            if len(row) < 4:
-                continue
-            raw_date = row[0].strip()
-            start_time = row[1].strip() if len(row) > 1 else ""
-            opponent = row[2].strip()
-            location = row[3].strip()
-
-            display_date, iso_date, year = normalize_game_date(raw_date)
-            if year == 0:
-                year = CURRENT_SEASON_START_YEAR
-            games.append(Game(display_date, iso_date, start_time, opponent, location, year))
-
-    # Prepare an Instances-like structure in Python
-    # We'll only store WeightedStat as X
-    win_count = 0
-    loss_count = 0
-    hss_sum = 0.0
-
-    # Initialize injury adjuster
+@timed("collect_feature_rows")
+def collect_feature_rows(games: Iterable[ScheduledGame], historical_data_path) -> List[GameFeatureRow]:
+    """
+    Builds one GameFeatureRow per scheduled game. HSS and injury penalties are
+    resolved here; the model is not called. Injury penalties for all games come
+    from one team x date penalty table covering every game date.
+    """
+    games = list(games)
     injury_adjuster = get_injury_adjuster()
+    game_dates = [game.iso_date for game in games]
+    with stage("injury_penalty"):
+        home_penalties = injury_adjuster.penalties([game.home_team for game in games], game_dates).tolist()
+        away_penalties = injury_adjuster.penalties([game.away_team for game in games], game_dates).tolist()
+    rows = []
+    for game, home_injury_penalty, away_injury_penalty in zip(games, home_penalties, away_penalties):
+        home_hss = load_hss(game.home_team, historical_data_path, game.year)
+        away_hss = load_hss(game.away_team, historical_data_path, game.year)
+        rows.append(
+            GameFeatureRow(
+                game=game,
+                home_hss=home_hss,
+                away_hss=away_hss,
+                home_injury_penalty=home_injury_penalty,
+                away_injury_penalty=away_injury_penalty,
+            )
+        )
+    count("games_evaluated", len(rows))
+    return rows
 
-    predicted_games = 0
 
-    for game in games:
-        try:
-            game_date = datetime.strptime(game.iso_date, "%Y-%m-%d").date()
-        except ValueError:
-            continue
+def apply_home_advantage(home_hss, away_hss, neutral=False) -> np.ndarray:
+    """
+    Adds the home-court boost to the home team's HSS (not at neutral sites).
+    Scales with opponent strength. 2.75 is a min boost, or 1.425% of the awayHSS
+    """
+    home_hss = np.asarray(home_hss, dtype=float)
+    home_advantage_boost = np.maximum(HOME_ADVANTAGE_MIN_BOOST, np.asarray(away_hss, dtype=float) * HOME_ADVANTAGE_RATE)
+    return np.where(neutral, home_hss, home_hss + home_advantage_boost)
+
 
-        if game_date < current_date:
+@timed("predict_batch")
+def predict_batch(model, rows: List[GameFeatureRow]) -> BatchPrediction:
+    """
+    Scores every feature row with a single model call.
+    Injury adjustments and the home-advantage boost are applied as array operations.
+    """
+    if not rows:
+        empty = np.empty(0, dtype=float)
+        return BatchPrediction(empty, empty, empty)
+
+    injury_adjuster = get_injury_adjuster()
+    home_hss = np.fromiter((row.home_hss for row in rows), dtype=float, count=len(rows))
+    away_hss = np.fromiter((row.away_hss for row in rows), dtype=float, count=len(rows))
+    home_penalty = np.fromiter((row.home_injury_penalty for row in rows), dtype=float, count=len(rows))
+    away_penalty = np.fromiter((row.away_injury_penalty for row in rows), dtype=float, count=len(rows))
+    neutral = np.fromiter((row.game.neutral for row in rows), dtype=bool, count=len(rows))
+
+    with stage("injury_adjustment"):
+        home_hss_adjusted = injury_adjuster.adjust_hss_array(home_hss, home_penalty)
+        away_hss_adjusted = injury_adjuster.adjust_hss_array(away_hss, away_penalty)
+
+    home_hss_adjusted = apply_home_advantage(home_hss_adjusted, away_hss_adjusted, neutral)
+    weighted_stat = home_hss_adjusted - away_hss_adjusted
+    home_win_pct = np.asarray(model.predict(weighted_stat.reshape(-1, 1)), dtype=float) * 100
+    return BatchPrediction(home_hss_adjusted, away_hss_adjusted, home_win_pct)
+
+
+def fetch_espn_for_rows(rows: List[GameFeatureRow]):
+    """
+    Prefetches ESPN predictions for every non-neutral game in 'rows' in one concurrent
+    pass (one scoreboard request per date). Returns {game key: EspnPrediction}.
+    """
+    espn_keys = {}
+    for row in rows:
+        game = row.game
+        if game.neutral:
             continue
-        if target_date is not None and game_date != target_date:
+        try:
+            _, home_abbr = get_team_identity(game.home_team)
+            _, away_abbr = get_team_identity(game.away_team)
+        except KeyError:
             continue
+        espn_keys[(game.iso_date, home_abbr, away_abbr)] = game.key()
 
-        team_hss = load_hss(team_name, historical_data_path, game.year)
-        hss_sum += team_hss
-        opponent_hss = load_hss(game.opponent, historical_data_path, game.year)
-        predicted_games += 1
-        display_index = predicted_games
+    if not espn_keys:
+        return {}
+    with stage("espn_fetch"):
+        fetched = prefetch_espn_predictions(espn_keys)
+    count("espn_dates", len({espn_key[0] for espn_key in espn_keys}))
+    count("espn_games", len(espn_keys))
+    return {espn_keys[espn_key]: snapshot for espn_key, snapshot in fetched.items()}
 
-        # Apply injury adjustments
-        team_hss_adjusted, team_injury_penalty = injury_adjuster.adjust_hss(
-            team_name, team_hss, game.iso_date
-        )
-        opponent_hss_adjusted, opp_injury_penalty = injury_adjuster.adjust_hss(
-            game.opponent, opponent_hss, game.iso_date
-        )
-
-        # If home, add a home advantage to the adjusted HSS
-        if game.location == "H":
-            # Scales with opponent strength. 2.75 is a min boost, or 1.425% of the awayHSS
-            home_advantage_boost = max(2.75, opponent_hss_adjusted * 0.01425)
-            team_hss_adjusted += home_advantage_boost
-
-        weighted_stat = team_hss_adjusted - opponent_hss_adjusted
-        predicted_win_percentage = model.predict([[weighted_stat]])[0]
-        team_win_pct = predicted_win_percentage * 100
-        opponent_win_pct = 100 - team_win_pct
-
-        if predicted_win_percentage > 0.5:
-            predicted_winner = team_name
-        elif predicted_win_percentage < 0.5:
-            predicted_winner = game.opponent
-        else:
-            predicted_winner = team_name if game.location == "H" else game.opponent
 
-        predicted_winner_pct = team_win_pct if predicted_winner == team_name else opponent_win_pct
-        confidence_gap_pct = abs(team_win_pct - 50.0)
-        expected_margin = round(confidence_gap_pct * 0.4, 2)
+@timed("write_predictions")
+def write_predictions(
+    rows: List[GameFeatureRow],
+    batch: BatchPrediction,
+    history_manager=None,
+    model_artifact: Optional[str] = None,
+):
+    """
+    Hands a scored batch to the output sinks. Each game is written to the prediction
+    history and the DataStore once; both teams' rows in prediction_results.csv are
+    derived from that single result.
+    'model_artifact' is the id of the model artifact recorded on each history entry.
+    Returns {team: [predicted wins, predicted losses, HSS sum, games]} for the batch.
+    """
+    if history_manager is None:
+        history_manager = prediction_history_manager
 
-        location_code = (game.location or "").upper()
-        team_location = location_code if location_code in {"H", "A"} else "N"
-
-        if location_code == "H":
-            home_team = team_name
-            away_team = game.opponent
-            team_is_home = True
-        elif location_code == "A":
-            home_team = game.opponent
-            away_team = team_name
-            team_is_home = False
+    _open_output_writers()
+    espn_snapshots = fetch_espn_for_rows(rows)
+
+    # team -> list of prediction_results.csv rows
+    team_lines = {}
+    # team -> [wins, losses, hss_sum, games]
+    team_totals = {}
+
+    home_hss_column = batch.home_hss_adjusted.tolist()
+    away_hss_column = batch.away_hss_adjusted.tolist()
+    home_win_pct_column = batch.home_win_pct.tolist()
+    predicted_winners = []
+    predicted_winner_pcts = []
+
+    for game_number, (row, home_hss_adjusted, away_hss_adjusted, home_win_pct) in enumerate(
+        zip(rows, home_hss_column, away_hss_column, home_win_pct_column),
+        start=1,
+    ):
+        game = row.game
+        home_team = game.home_team
+        away_team = game.away_team
+        away_win_pct = 100 - home_win_pct
+
+        if home_win_pct > 50.0:
+            predicted_winner = home_team
+        elif home_win_pct < 50.0:
+            predicted_winner = away_team
         else:
-            ordered = sorted([team_name, game.opponent])
-            home_team, away_team = ordered[0], ordered[1]
-            team_is_home = team_name == home_team
-            location_code = "N"
-
-        if team_is_home:
-            home_hss_value = team_hss_adjusted
-            away_hss_value = opponent_hss_adjusted
-        else:
-            home_hss_value = opponent_hss_adjusted
-            away_hss_value = team_hss_adjusted
+            predicted_winner = away_team if game.neutral else home_team
 
-        home_model_pct = team_win_pct if team_is_home else opponent_win_pct
-        away_model_pct = 100.0 - home_model_pct
+        predicted_winner_pct = home_win_pct if predicted_winner == home_team else away_win_pct
+        predicted_winners.append(predicted_winner)
+        predicted_winner_pcts.append(predicted_winner_pct)
+        confidence_gap_pct = abs(home_win_pct - 50.0)
+        expected_margin = round(confidence_gap_pct * 0.4, 2)
 
-        espn_snapshot: Optional[EspnPrediction] = None
+        espn_snapshot: Optional[EspnPrediction] = espn_snapshots.get(game.key())
         espn_home_pct: Optional[float] = None
         espn_away_pct: Optional[float] = None
-        espn_favorite_full: Optional[str] = None
-        espn_favorite_abbr: Optional[str] = None
-        espn_confidence_gap: Optional[float] = None
-
-        if location_code in {"H", "A"}:
-            try:
-                _, home_abbr = get_team_identity(home_team)
-                _, away_abbr = get_team_identity(away_team)
-            except KeyError:
-                pass
-            else:
-                espn_snapshot = fetch_espn_prediction(game.iso_date, home_abbr, away_abbr)
-                if espn_snapshot is not None:
-                    espn_home_pct = espn_snapshot.home_pct
-                    espn_away_pct = espn_snapshot.away_pct
-                    espn_favorite_full = espn_snapshot.favorite_full
-                    espn_favorite_abbr = espn_snapshot.favorite_abbr
-                    espn_confidence_gap = espn_snapshot.confidence_gap
-
-        should_log = history_manager is not None and team_is_home
-
-        if should_log:
-            history_manager.upsert_prediction(
-                display_date=game.display_date,
-                iso_date=game.iso_date,
-                home_team=home_team,
-                away_team=away_team,
-                location=location_code,
-                predicted_winner=predicted_winner,
-                predicted_win_pct=predicted_winner_pct,
-                home_hss=home_hss_value,
-                away_hss=away_hss_value,
-                tipoff_et=game.start_time,
-                model_home_pct=home_model_pct,
-                model_away_pct=away_model_pct,
-            )
-
-            if espn_snapshot is not None:
-                history_manager.update_espn_prediction(
-                    iso_date=game.iso_date,
-                    home_team=home_team,
-                    away_team=away_team,
-                    game_id=espn_snapshot.game_id,
-                    source_url=espn_snapshot.source_url,
-                    home_pct=espn_home_pct,
-                    away_pct=espn_away_pct,
-                    favorite_full=espn_favorite_full,
-                    favorite_abbr=espn_favorite_abbr,
-                    confidence_gap=espn_confidence_gap,
-                )
-
-        team_espn_pct = espn_home_pct if team_is_home else espn_away_pct
-        opponent_espn_pct = espn_away_pct if team_is_home else espn_home_pct
+        if espn_snapshot is not None:
+            espn_home_pct = espn_snapshot.home_pct
+            espn_away_pct = espn_snapshot.away_pct
 
         # Add result to data_store
         data_store.add_game_result(
-            f"Game #{display_index}: {team_name} vs {game.opponent}, Winner: {predicted_winner}, "
-            f"HoopSight Win%: {team_win_pct:.2f}/{opponent_win_pct:.2f}, Projected Margin: {expected_margin:.2f}"
-        )
-
-        def _fmt_pct(value: Optional[float]) -> str:
-            return f"{value:.2f}" if value is not None else "N/A"
-
-        prediction_csv_writer.writerow(
-            [
-                team_name,
-                game.display_date,
-                game.start_time,
-                game.opponent,
-                team_location,
-                f"{team_hss_adjusted:.5f}",
-                f"{opponent_hss_adjusted:.5f}",
-                f"{team_win_pct:.2f}",
-                f"{opponent_win_pct:.2f}",
-                predicted_winner,
-                f"{expected_margin:.2f}",
-                f"{confidence_gap_pct:.2f}",
-                _fmt_pct(team_espn_pct),
-                _fmt_pct(opponent_espn_pct),
-            ]
+            f"Game #{game_number}: {home_team} vs {away_team}, Winner: {predicted_winner}, "
+            f"HoopSight Win%: {home_win_pct:.2f}/{away_win_pct:.2f}, Projected Margin: {expected_margin:.2f}"
         )
 
         # Update head-to-head in data_store
-        current_team_index = get_team_index(team_name)
-        opponent_team_index = get_team_index(game.opponent)
-        if predicted_winner == team_name:
-            data_store.update_head_to_head(current_team_index, opponent_team_index, 1)
-            data_store.update_head_to_head(opponent_team_index, current_team_index, 0)
-            win_count += 1
-        else:
-            data_store.update_head_to_head(current_team_index, opponent_team_index, 0)
-            data_store.update_head_to_head(opponent_team_index, current_team_index, 1)
-            loss_count += 1
+        winner_index = get_team_index(predicted_winner)
+        loser_index = get_team_index(away_team if predicted_winner == home_team else home_team)
+        data_store.update_head_to_head(winner_index, loser_index, 1)
+
+        # Derive both team perspectives from the single result
+        away_location = "N" if game.neutral else "A"
+        perspectives = (
+            (home_team, away_team, game.location, home_hss_adjusted, away_hss_adjusted,
+             home_win_pct, away_win_pct, espn_home_pct, espn_away_pct, row.home_hss),
+            (away_team, home_team, away_location, away_hss_adjusted, home_hss_adjusted,
+             away_win_pct, home_win_pct, espn_away_pct, espn_home_pct, row.away_hss),
+        )
+        for (team_name, opponent, team_location, team_hss_adjusted, opponent_hss_adjusted,
+             team_win_pct, opponent_win_pct, team_espn_pct, opponent_espn_pct, team_hss) in perspectives:
+            team_lines.setdefault(team_name, []).append(
+                [
+                    team_name,
+                    game.display_date,
+                    game.start_time,
+                    opponent,
+                    team_location,
+                    f"{team_hss_adjusted:.5f}",
+                    f"{opponent_hss_adjusted:.5f}",
+                    f"{team_win_pct:.2f}",
+                    f"{opponent_win_pct:.2f}",
+                    predicted_winner,
+                    f"{expected_margin:.2f}",
+                    f"{confidence_gap_pct:.2f}",
+                    _fmt_pct(team_espn_pct),
+                    _fmt_pct(opponent_espn_pct),
+                ]
+            )
+            totals = team_totals.setdefault(team_name, [0, 0, 0.0, 0])
+            totals[0 if predicted_winner == team_name else 1] += 1
+            totals[2] += team_hss
+            totals[3] += 1
 
         # Print outcome to console
         print_outcomes(
-            display_index,
-            team_name,
-            game.opponent,
-            team_hss,
-            opponent_hss,
-            team_win_pct,
-            opponent_win_pct,
+            game_number,
+            home_team,
+            away_team,
+            row.home_hss,
+            row.away_hss,
+            home_win_pct,
+            away_win_pct,
             predicted_winner,
             expected_margin,
         )
 
-    # Finally, write W/L record
-    if predicted_games == 0:
+    if history_manager is not None:
+        with stage("history_write"):
+            _write_history_batch(
+                history_manager,
+                rows,
+                predicted_winners,
+                predicted_winner_pcts,
+                home_hss_column,
+                away_hss_column,
+                home_win_pct_column,
+                espn_snapshots,
+                model_artifact,
+            )
+        count("history_upserts", len(rows))
+
+    # Finally, write per-team prediction rows
+    with stage("csv_write"):
+        for team_name in sorted(team_lines):
+            prediction_csv_writer.writerows(team_lines[team_name])
+    count("prediction_rows_written", 2 * len(rows))
+    return team_totals
+
+
+def _write_history_batch(
+    history_manager,
+    rows: List[GameFeatureRow],
+    predicted_winners: List[str],
+    predicted_winner_pcts: List[float],
+    home_hss_column: List[float],
+    away_hss_column: List[float],
+    home_win_pct_column: List[float],
+    espn_snapshots,
+    model_artifact: Optional[str],
+) -> None:
+    """Records a scored batch and its ESPN snapshots in the prediction history with one call each."""
+    games = [row.game for row in rows]
+    history_manager.upsert_predictions_many(
+        PredictionBatch(
+            display_date=[game.display_date for game in games],
+            iso_date=[game.iso_date for game in games],
+            home_team=[game.home_team for game in games],
+            away_team=[game.away_team for game in games],
+            location=[game.location for game in games],
+            predicted_winner=predicted_winners,
+            predicted_win_pct=predicted_winner_pcts,
+            home_hss=home_hss_column,
+            away_hss=away_hss_column,
+            tipoff_et=[game.start_time for game in games],
+            model_home_pct=home_win_pct_column,
+            model_away_pct=[100 - home_win_pct for home_win_pct in home_win_pct_column],
+        ),
+        model_artifact=model_artifact,
+    )
+
+    matched = [(game, espn_snapshots[game.key()]) for game in games if espn_snapshots.get(game.key()) is not None]
+    if not matched:
         return
+    history_manager.update_espn_many(
+        EspnBatch(
+            iso_date=[game.iso_date for game, _ in matched],
+            home_team=[game.home_team for game, _ in matched],
+            away_team=[game.away_team for game, _ in matched],
+            game_id=[snapshot.game_id for _, snapshot in matched],
+            source_url=[snapshot.source_url for _, snapshot in matched],
+            home_pct=[snapshot.home_pct for _, snapshot in matched],
+            away_pct=[snapshot.away_pct for _, snapshot in matched],
+            favorite_full=[snapshot.favorite_full for _, snapshot in matched],
+            favorite_abbr=[snapshot.favorite_abbr for _, snapshot in matched],
+            confidence_gap=[snapshot.confidence_gap for _, snapshot in matched],
+        )
+    )
+
+
+def _fmt_pct(value: Optional[float]) -> str:
+    return f"{value:.2f}" if value is not None else "N/A"
+
+
+def predict_outcomes(
+    team_name,
+    schedule_path,
+    historical_data_path,
+    model,
+    current_date,
+    history_manager=None,
+    target_date: Optional[date] = None,
+):
+    """
+    Predicts outcomes for each game in 'schedule_path' using the trained Random Forest model.
+    Writes results to 'prediction_results.csv' and aggregated W/L to 'win_loss_records.csv'.
+    """
+    schedule_path = Path(schedule_path)
+    if not schedule_path.exists():
+        print(f"Schedule file not found for {team_name}: {schedule_path}")
+        return
+
+    schedule_index = ScheduleIndex()
+    schedule_index.add_team_schedule(team_name, schedule_path)
+    if target_date is not None:
+        games = schedule_index.games_on(target_date) if target_date >= current_date else []
+    else:
+        games = schedule_index.games_between(current_date, None)
+
+    rows = collect_feature_rows(games, historical_data_path)
+    team_totals = write_predictions(rows, predict_batch(model, rows), history_manager)
+    write_win_loss_records(
+        [team, win_count, loss_count, f"{hss_sum / predicted_games:.5f}"]
+        for team, (win_count, loss_count, hss_sum, predicted_games) in sorted(team_totals.items())
+    )
+
+def completed_standings(history_manager, before_iso: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Returns {team: (wins, losses)} over this season's graded games dated before
+    'before_iso', from the prediction history.
+    """
+    standings: Dict[str, List[int]] = {}
+    for record in history_manager.completed_games():
+        if record.game_date >= before_iso or record.actual_winner is None:
+            continue
+        for team in (record.home_team, record.away_team):
+            standings.setdefault(team, [0, 0])[0 if team == record.actual_winner else 1] += 1
+    return {team: (wins, losses) for team, (wins, losses) in standings.items()}
+
+
+def build_season_simulator(
+    rows: List[GameFeatureRow],
+    batch: BatchPrediction,
+    history_manager=None,
+) -> SeasonSimulator:
+    """
+    Builds a SeasonSimulator for the remaining schedule 'rows' (scored in 'batch')
+    on top of the wins and losses already banked in this season's graded games
+    before the first remaining game. Teams start from 0-0 without 'history_manager'.
+    """
+    first_iso = min((row.game.iso_date for row in rows), default=today().isoformat())
+    standings = completed_standings(history_manager, first_iso) if history_manager is not None else {}
+    teams = sorted({row.game.home_team for row in rows} | {row.game.away_team for row in rows} | set(standings))
+    team_positions = {team: idx for idx, team in enumerate(teams)}
+
+    return SeasonSimulator(
+        teams,
+        home_idx=[team_positions[row.game.home_team] for row in rows],
+        away_idx=[team_positions[row.game.away_team] for row in rows],
+        home_win_prob=batch.home_win_pct / 100.0,
+        base_wins=[standings.get(team, (0, 0))[0] for team in teams],
+        base_losses=[standings.get(team, (0, 0))[1] for team in teams],
+    )
+
+
+@timed("season_simulation")
+def project_season(
+    simulator: SeasonSimulator,
+    rows: List[GameFeatureRow],
+    historical_data_path,
+    n_simulations: int = SEASON_SIMULATIONS,
+    workers: int = 1,
+    seed: Optional[int] = None,
+) -> SeasonSimulationResult:
+    """
+    Simulates the remaining schedule with 'simulator' and writes projected records to
+    'win_loss_records.csv' and full distributions to 'season_projections.json'.
+    """
+    teams = simulator.teams
+    result = simulator.run(n_simulations=n_simulations, workers=workers, seed=seed)
+
+    # Average unadjusted HSS over each team's remaining games
+    hss_totals = {}
+    for row in rows:
+        for team, hss in ((row.game.home_team, row.home_hss), (row.game.away_team, row.away_hss)):
+            total = hss_totals.setdefault(team, [0.0, 0])
+            total[0] += hss
+            total[1] += 1
+
+    mean_wins = result.mean_wins
+    mean_losses = result.mean_losses
+    percentiles = result.win_percentiles((10, 90))
+    records = []
+    for idx, team in enumerate(teams):
+        if team in hss_totals:
+            hss_sum, games = hss_totals[team]
+            avg_hss = hss_sum / games
+        else:
+            avg_hss = load_hss(team, historical_data_path, CURRENT_SEASON_START_YEAR)
+        records.append([
+            team,
+            int(round(mean_wins[idx])),
+            int(round(mean_losses[idx])),
+            f"{avg_hss:.5f}",
+            f"{percentiles[10][idx]}-{percentiles[90][idx]}",
+        ])
+    write_win_loss_records(records, extra_columns=("Win Range (P10-P90)",))
+
+    with SEASON_PROJECTIONS_JSON.open("w", encoding="utf-8") as fp:
+        json.dump(result.to_dict(), fp, ensure_ascii=False, indent=2)
+    return result
+
+
+def pairwise_home_win_prob(model, teams: List[str], historical_data_path) -> np.ndarray:
+    """
+    Returns a (teams x teams) matrix of P(row team beats column team at home), scored
+    with a single model call. Uses current-season HSS without injury adjustments,
+    since postseason rosters are unknown.
+    """
+    hss = np.array([load_hss(team, historical_data_path, CURRENT_SEASON_END_YEAR) for team in teams], dtype=float)
+    home_hss = hss[:, None]
+    away_hss = hss[None, :]
+    weighted_stat = apply_home_advantage(home_hss, away_hss) - away_hss
+    home_win_prob = np.asarray(model.predict(weighted_stat.reshape(-1, 1)), dtype=float)
+    return home_win_prob.reshape(len(teams), len(teams))
+
+
+def completed_head_to_head(teams: List[str], history_manager) -> np.ndarray:
+    """
+    Returns a (teams x teams) matrix of wins of the row team over the column team in
+    this season's graded games from the prediction history.
+    """
+    team_positions = {team: idx for idx, team in enumerate(teams)}
+    head_to_head = np.zeros((len(teams), len(teams)), dtype=np.int32)
+    for record in history_manager.completed_games():
+        winner = record.actual_winner
+        loser = record.away_team if winner == record.home_team else record.home_team
+        if winner in team_positions and loser in team_positions:
+            head_to_head[team_positions[winner], team_positions[loser]] += 1
+    return head_to_head
+
+
+@timed("playoff_simulation")
+def project_playoffs(
+    model,
+    simulator: SeasonSimulator,
+    historical_data_path,
+    history_manager=None,
+    n_simulations: int = SEASON_SIMULATIONS,
+    workers: int = 1,
+    seed: Optional[int] = None,
+) -> PlayoffOdds:
+    """
+    Plays the play-in and playoff bracket on top of each simulated season and
+    writes per-team seeding and advancement probabilities to 'playoff_odds.csv'.
+    Head-to-head tiebreakers count the season's completed games from 'history_manager'.
+    """
+    playoffs = PlayoffSimulator(
+        simulator.teams,
+        TEAM_CONFERENCE,
+        pairwise_home_win_prob(model, simulator.teams, historical_data_path),
+        completed_head_to_head(simulator.teams, history_manager) if history_manager is not None else None,
+    )
+    odds = playoffs.run(simulator, n_simulations=n_simulations, workers=workers, seed=seed)
+
+    rows = odds.to_rows()
+    if rows:
+        PLAYOFF_ODDS_CSV.parent.mkdir(parents=True, exist_ok=True)
+        with stage("csv_write"), PLAYOFF_ODDS_CSV.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+    return odds
 
-    avgHSS = (hss_sum / predicted_games) if predicted_games else 0.0
-    win_loss_writer.write(f"{team_name},{win_count},{loss_count},{avgHSS:.5f}\n")
 
 def get_team_index(team_name):
     """
@@ -362,68 +679,26 @@ def get_team_index(team_name):
     """
     return data_store.get_team_index(team_name)
 
+@timed("hss_lookup")
 def load_hss(team, data_path, year):
     """
     Loads HoopSight Strength (HSS) for a given team and year:
     1. Checks `../Current_Data` for the exact year or most recent past year.
     2. Falls back to historical data in `data_path` if no current data is found.
     Returns the total WeightedStat (HSS) for the team.
-    """
-    current_data_dir = Path(CURRENT_DATA_ROOT)
-    historical_data_dir = Path(data_path)
-
-    total_stat = 0.0
-    stat_count = 0
 
-    # process a CSV file and sum stats
-    def process_file(file_path, year_filter=None):
-        nonlocal total_stat, stat_count
-        with Path(file_path).open("r", encoding="utf-8-sig") as f:
-            reader = csv.reader(f)
-            next(reader, None)  # Skip header
-            for row in reader:
-                # Stat files are formatted as Rank,Statistic,Year,Win Percentage
-                if len(row) > 2:
-                    try:
-                        stat_year = int(row[2].strip())
-                        if year_filter is None or stat_year == year_filter:
-                            stat_value = float(row[1].strip())
-                            total_stat += stat_value
-                            stat_count += 1
-                    except (ValueError, IndexError):
-                        continue
-
-    # 1. Check Current Data for the exact year
-    if current_data_dir.exists() and current_data_dir.is_dir():
-        for folder in current_data_dir.iterdir():
-            if folder.is_dir():
-                team_file = folder / f"{team}.csv"
-                if team_file.exists():
-                    process_file(team_file, year_filter=year)
-
-    # If no stats found for the exact year, check most recent past year in current data
-    if stat_count == 0 and current_data_dir.exists():
-        for folder in current_data_dir.iterdir():
-            if folder.is_dir():
-                team_file = folder / f"{team}.csv"
-                if team_file.exists():
-                    process_file(team_file)
-
-    # 2. Check Historical Data if no stats found in Current Data
-    if stat_count == 0 and historical_data_dir.exists() and historical_data_dir.is_dir():
-        for folder in historical_data_dir.iterdir():
-            if folder.is_dir():
-                team_file = folder / f"{team}.csv"
-                if team_file.exists():
-                    process_file(team_file, year_filter=year)
+    Lookups are served from the process-wide HSSIndex, which loads every stat
+    file once and rebuilds itself when the files change on disk.
+    """
+    hss = get_hss_index(Path(data_path), Path(CURRENT_DATA_ROOT)).lookup(team, year)
 
     # Compute HSS
-    if stat_count > 0:
-        hss = total_stat / stat_count
-        print(f"HSS for team: {team}, Year: {year} = {hss}")
+    if hss is not None:
+        log(f"HSS for team: {team}, Year: {year} = {hss}")
         return hss
     else:
-        print(f"No stats found for team: {team}, Year: {year}")
+        count("hss_missing")
+        log(f"No stats found for team: {team}, Year: {year}")
         return 0.0
 
 def print_outcomes(
@@ -439,7 +714,10 @@ def print_outcomes(
 ):
     """
     Prints outcomes of each game prediction, mimicking the Java 'System.out.printf' style.
+    Skipped in quiet mode.
     """
+    if is_quiet():
+        return
     BOLD = "\033[1m"
     RESET = "\033[0m"
     print(f"{BOLD}GAME #{game_number}: {RESET}{team} vs {opponent_team}")
@@ -472,37 +750,87 @@ def query_wins_and_losses(data_store):
     print(f"{team1} wins: {wins_against}")
     print(f"{team1} losses: {losses_against}")
 
-def main():
+def predict_horizon(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    rest_of_season: bool = False,
+    simulate_season: bool = True,
+):
+    """
+    Predicts every league game from 'start_date' through 'end_date' (inclusive) in one run.
+    'start_date' defaults to tomorrow and 'end_date' to 'start_date'; 'rest_of_season'
+    ignores 'end_date' and covers the remaining schedule.
+    HSS, injuries and the model are loaded once, ESPN scoreboards are fetched once
+    per date, and all horizon rows are written in a single output pass.
+    """
     global data_store, prediction_writer, win_loss_writer, prediction_history_manager
 
     data_store = DataStore(30)
     schedule_path = SCHEDULE_ROOT
     historical_data_path = HISTORICAL_DATA_ROOT
-    current_date = date.today()
-    prediction_history_manager = PredictionHistoryManager(CURRENT_SEASON)
-    target_date = current_date + timedelta(days=1)
-    prediction_history_manager.prune_before_date(target_date.isoformat())
-
-    # 1) Load training data
-    X, y = load_training_data(historical_data_path)
+    current_date = today()
+    if start_date is None:
+        start_date = current_date + timedelta(days=1)
+    if rest_of_season:
+        end_date = None
+    elif end_date is None:
+        end_date = start_date
+    with stage("history_load"):
+        prediction_history_manager = PredictionHistoryManager(CURRENT_SEASON)
+        # Never archive games that have not been played yet, however far ahead --start is
+        prediction_history_manager.prune_before_date(min(start_date, current_date + timedelta(days=1)).isoformat())
+
+    # 1) Register teams, then load the model artifact for the current training data
+    register_teams(historical_data_path)
+
+    # 2) Train RandomForestRegressor only when the training inputs changed
+    with stage("model_load"):
+        artifact = load_or_train_model(
+            historical_data_path,
+            lambda: train_model(historical_data_path, RF_HYPERPARAMETERS),
+            RF_HYPERPARAMETERS,
+        )
+    rf = artifact.model
 
-    # 2) Train RandomForestRegressor
-    rf = RandomForestRegressor(n_estimators=100, random_state=42)
-    rf.fit(X, y)
+    # 3) Evaluate every remaining league game once and score them in one batch
+    with stage("schedule_index"):
+        schedule_index = build_schedule_index(schedule_path, teams=data_store.get_teams_list())
+    season_rows = collect_feature_rows(
+        schedule_index.games_between(min(current_date, start_date), None), historical_data_path
+    )
+    season_batch = predict_batch(rf, season_rows)
+
+    # 4) Write the horizon's games to the prediction outputs in one pass
+    start_iso = start_date.isoformat()
+    end_iso = end_date.isoformat() if end_date is not None else None
+    horizon_positions = [
+        i for i, row in enumerate(season_rows)
+        if row.game.iso_date >= start_iso and (end_iso is None or row.game.iso_date <= end_iso)
+    ]
+    team_totals = write_predictions(
+        [season_rows[i] for i in horizon_positions],
+        season_batch.take(horizon_positions),
+        prediction_history_manager,
+        artifact.artifact_id,
+    )
 
-    # 3) Run predictions for every known team
-    teams_list = data_store.get_teams_list()
-    for team in teams_list:
-        team_schedule_file = Path(schedule_path) / team / f"{team}.csv"
-        predict_outcomes(
-            team,
-            team_schedule_file,
-            historical_data_path,
-            rf,
-            current_date,
-            prediction_history_manager,
-            target_date=target_date,
+    # 5) Simulate the rest of the season for projected records, then the postseason.
+    # Without the simulation, the records are the horizon's predicted wins and losses.
+    if simulate_season:
+        remaining_positions = [i for i, row in enumerate(season_rows) if row.game.game_date >= current_date]
+        remaining_rows = [season_rows[i] for i in remaining_positions]
+        simulator = build_season_simulator(
+            remaining_rows, season_batch.take(remaining_positions), prediction_history_manager
+        )
+        project_season(simulator, remaining_rows, historical_data_path)
+        project_playoffs(rf, simulator, historical_data_path, prediction_history_manager)
+    elif team_totals:
+        write_win_loss_records(
+            [team, win_count, loss_count, f"{hss_sum / predicted_games:.5f}"]
+            for team, (win_count, loss_count, hss_sum, predicted_games) in sorted(team_totals.items())
         )
+    else:
+        print("No games in the horizon; win_loss_records.csv and season projections were not refreshed.")
 
     # Close CSV writers if open
     if prediction_writer is not None:
@@ -512,10 +840,11 @@ def main():
         win_loss_writer.flush()
         win_loss_writer.close()
 
-    prediction_history_manager.save()
+    with stage("history_save"):
+        prediction_history_manager.save()
 
-    # 4) Read back the 'win_loss_records.csv' and print
-    if WIN_LOSS_RECORD_CSV.exists():
+    # 6) Read back the 'win_loss_records.csv' written by this run and print
+    if win_loss_writer is not None and WIN_LOSS_RECORD_CSV.exists():
         with WIN_LOSS_RECORD_CSV.open("r", encoding="utf-8-sig") as f:
             reader = csv.reader(f)
             next(reader, None)  # skip header
@@ -528,19 +857,46 @@ def main():
                 hss = row[3].strip()
                 print(f"{team} had a predicted record of {wins}-{losses} and a HoopSight Strength Score of {hss}")
 
-#Python class to represent game details
-class Game:
-    def __init__(self, display_date, iso_date, start_time, opponent, location, year):
-        self.display_date = display_date
-        self.iso_date = iso_date
-        self.start_time = start_time
-        self.opponent = opponent
-        self.location = location.upper() if location else ""
-        self.year = year
-        self.result = None
-
-    def set_result(self, result):
-        self.result = result
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Predict NBA games with the HoopSight random forest.")
+    parser.add_argument("--start", type=date.fromisoformat, default=None,
+                        help="First date to predict (YYYY-MM-DD). Defaults to tomorrow.")
+    horizon = parser.add_mutually_exclusive_group()
+    horizon.add_argument("--days", type=int, default=1,
+                         help="Number of days to predict, starting at --start (default: 1).")
+    horizon.add_argument("--end", type=date.fromisoformat, default=None,
+                         help="Last date to predict (YYYY-MM-DD), inclusive.")
+    horizon.add_argument("--rest-of-season", action="store_true",
+                         help="Predict every remaining game from --start onward.")
+    parser.add_argument("--skip-simulation", action="store_true",
+                        help="Skip the season and playoff Monte Carlo projections.")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Suppress per-game and per-lookup console output.")
+    parser.add_argument("--report", type=Path, default=RUN_REPORT_DIR / "predictions.json",
+                        help="Where to write the JSON timing report for this run.")
+    args = parser.parse_args(argv)
+    if args.end is not None and args.end < (args.start or today() + timedelta(days=1)):
+        parser.error("--end must not be before --start")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    set_quiet(args.quiet)
+    start_date = args.start or today() + timedelta(days=1)
+    end_date = args.end or start_date + timedelta(days=max(args.days, 1) - 1)
+    predict_horizon(
+        start_date,
+        end_date,
+        rest_of_season=args.rest_of_season,
+        simulate_season=not args.skip_simulation,
+    )
+
+    instrumentation = get_instrumentation()
+    instrumentation.print_summary()
+    print(f"Run report written to {instrumentation.write_report(args.report)}")
+
 
 if __name__ == "__main__":
     main()
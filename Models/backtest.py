@@ -0,0 +1,305 @@
+"""
+Walk-forward backtesting for the HoopSight random forest.
+
+For every season Y the model is trained on the Cleaned_Data rows from seasons
+before Y and then predicts each regular-season game of Y with the same
+home-advantage logic as ``predict_outcomes`` (no injury adjustments, since past
+injury reports are not stored). Seasons are independent, so they run in parallel
+across a process pool.
+
+Cleaned_Data only holds end-of-season team stats, so each game of season Y is
+scored with the HSS of season Y - ``hss_lag``. The default lag of 1 uses only
+stats known before the season starts. ``--hss-lag 0`` scores with season Y's own
+final stats, which leaks the games being predicted into their inputs; the report
+records the lag so such runs are labelled as look-ahead.
+
+Season years follow Cleaned_Data, where a year is the one the season ends in
+(2013 is 2012-13). Game results are read from ``Backtest_Games/games_<season>.csv``
+(Date,Home,Away,Home Win) and fetched once through nba_api when missing.
+
+Usage:
+    python backtest.py --start 2010 --end 2025 --workers 4
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import BACKTEST_GAMES_ROOT, BACKTEST_REPORT_JSON, HISTORICAL_DATA_ROOT, RF_HYPERPARAMETERS
+from hss_index import get_hss_index
+from team_mappings import team_from_abbreviation
+
+# Probabilities are clipped to [LOG_LOSS_EPSILON, 1 - LOG_LOSS_EPSILON] for log loss
+LOG_LOSS_EPSILON = 1e-15
+# Seasons between the HSS used as input and the season being scored (0 = look-ahead)
+HSS_LAG = 1
+
+# (iso_date, home_team, away_team, home_won)
+HistoricalGame = Tuple[str, str, str, bool]
+
+
+def season_label(end_year: int) -> str:
+    """nba_api season string for the season ending in 'end_year' (2013 -> '2012-13')."""
+    return f"{end_year - 1}-{str(end_year)[-2:]}"
+
+
+def season_games_path(end_year: int, games_root: Path = BACKTEST_GAMES_ROOT) -> Path:
+    return Path(games_root) / f"games_{season_label(end_year)}.csv"
+
+
+def fetch_season_games(end_year: int, games_root: Path = BACKTEST_GAMES_ROOT) -> Path:
+    """Download one regular season's results with nba_api and store them as CSV."""
+    from nba_api.stats.endpoints import leaguegamelog
+
+    frame = leaguegamelog.LeagueGameLog(
+        season=season_label(end_year),
+        season_type_all_star="Regular Season",
+        player_or_team_abbreviation="T",
+        timeout=30,
+    ).get_data_frames()[0]
+
+    rows = []
+    for record in frame.to_dict("records"):
+        matchup = str(record.get("MATCHUP", ""))
+        if " vs. " not in matchup:
+            continue  # Each game appears twice; keep the home team's row
+        home_abbr, away_abbr = matchup.split(" vs. ", 1)
+        try:
+            home_team = team_from_abbreviation(home_abbr)
+            away_team = team_from_abbreviation(away_abbr)
+        except KeyError as exc:
+            print(f"Skipping game {record.get('GAME_ID')}: {exc}")
+            continue
+        rows.append([str(record["GAME_DATE"])[:10], home_team, away_team, int(record.get("WL") == "W")])
+
+    rows.sort()
+    path = season_games_path(end_year, games_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Date", "Home", "Away", "Home Win"])
+        writer.writerows(rows)
+    print(f"Saved {len(rows)} games for {season_label(end_year)} to {path}")
+    return path
+
+
+def load_season_games(
+    end_year: int,
+    games_root: Path = BACKTEST_GAMES_ROOT,
+    fetch_missing: bool = True,
+) -> List[HistoricalGame]:
+    """Return the stored results for a season, fetching them first if allowed and missing."""
+    path = season_games_path(end_year, games_root)
+    if not path.exists():
+        if not fetch_missing:
+            return []
+        try:
+            fetch_season_games(end_year, games_root)
+        except Exception as exc:  # pylint: disable=broad-except
+            print(f"Unable to fetch games for {season_label(end_year)}: {exc}")
+            return []
+
+    games: List[HistoricalGame] = []
+    with path.open("r", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # Skip header
+        for row in reader:
+            if len(row) < 4:
+                continue
+            games.append((row[0].strip(), row[1].strip(), row[2].strip(), row[3].strip() == "1"))
+    return games
+
+
+@dataclass
+class SeasonBacktest:
+    """Scores for one backtested season."""
+    season: int
+    games: int
+    accuracy: float
+    brier: float
+    log_loss: float
+    seconds: float
+
+    @property
+    def label(self) -> str:
+        return season_label(self.season)
+
+
+def score_predictions(home_win_prob: np.ndarray, home_won: np.ndarray) -> Tuple[float, float, float]:
+    """Return (accuracy, Brier score, log loss) for home-win probabilities against outcomes."""
+    if home_win_prob.size == 0:
+        return math.nan, math.nan, math.nan
+    outcome = home_won.astype(float)
+    # A 50/50 call goes to the home team, as in predict_outcomes
+    accuracy = float(np.mean((home_win_prob >= 0.5) == home_won))
+    brier = float(np.mean((home_win_prob - outcome) ** 2))
+    clipped = np.clip(home_win_prob, LOG_LOSS_EPSILON, 1 - LOG_LOSS_EPSILON)
+    log_loss = float(-np.mean(outcome * np.log(clipped) + (1 - outcome) * np.log(1 - clipped)))
+    return accuracy, brier, log_loss
+
+
+def backtest_season(
+    season: int,
+    games: Sequence[HistoricalGame],
+    historical_data_path: Path = HISTORICAL_DATA_ROOT,
+    hyperparameters: Optional[Dict[str, object]] = None,
+    hss_lag: int = HSS_LAG,
+) -> Optional[SeasonBacktest]:
+    """
+    Train on seasons before 'season' and score every game of 'season' with the HSS
+    of season 'season - hss_lag'.
+    """
+    # Imported here so process-pool workers do the (slow) import in parallel
+    from RandomForest import apply_home_advantage, train_model
+
+    started = time.perf_counter()
+    try:
+        model = train_model(historical_data_path, hyperparameters or RF_HYPERPARAMETERS, before_year=season)
+    except ValueError as exc:
+        print(f"Skipping {season_label(season)}: {exc}")
+        return None
+
+    index = get_hss_index(historical_data_path)
+    team_hss: Dict[str, Optional[float]] = {}
+    home_hss, away_hss, home_won = [], [], []
+    for _, home_team, away_team, won in games:
+        for team in (home_team, away_team):
+            if team not in team_hss:
+                team_hss[team] = index.lookup(team, season - hss_lag, historical_only=True)
+        if team_hss[home_team] is None or team_hss[away_team] is None:
+            continue
+        home_hss.append(team_hss[home_team])
+        away_hss.append(team_hss[away_team])
+        home_won.append(won)
+
+    home = np.asarray(home_hss, dtype=float)
+    away = np.asarray(away_hss, dtype=float)
+    weighted_stat = apply_home_advantage(home, away) - away
+    if weighted_stat.size:
+        home_win_prob = np.clip(np.asarray(model.predict(weighted_stat.reshape(-1, 1)), dtype=float), 0.0, 1.0)
+    else:
+        home_win_prob = np.empty(0, dtype=float)
+    accuracy, brier, log_loss = score_predictions(home_win_prob, np.asarray(home_won, dtype=bool))
+
+    return SeasonBacktest(
+        season=season,
+        games=int(home_win_prob.size),
+        accuracy=accuracy,
+        brier=brier,
+        log_loss=log_loss,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def run_backtest(
+    seasons: Sequence[int],
+    workers: int = 1,
+    historical_data_path: Path = HISTORICAL_DATA_ROOT,
+    games_root: Path = BACKTEST_GAMES_ROOT,
+    fetch_missing: bool = True,
+    hyperparameters: Optional[Dict[str, object]] = None,
+    hss_lag: int = HSS_LAG,
+) -> List[SeasonBacktest]:
+    """Backtest each season in 'seasons', in parallel when 'workers' > 1."""
+    # Game files are loaded (and fetched) up front so workers never hit the network
+    season_games = {}
+    for season in seasons:
+        games = load_season_games(season, games_root, fetch_missing)
+        if games:
+            season_games[season] = games
+        else:
+            print(f"No games found for {season_label(season)}")
+
+    args = [
+        (season, games, historical_data_path, hyperparameters, hss_lag) for season, games in season_games.items()
+    ]
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(backtest_season, *zip(*args)))
+    else:
+        results = [backtest_season(*arg) for arg in args]
+    return [result for result in results if result is not None]
+
+
+def summarize(results: Sequence[SeasonBacktest]) -> Dict[str, float]:
+    """Game-weighted averages across all backtested seasons."""
+    total_games = sum(result.games for result in results)
+    if total_games == 0:
+        return {"games": 0}
+    return {
+        "games": total_games,
+        "accuracy": sum(r.accuracy * r.games for r in results) / total_games,
+        "brier": sum(r.brier * r.games for r in results) / total_games,
+        "log_loss": sum(r.log_loss * r.games for r in results) / total_games,
+        "seconds": sum(r.seconds for r in results),
+    }
+
+
+def print_report(results: Sequence[SeasonBacktest], wall_seconds: float, hss_lag: int = HSS_LAG) -> None:
+    if hss_lag <= 0:
+        print("Warning: scoring each season with its own final stats (look-ahead); results are optimistic.")
+    else:
+        print(f"Inputs: HSS from {hss_lag} season(s) before each tested season.")
+    print(f"{'Season':<9}{'Games':>7}{'Accuracy':>10}{'Brier':>9}{'LogLoss':>9}{'Seconds':>9}")
+    for r in results:
+        print(f"{r.label:<9}{r.games:>7}{r.accuracy:>10.4f}{r.brier:>9.4f}{r.log_loss:>9.4f}{r.seconds:>9.2f}")
+    overall = summarize(results)
+    if overall["games"]:
+        print(
+            f"{'All':<9}{overall['games']:>7}{overall['accuracy']:>10.4f}"
+            f"{overall['brier']:>9.4f}{overall['log_loss']:>9.4f}{overall['seconds']:>9.2f}"
+        )
+    print(f"Wall-clock time: {wall_seconds:.2f}s")
+
+
+def write_report(
+    results: Sequence[SeasonBacktest],
+    wall_seconds: float,
+    report_path: Path,
+    hss_lag: int = HSS_LAG,
+) -> None:
+    report = {
+        "hss_season_lag": hss_lag,
+        "look_ahead": hss_lag <= 0,
+        "seasons": [dict(asdict(r), label=r.label) for r in results],
+        "overall": summarize(results),
+        "wall_seconds": wall_seconds,
+    }
+    with Path(report_path).open("w", encoding="utf-8") as fp:
+        json.dump(report, fp, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the HoopSight model.")
+    parser.add_argument("--start", type=int, default=2010, help="First season to test (end year, e.g. 2010).")
+    parser.add_argument("--end", type=int, default=2025, help="Last season to test (end year), inclusive.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    parser.add_argument("--no-fetch", action="store_true", help="Only use game files already on disk.")
+    parser.add_argument("--report", type=Path, default=BACKTEST_REPORT_JSON, help="Where to write the JSON report.")
+    parser.add_argument("--hss-lag", type=int, default=HSS_LAG,
+                        help="Score season Y with the HSS of season Y - lag (default: 1; 0 is look-ahead).")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results = run_backtest(
+        range(args.start, args.end + 1),
+        workers=args.workers,
+        fetch_missing=not args.no_fetch,
+        hss_lag=args.hss_lag,
+    )
+    wall_seconds = time.perf_counter() - started
+    print_report(results, wall_seconds, args.hss_lag)
+    write_report(results, wall_seconds, args.report, args.hss_lag)
+
+
+if __name__ == "__main__":
+    main()
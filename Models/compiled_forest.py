@@ -0,0 +1,106 @@
+"""
+Compiled piecewise-constant form of the single-feature random forest.
+
+The forest is fit on one feature (WeightedStat), so every tree is a step function
+of that feature and so is their average. Compiling collects the split thresholds
+of every tree into one sorted array and stores the forest's output for each
+interval between consecutive thresholds. Inference is then a ``searchsorted`` and
+a gather in pure NumPy, with no scikit-learn import.
+
+sklearn casts inputs to float32 before walking a tree and sends a sample left
+when ``x <= threshold``. The compiled predictor does the same cast and uses
+``side="left"``, and each interval's value is taken from the fitted forest at a
+float32 point inside that interval, so outputs match ``model.predict`` exactly.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+COMPILED_FORMAT_VERSION = 1
+
+
+class CompiledForest:
+    """
+    Step-function predictor: ``values[i]`` is the prediction for inputs in
+    ``(thresholds[i - 1], thresholds[i]]`` after the float32 cast, and
+    ``values[-1]`` covers everything above the last threshold.
+    """
+
+    def __init__(self, thresholds: np.ndarray, values: np.ndarray):
+        self.thresholds = np.asarray(thresholds, dtype=np.float64)
+        self.values = np.asarray(values, dtype=np.float64)
+        if self.values.shape != (self.thresholds.shape[0] + 1,):
+            raise ValueError("CompiledForest needs exactly one more value than thresholds")
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def predict(self, X) -> np.ndarray:
+        """Drop-in for ``RandomForestRegressor.predict`` on (n, 1) or (n,) inputs."""
+        x = np.asarray(X, dtype=np.float64)
+        if x.ndim == 2:
+            if x.shape[1] != 1:
+                raise ValueError(f"CompiledForest expects a single feature, got {x.shape[1]}")
+            x = x[:, 0]
+        x = x.astype(np.float32).astype(np.float64)
+        return self.values[np.searchsorted(self.thresholds, x, side="left")]
+
+    def save(self, path: Path) -> None:
+        with Path(path).open("wb") as handle:
+            np.savez(
+                handle,
+                format_version=np.array(COMPILED_FORMAT_VERSION),
+                thresholds=self.thresholds,
+                values=self.values,
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "CompiledForest":
+        with np.load(Path(path)) as data:
+            version = int(data["format_version"])
+            if version != COMPILED_FORMAT_VERSION:
+                raise ValueError(f"Unsupported compiled forest format {version} in {path}")
+            return cls(data["thresholds"], data["values"])
+
+
+def _interval_points(thresholds: np.ndarray) -> np.ndarray:
+    """One float32-representable input inside each interval of ``thresholds``."""
+    points = np.empty(thresholds.shape[0] + 1, dtype=np.float32)
+    if thresholds.shape[0] == 0:
+        points[0] = 0.0
+        return points.astype(np.float64)
+
+    # Interval i ends at thresholds[i] (inclusive): use the largest float32 <= thresholds[i]
+    upper = thresholds.astype(np.float32)
+    above = upper.astype(np.float64) > thresholds
+    upper[above] = np.nextafter(upper[above], np.float32(-np.inf))
+    points[:-1] = upper
+
+    # Last interval is everything above the final threshold
+    last = np.float32(thresholds[-1])
+    if np.float64(last) <= thresholds[-1]:
+        last = np.nextafter(last, np.float32(np.inf))
+    points[-1] = last
+    return points.astype(np.float64)
+
+
+def compile_forest(model) -> CompiledForest:
+    """
+    Compile a fitted single-feature tree ensemble (e.g. RandomForestRegressor).
+    Interval values come from ``model.predict`` itself, so they carry sklearn's
+    exact summation order.
+    """
+    if getattr(model, "n_features_in_", 1) != 1:
+        raise ValueError("Only single-feature forests can be compiled")
+
+    split_thresholds = []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        is_split = tree.children_left != tree.children_right
+        split_thresholds.append(tree.threshold[is_split])
+    thresholds = np.unique(np.concatenate(split_thresholds)) if split_thresholds else np.empty(0)
+
+    points = _interval_points(thresholds)
+    values = np.asarray(model.predict(points.reshape(-1, 1)), dtype=np.float64).reshape(-1)
+    return CompiledForest(thresholds, values)
@@ -1,3 +1,5 @@
+import os
+from datetime import date, datetime
 from pathlib import Path
 
 # Core seasonal configuration
@@ -14,9 +16,65 @@ DATA_EXPORT_DIR.mkdir(parents=True, exist_ok=True)
 
 PREDICTION_RESULTS_CSV = DATA_EXPORT_DIR / "prediction_results.csv"
 WIN_LOSS_RECORD_CSV = DATA_EXPORT_DIR / "win_loss_records.csv"
-PREDICTION_HISTORY_JSON = DATA_EXPORT_DIR / "prediction_history.json"
+# Prediction history, published as <season>/<YYYY-MM>.json partitions plus manifest.json
+PREDICTION_HISTORY_DIR = DATA_EXPORT_DIR / "prediction_history"
+# Compressed, append-only archive of predictions pruned from the hot history
+PREDICTION_ARCHIVE_DIR = DATA_EXPORT_DIR / "prediction_archive"
+# Accuracy / calibration rollups over every graded prediction (hot and archived)
+PREDICTION_ROLLUPS_JSON = DATA_EXPORT_DIR / "prediction_rollups.json"
+
+# Prediction history storage: "json" (whole history in memory) or "sqlite" (indexed database
+# that re-exports the touched PREDICTION_HISTORY_DIR partitions for the front end)
+PREDICTION_HISTORY_BACKEND = os.environ.get("HOOPSIGHT_HISTORY_BACKEND", "json")
+PREDICTION_HISTORY_DB = BASE_DIR / "history" / "prediction_history.sqlite3"
 
 # Schedule configuration
 SCHEDULE_ROOT = PROJECT_ROOT / "Schedule"
 HISTORICAL_DATA_ROOT = PROJECT_ROOT / "Cleaned_Data"
 CURRENT_DATA_ROOT = PROJECT_ROOT / "Current_Data"
+LEAGUE_SCHEDULE_CSV = PROJECT_ROOT / f"nba_schedule_{CURRENT_SEASON}.csv"
+
+# Model artifacts
+MODEL_ARTIFACT_DIR = BASE_DIR / "artifacts"
+RF_HYPERPARAMETERS = {"n_estimators": 100, "random_state": 42}
+
+# Season projections
+STANDINGS_CSV = PROJECT_ROOT / "Standings" / "standings.csv"
+SEASON_PROJECTIONS_JSON = DATA_EXPORT_DIR / "season_projections.json"
+SEASON_SIMULATIONS = 50_000
+PLAYOFF_ODDS_CSV = DATA_EXPORT_DIR / "playoff_odds.csv"
+
+# Backtesting
+BACKTEST_GAMES_ROOT = PROJECT_ROOT / "Backtest_Games"
+BACKTEST_REPORT_JSON = BASE_DIR / "backtest_report.json"
+
+# Per-run timing reports
+RUN_REPORT_DIR = BASE_DIR / "run_reports"
+
+# On-disk caches; HOOPSIGHT_CACHE_DIR points them elsewhere (e.g. a fresh directory for replayed runs)
+CACHE_DIR = Path(os.environ.get("HOOPSIGHT_CACHE_DIR") or BASE_DIR / "cache")
+
+# On-disk scoreboard cache shared by espn_predictor and update_prediction_results
+SCOREBOARD_CACHE_DIR = CACHE_DIR / "scoreboards"
+SCOREBOARD_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Per-source latency and failure stats used to order result sources
+SOURCE_STATS_JSON = CACHE_DIR / "source_stats.json"
+
+# Recorded HTTP responses served by http_replay's stand-in server
+HTTP_FIXTURE_DIR = PROJECT_ROOT / "Fixtures" / "http"
+
+
+def today() -> date:
+    """Today's date, or HOOPSIGHT_TODAY (YYYY-MM-DD) when set so replayed runs see a fixed day."""
+    pinned = os.environ.get("HOOPSIGHT_TODAY")
+    if pinned:
+        return datetime.strptime(pinned, "%Y-%m-%d").date()
+    return date.today()
+
+
+def now() -> datetime:
+    """Current local time, or noon of HOOPSIGHT_TODAY when set."""
+    if os.environ.get("HOOPSIGHT_TODAY"):
+        return datetime.combine(today(), datetime.min.time().replace(hour=12)).astimezone()
+    return datetime.now().astimezone()
@@ -1,65 +1,57 @@
-"""Utilities for fetching ESPN matchup predictor data for NBA games."""
+"""
+Utilities for fetching ESPN matchup predictor data for NBA games.
+
+``prefetch_espn_predictions`` resolves every (date, home, away) key of a run up
+front. Scoreboards and, where the scoreboard has no predictor, gamecast pages
+are fetched concurrently over one pooled session with bounded concurrency.
+"""
 
 from __future__ import annotations
 
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from scoreboard_cache import espn_scoreboard_state, get_scoreboard_cache
+from team_mappings import canonical_abbreviation
 
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 " \
     "(KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
 SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
 
-_SCOREBOARD_CACHE: Dict[str, Dict[str, object]] = {}
-
-_ABBR_CANONICAL: Dict[str, str] = {
-    "ATL": "ATL",
-    "BOS": "BOS",
-    "BKN": "BKN",
-    "CHA": "CHA",
-    "CHI": "CHI",
-    "CLE": "CLE",
-    "DAL": "DAL",
-    "DEN": "DEN",
-    "DET": "DET",
-    "GS": "GSW",
-    "GSW": "GSW",
-    "HOU": "HOU",
-    "IND": "IND",
-    "LAC": "LAC",
-    "LAL": "LAL",
-    "MEM": "MEM",
-    "MIA": "MIA",
-    "MIL": "MIL",
-    "MIN": "MIN",
-    "NO": "NOP",
-    "NOP": "NOP",
-    "NY": "NYK",
-    "NYK": "NYK",
-    "OKC": "OKC",
-    "ORL": "ORL",
-    "PHI": "PHI",
-    "PHX": "PHX",
-    "POR": "POR",
-    "SAC": "SAC",
-    "SA": "SAS",
-    "SAS": "SAS",
-    "TOR": "TOR",
-    "UTA": "UTA",
-    "UTAH": "UTA",
-    "WAS": "WAS",
-    "WSH": "WAS",
-}
+REQUEST_TIMEOUT = 15
+# Upper bound on concurrent ESPN requests (and pooled connections)
+MAX_CONCURRENT_REQUESTS = 8
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# (iso_date, home_abbr, away_abbr)
+MatchupKey = Tuple[str, str, str]
+
+
+def get_session() -> requests.Session:
+    """Shared session whose connection pool is sized for MAX_CONCURRENT_REQUESTS."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": USER_AGENT})
+            _session = session
+        return _session
 
 
 def _canonical_abbr(abbr: Optional[str]) -> Optional[str]:
-    if abbr is None:
-        return None
-    upper = abbr.upper()
-    return _ABBR_CANONICAL.get(upper, upper)
+    return canonical_abbreviation(abbr)
 
 
 @dataclass
@@ -142,7 +134,7 @@ def _extract_probabilities_from_event(event: Dict[str, object]) -> Dict[str, Opt
 
 def _scrape_gamecast_prediction(url: str) -> Dict[str, Optional[float]]:
     try:
-        response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=15)
+        response = get_session().get(url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
     except requests.RequestException:
         return {"home": None, "away": None}
@@ -175,78 +167,170 @@ def _scrape_gamecast_prediction(url: str) -> Dict[str, Optional[float]]:
     return {"home": home_pct, "away": away_pct}
 
 
-def fetch_espn_prediction(iso_date: str, home_abbr: str, away_abbr: str) -> EspnPrediction:
-    datestr = iso_date.replace("-", "")
-    params = {"dates": datestr}
-    target_home_abbr = _canonical_abbr(home_abbr)
-    target_away_abbr = _canonical_abbr(away_abbr)
-    if target_home_abbr is None or target_away_abbr is None:
-        return EspnPrediction(None, None, None, None, None, None, None)
+def _empty_prediction() -> EspnPrediction:
+    return EspnPrediction(None, None, None, None, None, None, None)
+
+
+def _download_scoreboard(datestr: str) -> Optional[Dict[str, object]]:
     try:
-        if datestr in _SCOREBOARD_CACHE:
-            scoreboard = _SCOREBOARD_CACHE[datestr]
-        else:
-            response = requests.get(
-                SCOREBOARD_URL,
-                params=params,
-                headers={"User-Agent": USER_AGENT},
-                timeout=15,
-            )
-            response.raise_for_status()
-            scoreboard = response.json()
-            _SCOREBOARD_CACHE[datestr] = scoreboard
+        response = get_session().get(SCOREBOARD_URL, params={"dates": datestr}, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
     except (requests.RequestException, json.JSONDecodeError):
-        return EspnPrediction(None, None, None, None, None, None, None)
+        return None
 
-    events = scoreboard.get("events", [])
-    for event in events:
+
+def _load_scoreboard(datestr: str) -> Optional[Dict[str, object]]:
+    """Return the ESPN scoreboard for a YYYYMMDD date, read through the on-disk scoreboard cache."""
+    return get_scoreboard_cache().get_or_fetch(
+        "espn",
+        datestr,
+        lambda: _download_scoreboard(datestr),
+        espn_scoreboard_state,
+    )
+
+
+def _index_scoreboard_events(scoreboard: Dict[str, object]) -> Dict[Tuple[str, str], Dict[str, object]]:
+    """Map (canonical home abbr, canonical away abbr) to the scoreboard event for that matchup."""
+    indexed: Dict[Tuple[str, str], Dict[str, object]] = {}
+    for event in scoreboard.get("events", []):
         competitions = event.get("competitions", [])
         if not competitions:
             continue
-        comp = competitions[0]
-        competitors = comp.get("competitors", [])
+        competitors = competitions[0].get("competitors", [])
         home_comp = next((c for c in competitors if c.get("homeAway") == "home"), None)
         away_comp = next((c for c in competitors if c.get("homeAway") == "away"), None)
         if not home_comp or not away_comp:
             continue
-
         event_home_abbr = _canonical_abbr(home_comp.get("team", {}).get("abbreviation"))
         event_away_abbr = _canonical_abbr(away_comp.get("team", {}).get("abbreviation"))
-        if event_home_abbr != target_home_abbr or event_away_abbr != target_away_abbr:
-            continue
+        indexed.setdefault((event_home_abbr, event_away_abbr), event)
+    return indexed
 
-        game_id = event.get("id")
-        source_url = None
-        for link in event.get("links", []):
-            if not isinstance(link, dict):
-                continue
-            rel = link.get("rel", [])
-            if "gamecast" in rel:
-                source_url = link.get("href")
-                break
-        if not source_url and game_id:
-            source_url = f"https://www.espn.com/nba/game/_/gameId/{game_id}"
-
-        predictor = _extract_probabilities_from_event(event)
-        if predictor["home"] is None or predictor["away"] is None:
-            predictor = _scrape_gamecast_prediction(source_url) if source_url else {"home": None, "away": None}
 
-        home_pct = predictor.get("home")
-        away_pct = predictor.get("away")
+def _gamecast_url(event: Dict[str, object]) -> Optional[str]:
+    for link in event.get("links", []):
+        if not isinstance(link, dict):
+            continue
+        rel = link.get("rel", [])
+        if "gamecast" in rel:
+            return link.get("href")
+    game_id = event.get("id")
+    return f"https://www.espn.com/nba/game/_/gameId/{game_id}" if game_id else None
+
+
+def _needs_gamecast(event: Dict[str, object]) -> bool:
+    predictor = _extract_probabilities_from_event(event)
+    return predictor["home"] is None or predictor["away"] is None
+
+
+def _prediction_from_event(
+    event: Dict[str, object],
+    scraped: Optional[Dict[str, Optional[float]]] = None,
+) -> EspnPrediction:
+    """
+    Build an EspnPrediction from a scoreboard event. When the event carries no predictor,
+    'scraped' (the gamecast values, if already fetched) is used, else the gamecast is scraped now.
+    """
+    competitors = event["competitions"][0].get("competitors", [])
+    home_comp = next(c for c in competitors if c.get("homeAway") == "home")
+    away_comp = next(c for c in competitors if c.get("homeAway") == "away")
+    event_home_abbr = _canonical_abbr(home_comp.get("team", {}).get("abbreviation"))
+    event_away_abbr = _canonical_abbr(away_comp.get("team", {}).get("abbreviation"))
+
+    game_id = event.get("id")
+    source_url = _gamecast_url(event)
+
+    predictor = _extract_probabilities_from_event(event)
+    if predictor["home"] is None or predictor["away"] is None:
+        if scraped is not None:
+            predictor = scraped
+        else:
+            predictor = _scrape_gamecast_prediction(source_url) if source_url else {"home": None, "away": None}
 
-        favorite_full = None
-        favorite_abbr = None
-        confidence_gap = None
-        if home_pct is not None and away_pct is not None:
-            if home_pct >= away_pct:
-                favorite_full = home_comp.get("team", {}).get("displayName")
-                favorite_abbr = event_home_abbr
-                confidence_gap = round(abs(home_pct - 50.0), 3)
-            else:
-                favorite_full = away_comp.get("team", {}).get("displayName")
-                favorite_abbr = event_away_abbr
-                confidence_gap = round(abs(away_pct - 50.0), 3)
+    home_pct = predictor.get("home")
+    away_pct = predictor.get("away")
+
+    favorite_full = None
+    favorite_abbr = None
+    confidence_gap = None
+    if home_pct is not None and away_pct is not None:
+        if home_pct >= away_pct:
+            favorite_full = home_comp.get("team", {}).get("displayName")
+            favorite_abbr = event_home_abbr
+            confidence_gap = round(abs(home_pct - 50.0), 3)
+        else:
+            favorite_full = away_comp.get("team", {}).get("displayName")
+            favorite_abbr = event_away_abbr
+            confidence_gap = round(abs(away_pct - 50.0), 3)
+
+    return EspnPrediction(game_id, source_url, home_pct, away_pct, favorite_full, favorite_abbr, confidence_gap)
+
+
+def prefetch_espn_predictions(
+    keys: Iterable[MatchupKey],
+    max_workers: int = MAX_CONCURRENT_REQUESTS,
+) -> Dict[MatchupKey, EspnPrediction]:
+    """
+    Resolve ESPN predictions for every (iso_date, home_abbr, away_abbr) key at once.
+    Each needed scoreboard is fetched once, then every gamecast page needed as a
+    fallback; both phases run on a thread pool of at most 'max_workers'.
+    Returns a lookup keyed exactly as passed in; unmatched keys map to empty predictions.
+    """
+    keys = list(dict.fromkeys(keys))
+    results = {key: _empty_prediction() for key in keys}
+    targets = {
+        key: (_canonical_abbr(key[1]), _canonical_abbr(key[2]))
+        for key in keys
+        if key[1] is not None and key[2] is not None
+    }
+    if not targets:
+        return results
+
+    workers = max(1, max_workers)
+    datestrs = sorted({key[0].replace("-", "") for key in targets})
+    with ThreadPoolExecutor(max_workers=min(workers, len(datestrs))) as pool:
+        scoreboards = dict(zip(datestrs, pool.map(_load_scoreboard, datestrs)))
+    get_scoreboard_cache().evict()  # Once per prefetch, after every scoreboard is written
+
+    events_by_date = {
+        datestr: _index_scoreboard_events(scoreboard)
+        for datestr, scoreboard in scoreboards.items()
+        if scoreboard is not None
+    }
+    matched: Dict[MatchupKey, Dict[str, object]] = {}
+    for key, target in targets.items():
+        event = events_by_date.get(key[0].replace("-", ""), {}).get(target)
+        if event is not None:
+            matched[key] = event
+
+    urls: List[str] = sorted({
+        url for url in (_gamecast_url(event) for event in matched.values() if _needs_gamecast(event)) if url
+    })
+    scraped: Dict[str, Dict[str, Optional[float]]] = {}
+    if urls:
+        with ThreadPoolExecutor(max_workers=min(workers, len(urls))) as pool:
+            scraped = dict(zip(urls, pool.map(_scrape_gamecast_prediction, urls)))
+
+    empty_predictor = {"home": None, "away": None}
+    for key, event in matched.items():
+        url = _gamecast_url(event)
+        results[key] = _prediction_from_event(event, scraped.get(url, empty_predictor) if url else empty_predictor)
+    return results
+
+
+def fetch_espn_predictions(
+    iso_date: str,
+    matchups: Iterable[Tuple[str, str]],
+) -> Dict[Tuple[str, str], EspnPrediction]:
+    """
+    Fetch ESPN predictions for every (home_abbr, away_abbr) matchup on one date with a
+    single scoreboard request. The result is keyed by the matchups exactly as passed in.
+    """
+    matchups = list(matchups)
+    prefetched = prefetch_espn_predictions((iso_date, home_abbr, away_abbr) for home_abbr, away_abbr in matchups)
+    return {matchup: prefetched[(iso_date, *matchup)] for matchup in matchups}
 
-        return EspnPrediction(game_id, source_url, home_pct, away_pct, favorite_full, favorite_abbr, confidence_gap)
 
-    return EspnPrediction(None, None, None, None, None, None, None)
+def fetch_espn_prediction(iso_date: str, home_abbr: str, away_abbr: str) -> EspnPrediction:
+    return prefetch_espn_predictions([(iso_date, home_abbr, away_abbr)])[(iso_date, home_abbr, away_abbr)]
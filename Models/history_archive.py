@@ -0,0 +1,143 @@
+"""
+Compressed, append-only archive for predictions that left the hot history.
+
+Records are appended as gzip members of JSON lines to ``segment-NNNNNN.jsonl.gz``
+files, with one member per game date in each append. Existing bytes are never
+rewritten. A segment is closed once it grows past ``max_segment_bytes``.
+
+``index.json`` maps every game date to the (segment, offset, length, records)
+of its members, so a date-window read seeks straight to the matching members
+and decompresses only those. The index is replaced atomically after the
+segment append. A crash in between leaves unreferenced bytes at the end of a
+segment, never a broken index.
+
+A record archived more than once (same season, date and teams) is returned
+once, with the most recently appended copy winning.
+"""
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import PREDICTION_ARCHIVE_DIR
+
+ARCHIVE_FORMAT_VERSION = 1
+MAX_SEGMENT_BYTES = 8 * 1024 * 1024
+
+# (segment file name, byte offset, byte length, record count)
+MemberRef = Tuple[str, int, int, int]
+
+
+def _row_key(row: Dict[str, object]) -> Tuple[object, ...]:
+    return (row.get("season"), row.get("game_date"), row.get("home_team"), row.get("away_team"))
+
+
+class HistoryArchive:
+    """
+    Args:
+        root: Directory holding the segments and index.json
+        max_segment_bytes: Size after which appends go to a new segment
+    """
+
+    def __init__(self, root: Path = PREDICTION_ARCHIVE_DIR, max_segment_bytes: int = MAX_SEGMENT_BYTES):
+        self.root = Path(root)
+        self.index_path = self.root / "index.json"
+        self.max_segment_bytes = max_segment_bytes
+        self._index: Optional[Dict[str, object]] = None
+
+    def _load_index(self) -> Dict[str, object]:
+        if self._index is None:
+            try:
+                with self.index_path.open("r", encoding="utf-8") as fp:
+                    self._index = json.load(fp)
+            except (OSError, json.JSONDecodeError):
+                self._index = {"format_version": ARCHIVE_FORMAT_VERSION, "segments": [], "dates": {}}
+        return self._index
+
+    def _save_index(self) -> None:
+        tmp_path = self.index_path.with_name(f".{self.index_path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as fp:
+            json.dump(self._index, fp, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def _current_segment(self) -> Path:
+        segments: List[str] = self._load_index()["segments"]
+        if segments:
+            path = self.root / segments[-1]
+            if not path.exists() or path.stat().st_size < self.max_segment_bytes:
+                return path
+        name = f"segment-{len(segments) + 1:06d}.jsonl.gz"
+        segments.append(name)
+        return self.root / name
+
+    def append(self, rows: Iterable[Dict[str, object]]) -> int:
+        """
+        Append record dicts (one gzip member per game date). Returns the number written.
+        Concurrent writers must hold the history lock.
+        """
+        by_date: Dict[str, List[Dict[str, object]]] = {}
+        for row in rows:
+            by_date.setdefault(str(row["game_date"]), []).append(row)
+        if not by_date:
+            return 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Start from the index on disk: another process may have appended since it was read
+        self._index = None
+        index = self._load_index()
+        segment = self._current_segment()
+        refs: List[Tuple[str, MemberRef]] = []
+        with segment.open("ab") as fp:
+            offset = fp.seek(0, os.SEEK_END)
+            for game_date in sorted(by_date):
+                lines = "".join(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n" for row in by_date[game_date])
+                member = gzip.compress(lines.encode("utf-8"), mtime=0)
+                fp.write(member)
+                refs.append((game_date, (segment.name, offset, len(member), len(by_date[game_date]))))
+                offset += len(member)
+            fp.flush()
+            os.fsync(fp.fileno())
+
+        dates: Dict[str, List[MemberRef]] = index["dates"]
+        for game_date, ref in refs:
+            dates.setdefault(game_date, []).append(list(ref))
+        self._save_index()
+        return sum(len(day_rows) for day_rows in by_date.values())
+
+    def dates(self) -> List[str]:
+        return sorted(self._load_index()["dates"])
+
+    def read_rows(
+        self,
+        start_iso: Optional[str] = None,
+        end_iso: Optional[str] = None,
+        season: Optional[str] = None,
+    ) -> List[Dict[str, object]]:
+        """Archived rows dated start_iso..end_iso (inclusive, open-ended when None), in date order."""
+        refs = [
+            ref
+            for game_date, day_refs in self._load_index()["dates"].items()
+            if (start_iso is None or game_date >= start_iso) and (end_iso is None or game_date <= end_iso)
+            for ref in day_refs
+        ]
+        # Append order, so later copies of a record replace earlier ones
+        refs.sort(key=lambda ref: (ref[0], ref[1]))
+
+        rows: Dict[Tuple[object, ...], Dict[str, object]] = {}
+        handles = {}
+        try:
+            for segment, offset, length, _ in refs:
+                if segment not in handles:
+                    handles[segment] = (self.root / segment).open("rb")
+                handle = handles[segment]
+                handle.seek(offset)
+                for line in gzip.decompress(handle.read(length)).decode("utf-8").splitlines():
+                    row = json.loads(line)
+                    if season is None or row.get("season") == season:
+                        rows[_row_key(row)] = row
+        finally:
+            for handle in handles.values():
+                handle.close()
+        return sorted(rows.values(), key=lambda row: (row["game_date"], row.get("game_tipoff_et") or ""))
@@ -0,0 +1,72 @@
+"""
+Streaming JSON codec for prediction history files.
+
+``write_records`` writes records straight from their attributes in a fixed
+field order, one object at a time, without building a list of dicts. The
+output is byte-identical to ``json.dump([record.to_dict(), ...], fp,
+ensure_ascii=False, indent=2)``.
+
+``iter_objects`` walks a JSON array and yields one decoded object at a time,
+so callers can turn each into a record while only one dict is alive.
+"""
+
+import json
+import re
+from typing import Iterable, Iterator, Sequence, TextIO
+
+_encode_str = json.encoder.encode_basestring  # ensure_ascii=False variant
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decode_value = json.JSONDecoder().raw_decode
+
+
+def _encode_value(value: object, indent: str) -> str:
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, str):
+        return _encode_str(value)
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float) and value == value and value not in (float("inf"), float("-inf")):
+        return float.__repr__(value)
+    # Nested lists / dicts (and non-finite floats): defer to json, re-indented to this depth
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + indent)
+
+
+def write_records(fp: TextIO, records: Iterable[object], fields: Sequence[str]) -> int:
+    """Write 'records' as a JSON array of objects with the given fields. Returns the count."""
+    prefixes = [f'    {_encode_str(name)}: ' for name in fields]
+    count = 0
+    for record in records:
+        fp.write("[\n  {\n" if count == 0 else ",\n  {\n")
+        fp.write(",\n".join(
+            prefix + _encode_value(getattr(record, name), "    ") for prefix, name in zip(prefixes, fields)
+        ))
+        fp.write("\n  }")
+        count += 1
+    fp.write("\n]" if count else "[]")
+    return count
+
+
+def iter_objects(text: str) -> Iterator[object]:
+    """Yield the elements of the JSON array in 'text' one at a time."""
+    index = _WHITESPACE.match(text, 0).end()
+    if index == len(text):
+        return
+    if text[index] != "[":
+        raise ValueError("Expected a JSON array")
+    index = _WHITESPACE.match(text, index + 1).end()
+    if text.startswith("]", index):
+        return
+    while True:
+        value, index = _decode_value(text, index)
+        yield value
+        index = _WHITESPACE.match(text, index).end()
+        if text.startswith("]", index):
+            return
+        if not text.startswith(",", index):
+            raise ValueError(f"Expected ',' or ']' at position {index}")
+        index = _WHITESPACE.match(text, index + 1).end()
@@ -0,0 +1,240 @@
+"""
+Running accuracy and calibration rollups over graded predictions.
+
+Every graded record adds one sample to an overall cell and to one cell per
+bucket in each dimension (season, model_version, confidence_bucket,
+alignment_bucket, team, month). A cell stores sums only, so a record can be
+added or subtracted in O(1) whenever it is graded, re-graded or gets a new
+ESPN snapshot. Accuracy, Brier score, mean margin_error and ESPN agreement
+rate are derived from the sums when the summary is written.
+
+The summary goes to ``prediction_rollups.json`` next to the other front-end
+exports. Readers take their numbers straight from it instead of scanning the
+history. Deleting the file makes the next PredictionHistoryManager rebuild
+it from the hot history and the archive.
+
+Changes made since the last save are also kept apart, and ``save`` adds them
+to the totals currently on disk. Two processes grading different games in
+parallel therefore both land in the summary.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import PREDICTION_ROLLUPS_JSON, now
+
+ROLLUP_FORMAT_VERSION = 1
+ROLLUP_DIMENSIONS: Tuple[str, ...] = (
+    "season",
+    "model_version",
+    "confidence_bucket",
+    "alignment_bucket",
+    "team",
+    "month",
+)
+
+
+@dataclass
+class RollupCell:
+    """Sums over the graded games of one bucket."""
+    games: int = 0
+    correct: int = 0
+    brier_sum: float = 0.0
+    margin_samples: int = 0
+    margin_error_sum: float = 0.0
+    espn_games: int = 0
+    espn_agree: int = 0
+    espn_correct: int = 0
+    both_correct: int = 0
+
+    def add(self, record, sign: int = 1) -> None:
+        self.games += sign
+        self.correct += sign * bool(record.correct)
+        # Brier score of the probability given to the predicted winner
+        self.brier_sum += sign * (record.predicted_win_pct / 100.0 - float(bool(record.correct))) ** 2
+        if record.margin_error is not None:
+            self.margin_samples += sign
+            self.margin_error_sum += sign * abs(record.margin_error)
+        if record.espn_alignment is not None:
+            espn_correct = record.espn_favorite_abbr == _winner_abbr(record)
+            self.espn_games += sign
+            self.espn_agree += sign * (record.espn_alignment == "Agree")
+            self.espn_correct += sign * espn_correct
+            self.both_correct += sign * (espn_correct and bool(record.correct))
+
+    def merge(self, other: "RollupCell") -> None:
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def to_dict(self) -> Dict[str, object]:
+        payload: Dict[str, object] = asdict(self)
+        payload["brier_sum"] = round(self.brier_sum, 6)
+        payload["margin_error_sum"] = round(self.margin_error_sum, 4)
+        payload["accuracy"] = _ratio(self.correct, self.games)
+        payload["brier"] = _ratio(self.brier_sum, self.games)
+        payload["mean_margin_error"] = _ratio(self.margin_error_sum, self.margin_samples)
+        payload["espn_agreement_rate"] = _ratio(self.espn_agree, self.espn_games)
+        payload["espn_accuracy"] = _ratio(self.espn_correct, self.espn_games)
+        return payload
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, object]) -> "RollupCell":
+        return cls(**{name: payload[name] for name in asdict(cls()) if name in payload})
+
+
+def _ratio(numerator: float, denominator: int) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator > 0 else None
+
+
+def _winner_abbr(record) -> Optional[str]:
+    if record.actual_winner == record.home_team:
+        return record.home_team_abbr
+    if record.actual_winner == record.away_team:
+        return record.away_team_abbr
+    return None
+
+
+def _buckets(record) -> List[Tuple[str, str]]:
+    """(dimension, bucket) pairs a graded record counts towards."""
+    buckets = [
+        ("season", record.season),
+        ("model_version", record.model_version),
+        ("confidence_bucket", record.confidence_bucket),
+        ("alignment_bucket", record.alignment_bucket),
+        ("team", record.home_team),
+        ("team", record.away_team),
+        ("month", record.game_date[:7]),
+    ]
+    return [(dimension, bucket) for dimension, bucket in buckets if bucket is not None]
+
+
+class RollupTable:
+    """The overall cell plus one cell per bucket of every dimension."""
+
+    def __init__(self):
+        self.overall = RollupCell()
+        self.cells: Dict[str, Dict[str, RollupCell]] = {dimension: {} for dimension in ROLLUP_DIMENSIONS}
+
+    def apply(self, record, sign: int) -> None:
+        self.overall.add(record, sign)
+        for dimension, bucket in _buckets(record):
+            self.cells[dimension].setdefault(bucket, RollupCell()).add(record, sign)
+
+    def merge(self, other: "RollupTable") -> None:
+        self.overall.merge(other.overall)
+        for dimension in ROLLUP_DIMENSIONS:
+            cells = self.cells[dimension]
+            for bucket, cell in other.cells[dimension].items():
+                cells.setdefault(bucket, RollupCell()).merge(cell)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "overall": self.overall.to_dict(),
+            "by": {
+                dimension: {
+                    bucket: cell.to_dict() for bucket, cell in sorted(self.cells[dimension].items()) if cell.games > 0
+                }
+                for dimension in ROLLUP_DIMENSIONS
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, object]) -> "RollupTable":
+        table = cls()
+        table.overall = RollupCell.from_dict(payload.get("overall", {}))
+        for dimension in ROLLUP_DIMENSIONS:
+            table.cells[dimension] = {
+                bucket: RollupCell.from_dict(cell) for bucket, cell in payload.get("by", {}).get(dimension, {}).items()
+            }
+        return table
+
+
+class HistoryRollups:
+    """
+    Args:
+        path: Summary file; None keeps the rollups in memory only
+    """
+
+    def __init__(self, path: Optional[Path] = PREDICTION_ROLLUPS_JSON):
+        self.path = Path(path) if path is not None else None
+        loaded = self._load()
+        self.loaded = loaded is not None
+        self.totals = loaded or RollupTable()
+        # Changes since the last save, added to the on-disk totals by save()
+        self._pending = RollupTable()
+        self._dirty = False
+
+    @property
+    def overall(self) -> RollupCell:
+        return self.totals.overall
+
+    @property
+    def cells(self) -> Dict[str, Dict[str, RollupCell]]:
+        return self.totals.cells
+
+    def _load(self) -> Optional[RollupTable]:
+        if self.path is None or not self.path.exists():
+            return None
+        try:
+            with self.path.open("r", encoding="utf-8") as fp:
+                payload = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if payload.get("format_version") != ROLLUP_FORMAT_VERSION:
+            return None
+        return RollupTable.from_dict(payload)
+
+    def _apply(self, record, sign: int) -> None:
+        if not record.completed or record.correct is None:
+            return
+        change = RollupTable()
+        change.apply(record, sign)
+        self.totals.merge(change)
+        self._pending.merge(change)
+        self._dirty = True
+
+    def add(self, record) -> None:
+        """Count a graded record (ungraded ones are ignored)."""
+        self._apply(record, 1)
+
+    def remove(self, record) -> None:
+        """Undo add() for the record's current values, before they change."""
+        self._apply(record, -1)
+
+    def rebuild(self, records: Iterable[object]) -> None:
+        self.totals = RollupTable()
+        for record in records:
+            if record.completed and record.correct is not None:
+                self.totals.apply(record, 1)
+        self._pending = RollupTable()
+        self._dirty = True
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "format_version": ROLLUP_FORMAT_VERSION,
+            "updated_at": now().isoformat(timespec="seconds"),
+            **self.totals.to_dict(),
+        }
+
+    def save(self) -> None:
+        """
+        Add the changes since the last save to the totals on disk and write them back
+        atomically. Only when there is no summary on disk (e.g. after a rebuild) are this
+        process's totals written as they are. Call with the history lock held.
+        """
+        if self.path is None or not self._dirty:
+            return
+        on_disk = self._load()
+        if on_disk is not None:
+            on_disk.merge(self._pending)
+            self.totals = on_disk
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as fp:
+            json.dump(self.to_dict(), fp, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self._pending = RollupTable()
+        self._dirty = False
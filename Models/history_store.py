@@ -0,0 +1,669 @@
+"""
+Storage backends for PredictionHistoryManager.
+
+History is published for the front end as date-partitioned JSON files:
+``prediction_history/<season>/<YYYY-MM>.json`` hold that month's records and
+``prediction_history/manifest.json`` lists every partition with its record
+count and date range. Stores track which partitions their changes touched, and
+``commit`` rewrites only those files plus the manifest, each through an atomic
+temp-file swap. Partitions are written straight from record attributes and
+read back one object at a time (see ``history_codec``), so no full list of row
+dicts is built on either path. Readers can load just the partitions
+overlapping a date window with ``HistoryPartitions.read_rows``.
+
+Both stores hold PredictionRecord objects keyed by (season, game_date,
+home_team, away_team) and expose the same small interface: get / get_many / put /
+take_before, pending, date-window and team queries, and ``commit`` to persist.
+
+- ``JsonHistoryStore`` keeps the whole history in memory.
+- ``SqliteHistoryStore`` keeps history in a SQLite database indexed on
+  (season, game_date), the completed flag and team. Queries only read the rows
+  they need, and changes are staged in memory and written in one transaction
+  on commit before the touched partitions are re-exported. A missing or
+  out-of-date database is rebuilt from the partition files on open. Every
+  manifest write bumps a ``generation`` counter, and the database remembers
+  the hash of the manifest it last matched, so a fresh checkout of unchanged
+  files does not trigger a re-import. Each history directory gets its own
+  database (see ``history_db_path``).
+
+A legacy single-file ``prediction_history.json`` next to the directory is split
+into partitions the first time a store opens and the file is then removed.
+
+Several processes may write the same history, for example result grading
+running next to prediction generation. Writers hold ``HistoryPartitions.lock``
+(an advisory flock on ``<root>.lock``) while committing. ``commit`` re-reads what is
+on disk and replaces only the records this store touched, so records changed
+by another process since this one loaded are kept. When both sides changed
+the same record, the store's ``reconcile(theirs, mine)`` callable decides the
+result. The default keeps this store's copy.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from bisect import bisect_left, bisect_right, insort
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from config import PREDICTION_HISTORY_DB, PREDICTION_HISTORY_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-writer only
+    fcntl = None
+from history_codec import iter_objects, write_records
+
+RecordKey = Tuple[str, str, str, str]
+# (season, "YYYY-MM")
+Partition = Tuple[str, str]
+
+JSON_BACKEND = "json"
+SQLITE_BACKEND = "sqlite"
+HISTORY_FORMAT_VERSION = 1
+
+
+def _sort_key(record) -> Tuple[str, str, RecordKey]:
+    return (record.game_date, record.game_tipoff_et or "", record.key())
+
+
+def partition_of(record) -> Partition:
+    return (record.season, record.game_date[:7])
+
+
+def partition_of_key(key: RecordKey) -> Partition:
+    return (key[0], key[1][:7])
+
+
+def _keep_mine(theirs, mine):
+    return mine
+
+
+class HistoryLock:
+    """
+    Re-entrant advisory lock shared by every process writing one history.
+
+    Args:
+        path: Lock file (created if missing; its contents are never used)
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fp = None
+        self._depth = 0
+
+    def __enter__(self) -> "HistoryLock":
+        if self._depth == 0:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fp = self.path.open("a")
+            if fcntl is not None:
+                fcntl.flock(self._fp.fileno(), fcntl.LOCK_EX)
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._fp.fileno(), fcntl.LOCK_UN)
+            self._fp.close()
+            self._fp = None
+
+
+def _write_json_atomic(path: Path, payload: object, indent: Optional[int] = 2) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as fp:
+        json.dump(payload, fp, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+
+def _write_records_atomic(path: Path, records: List[object]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as fp:
+        write_records(fp, records, type(records[0]).JSON_FIELDS)
+    os.replace(tmp_path, path)
+
+
+def _iter_json_list(path: Path) -> Iterator[Dict[str, object]]:
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return
+    try:
+        yield from iter_objects(text)
+    except ValueError:
+        print(f"Skipping unreadable history file {path}")
+
+
+class HistoryPartitions:
+    """Partition files and manifest under one history directory."""
+
+    def __init__(self, root: Path = PREDICTION_HISTORY_DIR):
+        self.root = Path(root)
+        self.manifest_path = self.root / "manifest.json"
+        self.lock = HistoryLock(self.root.with_name(f"{self.root.name}.lock"))
+
+    def path(self, partition: Partition) -> Path:
+        season, month = partition
+        return self.root / season / f"{month}.json"
+
+    def read_manifest(self) -> Dict[Partition, Dict[str, object]]:
+        try:
+            with self.manifest_path.open("r", encoding="utf-8") as fp:
+                payload = json.load(fp)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return {(entry["season"], entry["month"]): entry for entry in payload.get("partitions", [])}
+
+    def read_generation(self) -> int:
+        try:
+            with self.manifest_path.open("r", encoding="utf-8") as fp:
+                return int(json.load(fp).get("generation", 0))
+        except (OSError, ValueError, TypeError, AttributeError):
+            return 0
+
+    def signature(self) -> str:
+        """
+        Hash of the manifest. It changes on every write (the generation counter is bumped)
+        but not when the same files are checked out or copied elsewhere.
+        """
+        try:
+            content = self.manifest_path.read_bytes()
+        except OSError:
+            return "missing"
+        return hashlib.sha256(content).hexdigest()
+
+    def read_partition(self, partition: Partition) -> Iterator[Dict[str, object]]:
+        """Stream the rows currently stored in one partition file."""
+        return _iter_json_list(self.path(partition))
+
+    def iter_rows(
+        self,
+        start_iso: Optional[str] = None,
+        end_iso: Optional[str] = None,
+        season: Optional[str] = None,
+    ) -> Iterator[Dict[str, object]]:
+        """Stream rows dated start_iso..end_iso (inclusive, open-ended when None) from overlapping partitions."""
+        for partition, entry in sorted(self.read_manifest().items(), key=lambda item: (item[0][1], item[0][0])):
+            if season is not None and partition[0] != season:
+                continue
+            if start_iso is not None and entry["last_date"] < start_iso:
+                continue
+            if end_iso is not None and entry["first_date"] > end_iso:
+                continue
+            for row in _iter_json_list(self.path(partition)):
+                if (start_iso is None or row["game_date"] >= start_iso) and (end_iso is None or row["game_date"] <= end_iso):
+                    yield row
+
+    def read_rows(
+        self,
+        start_iso: Optional[str] = None,
+        end_iso: Optional[str] = None,
+        season: Optional[str] = None,
+    ) -> List[Dict[str, object]]:
+        """Row dicts in the window, in (game_date, tipoff) order."""
+        rows = list(self.iter_rows(start_iso, end_iso, season))
+        rows.sort(key=lambda row: (row["game_date"], row.get("game_tipoff_et") or ""))
+        return rows
+
+    def write(self, changed: Dict[Partition, List[object]]) -> None:
+        """Rewrite the given partitions from their (sorted) records, deleting empty ones, then the manifest."""
+        if not changed:
+            return
+        manifest = self.read_manifest()
+        generation = self.read_generation() + 1
+        for partition, records in changed.items():
+            path = self.path(partition)
+            if records:
+                _write_records_atomic(path, records)
+                manifest[partition] = {
+                    "season": partition[0],
+                    "month": partition[1],
+                    "path": path.relative_to(self.root).as_posix(),
+                    "records": len(records),
+                    "first_date": min(record.game_date for record in records),
+                    "last_date": max(record.game_date for record in records),
+                }
+            else:
+                path.unlink(missing_ok=True)
+                manifest.pop(partition, None)
+        entries = [manifest[partition] for partition in sorted(manifest, key=lambda p: (p[1], p[0]))]
+        _write_json_atomic(
+            self.manifest_path,
+            {"format_version": HISTORY_FORMAT_VERSION, "generation": generation, "partitions": entries},
+        )
+
+    def migrate_legacy(self, record_type: Callable) -> None:
+        """Split a single-file history (<root>.json) into partitions (once) and remove the old file."""
+        legacy_path = self.root.with_suffix(".json")
+        if self.manifest_path.exists() or not legacy_path.exists():
+            return
+        grouped: Dict[Partition, List[object]] = {}
+        for row in _iter_json_list(legacy_path):
+            record = record_type(**row)
+            grouped.setdefault(partition_of(record), []).append(record)
+        for records in grouped.values():
+            records.sort(key=_sort_key)
+        self.write(grouped)
+        if not self.manifest_path.exists():
+            _write_json_atomic(
+                self.manifest_path, {"format_version": HISTORY_FORMAT_VERSION, "generation": 0, "partitions": []}
+            )
+        legacy_path.unlink()
+        print(f"Split {legacy_path.name} into {len(grouped)} partition(s) under {self.root}")
+
+
+class SortedKeys:
+    """Record keys kept in (game_date, tipoff, key) order for bisect range lookups."""
+
+    def __init__(self):
+        self._entries: List[Tuple[str, str, RecordKey]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[RecordKey]:
+        return (entry[2] for entry in self._entries)
+
+    def add(self, entry: Tuple[str, str, RecordKey]) -> None:
+        insort(self._entries, entry)
+
+    def remove(self, entry: Tuple[str, str, RecordKey]) -> None:
+        i = bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+
+    def between(self, start_iso: Optional[str] = None, end_iso: Optional[str] = None) -> List[RecordKey]:
+        """Keys dated start_iso..end_iso inclusive (open-ended when None)."""
+        lo = 0 if start_iso is None else bisect_left(self._entries, (start_iso,))
+        hi = len(self._entries) if end_iso is None else bisect_right(self._entries, (end_iso, "\uffff"))
+        return [entry[2] for entry in self._entries[lo:hi]]
+
+    def before(self, cutoff_iso: str) -> List[RecordKey]:
+        """Keys dated strictly before cutoff_iso."""
+        return [entry[2] for entry in self._entries[:bisect_left(self._entries, (cutoff_iso,))]]
+
+
+class JsonHistoryStore:
+    """
+    Whole history in memory, persisted as partition files.
+
+    Secondary indexes are kept up to date on every put / take_before: a sorted
+    date index, a sorted index per team and a per-season set of pending keys.
+    Date-window and team queries are bisect lookups, pending() touches only
+    pending records, and records() walks the date index without sorting.
+    """
+
+    def __init__(self, root: Path, record_type: Callable, reconcile: Callable = _keep_mine):
+        self.partitions = HistoryPartitions(root)
+        with self.partitions.lock:
+            self.partitions.migrate_legacy(record_type)
+        self.record_type = record_type
+        self.reconcile = reconcile
+        self._records: Dict[RecordKey, object] = {}
+        self._dirty: Set[Partition] = set()
+        # key -> record written here, or None when taken out, since the last commit
+        self._touched: Dict[RecordKey, Optional[object]] = {}
+        self._entries: Dict[RecordKey, Tuple[str, str, RecordKey]] = {}
+        self._by_date = SortedKeys()
+        self._by_team: Dict[str, SortedKeys] = {}
+        self._pending: Dict[str, Dict[RecordKey, None]] = {}
+        for row in self.partitions.iter_rows():
+            self._index(record_type(**row))
+
+    def _index(self, record) -> None:
+        key = record.key()
+        entry = (record.game_date, record.game_tipoff_et or "", key)
+        previous = self._entries.get(key)
+        if previous != entry:
+            if previous is not None:
+                self._unlink(previous)
+            self._entries[key] = entry
+            self._by_date.add(entry)
+            for team in (key[2], key[3]):
+                self._by_team.setdefault(team, SortedKeys()).add(entry)
+        self._records[key] = record
+        pending = self._pending.setdefault(record.season, {})
+        if record.completed:
+            pending.pop(key, None)
+        else:
+            pending[key] = None
+
+    def _unlink(self, entry: Tuple[str, str, RecordKey]) -> None:
+        key = entry[2]
+        self._by_date.remove(entry)
+        for team in (key[2], key[3]):
+            self._by_team[team].remove(entry)
+
+    def get(self, key: RecordKey):
+        return self._records.get(key)
+
+    def get_many(self, keys: Iterable[RecordKey]) -> Dict[RecordKey, object]:
+        records = self._records
+        return {key: records[key] for key in keys if key in records}
+
+    def put(self, record) -> None:
+        self._index(record)
+        self._dirty.add(partition_of(record))
+        self._touched[record.key()] = record
+
+    def take_before(self, cutoff_iso: str, predicate: Callable[[object], bool]) -> List[object]:
+        """Remove and return the records dated before cutoff_iso that satisfy 'predicate'."""
+        taken = [self._records[key] for key in self._by_date.before(cutoff_iso) if predicate(self._records[key])]
+        for record in taken:
+            key = record.key()
+            self._unlink(self._entries.pop(key))
+            del self._records[key]
+            self._pending.get(record.season, {}).pop(key, None)
+            self._dirty.add(partition_of(record))
+            self._touched[key] = None
+        return taken
+
+    def records(self) -> List[object]:
+        return [self._records[key] for key in self._by_date]
+
+    def pending(self, season: str) -> List[object]:
+        return [self._records[key] for key in self._pending.get(season, {})]
+
+    def between(self, season: str, start_iso: str, end_iso: str) -> List[object]:
+        return [self._records[key] for key in self._by_date.between(start_iso, end_iso) if key[0] == season]
+
+    def for_team(self, season: str, team: str) -> List[object]:
+        keys = self._by_team.get(team) or ()
+        return [self._records[key] for key in keys if key[0] == season]
+
+    def _drop(self, key: RecordKey) -> None:
+        self._unlink(self._entries.pop(key))
+        record = self._records.pop(key)
+        self._pending.get(record.season, {}).pop(key, None)
+
+    def commit(self) -> None:
+        """
+        Merge the records touched since the last commit into the partitions on disk and
+        rewrite only those partitions. Call with the history lock held.
+        """
+        touched_by_partition: Dict[Partition, Dict[RecordKey, Optional[object]]] = {}
+        for key, record in self._touched.items():
+            touched_by_partition.setdefault(partition_of_key(key), {})[key] = record
+
+        changed = {}
+        for partition in self._dirty:
+            merged = {}
+            for row in self.partitions.read_partition(partition):
+                record = self.record_type(**row)
+                merged[record.key()] = record
+            for key, mine in touched_by_partition.get(partition, {}).items():
+                theirs = merged.pop(key, None)
+                if mine is not None:
+                    merged[key] = self.reconcile(theirs, mine) if theirs is not None else mine
+
+            # Bring memory in line with the merged partition (other writers' changes included)
+            season, month = partition
+            for key in [key for key in self._by_date.between(f"{month}-01", f"{month}-31") if key[0] == season]:
+                if key not in merged:
+                    self._drop(key)
+            for record in merged.values():
+                self._index(record)
+            changed[partition] = sorted(merged.values(), key=_sort_key)
+        self.partitions.write(changed)
+        self._dirty.clear()
+        self._touched.clear()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    season TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    home_team TEXT NOT NULL,
+    away_team TEXT NOT NULL,
+    tipoff TEXT NOT NULL DEFAULT '',
+    completed INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (season, game_date, home_team, away_team)
+);
+CREATE INDEX IF NOT EXISTS predictions_pending ON predictions (season, completed, game_date);
+CREATE INDEX IF NOT EXISTS predictions_home_team ON predictions (season, home_team, game_date);
+CREATE INDEX IF NOT EXISTS predictions_away_team ON predictions (season, away_team, game_date);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_UPSERT = """
+INSERT INTO predictions (season, game_date, home_team, away_team, tipoff, completed, payload)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (season, game_date, home_team, away_team) DO UPDATE SET
+    tipoff = excluded.tipoff,
+    completed = excluded.completed,
+    payload = excluded.payload
+"""
+
+_ORDER = " ORDER BY game_date, tipoff, season, home_team, away_team"
+
+
+def _row_values(record) -> Tuple[object, ...]:
+    return (
+        record.season,
+        record.game_date,
+        record.home_team,
+        record.away_team,
+        record.game_tipoff_et or "",
+        int(bool(record.completed)),
+        json.dumps(record.to_dict(), ensure_ascii=False, separators=(",", ":")),
+    )
+
+
+class SqliteHistoryStore:
+    """
+    Indexed SQLite history with staged, transactional writes.
+
+    Args:
+        db_path: SQLite database file
+        root: Partitioned JSON export directory, also used to seed or refresh the database
+        record_type: Class used to rebuild records from stored rows
+        reconcile: (theirs, mine) -> record, for staged records that another process also changed
+    """
+
+    def __init__(self, db_path: Path, root: Path, record_type: Callable, reconcile: Callable = _keep_mine):
+        self.db_path = Path(db_path)
+        self.partitions = HistoryPartitions(root)
+        self.record_type = record_type
+        self.reconcile = reconcile
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.executescript(_SCHEMA)
+        self._staged: Dict[RecordKey, object] = {}
+        self._deleted: Set[RecordKey] = set()
+        with self.partitions.lock:
+            self.partitions.migrate_legacy(record_type)
+            self._sync_from_partitions()
+
+    def _sync_from_partitions(self) -> None:
+        """Rebuild the table from the partition files when they changed outside this store."""
+        signature = self.partitions.signature()
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'export_signature'").fetchone()
+        if row is not None and row[0] == signature:
+            return
+        records = [self.record_type(**row) for row in self.partitions.iter_rows()]
+        with self._conn:
+            self._conn.execute("DELETE FROM predictions")
+            self._conn.executemany(_UPSERT, [_row_values(record) for record in records])
+            self._set_meta("export_signature", signature)
+        if records:
+            print(f"Imported {len(records)} prediction records into {self.db_path.name}")
+
+    def _set_meta(self, name: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT INTO meta (name, value) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+            (name, value),
+        )
+
+    def _decode(self, payload: str):
+        return self.record_type(**json.loads(payload))
+
+    def _select(self, where: str, params: Iterable[object], matches: Callable[[object], bool]) -> List[object]:
+        """Stored rows matching 'where' overlaid with staged changes matching 'matches'."""
+        rows = self._conn.execute(
+            f"SELECT season, game_date, home_team, away_team, payload FROM predictions WHERE {where}{_ORDER}",
+            tuple(params),
+        )
+        results = [
+            self._decode(payload)
+            for *key, payload in rows
+            if tuple(key) not in self._staged and tuple(key) not in self._deleted
+        ]
+        results.extend(record for record in self._staged.values() if matches(record))
+        results.sort(key=_sort_key)
+        return results
+
+    def get(self, key: RecordKey):
+        if key in self._staged:
+            return self._staged[key]
+        if key in self._deleted:
+            return None
+        row = self._conn.execute(
+            "SELECT payload FROM predictions WHERE season = ? AND game_date = ? AND home_team = ? AND away_team = ?",
+            key,
+        ).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def _fetch_many(self, keys: Iterable[RecordKey]) -> Dict[RecordKey, object]:
+        """Stored (committed) records for 'keys', read with one query per season."""
+        found: Dict[RecordKey, object] = {}
+        wanted: Dict[str, Set[RecordKey]] = {}
+        for key in keys:
+            wanted.setdefault(key[0], set()).add(key)
+        for season, season_keys in wanted.items():
+            dates = sorted({key[1] for key in season_keys})
+            rows = self._conn.execute(
+                "SELECT season, game_date, home_team, away_team, payload FROM predictions "
+                f"WHERE season = ? AND game_date IN ({', '.join('?' * len(dates))})",
+                (season, *dates),
+            )
+            for *key, payload in rows:
+                if tuple(key) in season_keys:
+                    found[tuple(key)] = self._decode(payload)
+        return found
+
+    def get_many(self, keys: Iterable[RecordKey]) -> Dict[RecordKey, object]:
+        """Existing records for 'keys', read with one query per season."""
+        found: Dict[RecordKey, object] = {}
+        stored_keys = []
+        for key in keys:
+            if key in self._staged:
+                found[key] = self._staged[key]
+            elif key not in self._deleted:
+                stored_keys.append(key)
+        found.update(self._fetch_many(stored_keys))
+        return found
+
+    def put(self, record) -> None:
+        key = record.key()
+        self._staged[key] = record
+        self._deleted.discard(key)
+
+    def take_before(self, cutoff_iso: str, predicate: Callable[[object], bool]) -> List[object]:
+        """Remove and return the records dated before cutoff_iso that satisfy 'predicate'."""
+        taken = [r for r in self._select("game_date < ?", (cutoff_iso,), lambda r: r.game_date < cutoff_iso) if predicate(r)]
+        for record in taken:
+            key = record.key()
+            self._staged.pop(key, None)
+            self._deleted.add(key)
+        return taken
+
+    def records(self) -> List[object]:
+        return self._select("1 = 1", (), lambda record: True)
+
+    def pending(self, season: str) -> List[object]:
+        return self._select(
+            "season = ? AND completed = 0",
+            (season,),
+            lambda r: r.season == season and not r.completed,
+        )
+
+    def between(self, season: str, start_iso: str, end_iso: str) -> List[object]:
+        return self._select(
+            "season = ? AND game_date BETWEEN ? AND ?",
+            (season, start_iso, end_iso),
+            lambda r: r.season == season and start_iso <= r.game_date <= end_iso,
+        )
+
+    def for_team(self, season: str, team: str) -> List[object]:
+        return self._select(
+            "season = ? AND (home_team = ? OR away_team = ?)",
+            (season, team, team),
+            lambda r: r.season == season and team in (r.home_team, r.away_team),
+        )
+
+    def commit(self) -> None:
+        """
+        Write staged changes in one transaction, then re-export the touched partitions.
+        Call with the history lock held. Changes another process has published since are
+        picked up first, and staged records it also changed go through 'reconcile'.
+        """
+        self._sync_from_partitions()
+        stored = self._fetch_many(self._staged)
+        staged = [
+            self.reconcile(stored[key], record) if key in stored else record for key, record in self._staged.items()
+        ]
+        touched = {partition_of_key(key) for key in self._deleted}
+        touched.update(partition_of(record) for record in staged)
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM predictions WHERE season = ? AND game_date = ? AND home_team = ? AND away_team = ?",
+                list(self._deleted),
+            )
+            self._conn.executemany(_UPSERT, [_row_values(record) for record in staged])
+        self._staged.clear()
+        self._deleted.clear()
+        self.export_partitions(touched)
+
+    def export_partitions(self, partitions: Optional[Iterable[Partition]] = None) -> None:
+        """Rewrite the given partitions from the database (all stored ones when None)."""
+        if partitions is None:
+            partitions = {
+                (season, game_date[:7])
+                for season, game_date in self._conn.execute("SELECT DISTINCT season, game_date FROM predictions")
+            }
+        changed = {}
+        for season, month in partitions:
+            changed[(season, month)] = [
+                self._decode(payload)
+                for (payload,) in self._conn.execute(
+                    f"SELECT payload FROM predictions WHERE season = ? AND game_date BETWEEN ? AND ?{_ORDER}",
+                    (season, f"{month}-01", f"{month}-31"),
+                )
+            ]
+        if not changed:
+            return
+        self.partitions.write(changed)
+        with self._conn:
+            self._set_meta("export_signature", self.partitions.signature())
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def history_db_path(root: Path) -> Path:
+    """SQLite database for a history directory: PREDICTION_HISTORY_DB for the default one, <root>.sqlite3 otherwise."""
+    root = Path(root)
+    if root.resolve() == PREDICTION_HISTORY_DIR.resolve():
+        return PREDICTION_HISTORY_DB
+    return root.with_name(f"{root.name}.sqlite3")
+
+
+def open_history_store(
+    backend: str,
+    record_type: Callable,
+    root: Path = PREDICTION_HISTORY_DIR,
+    db_path: Optional[Path] = None,
+    reconcile: Callable = _keep_mine,
+):
+    if backend == JSON_BACKEND:
+        return JsonHistoryStore(root, record_type, reconcile)
+    if backend == SQLITE_BACKEND:
+        return SqliteHistoryStore(db_path or history_db_path(root), root, record_type, reconcile)
+    raise ValueError(f"Unknown prediction history backend '{backend}'")
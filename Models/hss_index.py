@@ -0,0 +1,183 @@
+"""
+In-memory HoopSight Strength (HSS) index.
+
+The stat folders under ``Current_Data`` and ``Cleaned_Data`` hold one small CSV per
+team and metric. Instead of walking those folders on every ``load_hss`` call, the
+index reads every file once into a team x year x metric table and keeps the
+per-(team, year) sums needed to answer HSS lookups in constant time. The index
+re-reads the folders whenever a source file is added, removed or modified.
+"""
+
+import csv
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import CURRENT_DATA_ROOT, HISTORICAL_DATA_ROOT
+
+# How often (seconds) the index re-stats its source files to detect changes.
+STALENESS_CHECK_INTERVAL = 5.0
+
+# team -> year -> metric -> values
+MetricTable = Dict[str, Dict[int, Dict[str, List[float]]]]
+Signature = Tuple[int, int]
+
+
+def _scan_stat_files(root: Path) -> List[Tuple[str, str, Path]]:
+    """Return (metric, team, path) for every team CSV inside the metric folders of ``root``."""
+    entries: List[Tuple[str, str, Path]] = []
+    if not root.exists() or not root.is_dir():
+        return entries
+    for folder in sorted(root.iterdir()):
+        if not folder.is_dir():
+            continue
+        for team_file in sorted(folder.glob("*.csv")):
+            entries.append((folder.name, team_file.stem, team_file))
+    return entries
+
+
+def _signature(files: List[Tuple[str, str, Path]]) -> Signature:
+    """Cheap fingerprint of a set of files: (file count, newest mtime in ns)."""
+    newest = 0
+    for _, _, path in files:
+        try:
+            newest = max(newest, os.stat(path).st_mtime_ns)
+        except OSError:
+            continue
+    return len(files), newest
+
+
+class _StatSource:
+    """Parsed contents of one data root (current or historical)."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.table: MetricTable = {}
+        self.year_totals: Dict[Tuple[str, int], Tuple[float, int]] = {}
+        self.team_totals: Dict[str, Tuple[float, int]] = {}
+        self.signature: Signature = (0, 0)
+
+    def load(self, files: List[Tuple[str, str, Path]]) -> None:
+        table: MetricTable = {}
+        year_totals: Dict[Tuple[str, int], Tuple[float, int]] = {}
+        team_totals: Dict[str, Tuple[float, int]] = {}
+
+        for metric, team, path in files:
+            with path.open("r", encoding="utf-8-sig") as handle:
+                reader = csv.reader(handle)
+                next(reader, None)  # Skip header
+                for row in reader:
+                    # Stat files are formatted as Rank,Statistic,Year,Win Percentage
+                    if len(row) <= 2:
+                        continue
+                    try:
+                        stat_year = int(row[2].strip())
+                        stat_value = float(row[1].strip())
+                    except (ValueError, IndexError):
+                        continue
+
+                    table.setdefault(team, {}).setdefault(stat_year, {}).setdefault(metric, []).append(stat_value)
+
+                    total, count = year_totals.get((team, stat_year), (0.0, 0))
+                    year_totals[(team, stat_year)] = (total + stat_value, count + 1)
+                    total, count = team_totals.get(team, (0.0, 0))
+                    team_totals[team] = (total + stat_value, count + 1)
+
+        self.table = table
+        self.year_totals = year_totals
+        self.team_totals = team_totals
+        self.signature = _signature(files)
+
+
+class HSSIndex:
+    """
+    Team x year x metric table built from the current and historical stat folders.
+
+    Lookups follow the same fallback order as the original file scan:
+    1. Current data for the exact year.
+    2. Current data for any year.
+    3. Historical data for the exact year.
+    """
+
+    def __init__(
+        self,
+        historical_root: Path = HISTORICAL_DATA_ROOT,
+        current_root: Path = CURRENT_DATA_ROOT,
+        check_interval: float = STALENESS_CHECK_INTERVAL,
+    ):
+        self.current = _StatSource(Path(current_root))
+        self.historical = _StatSource(Path(historical_root))
+        self.check_interval = check_interval
+        self._last_check = 0.0
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Re-read every stat file under both roots."""
+        for source in (self.current, self.historical):
+            source.load(_scan_stat_files(source.root))
+        self._last_check = time.monotonic()
+
+    def refresh_if_stale(self, force: bool = False) -> bool:
+        """
+        Rebuild the index if any source file changed since it was loaded.
+
+        File metadata is only re-read every ``check_interval`` seconds unless ``force`` is set.
+        Returns True when a rebuild happened.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+
+        stale = False
+        for source in (self.current, self.historical):
+            if _signature(_scan_stat_files(source.root)) != source.signature:
+                stale = True
+                break
+        if stale:
+            self.rebuild()
+        return stale
+
+    def lookup(self, team: str, year: int, historical_only: bool = False) -> Optional[float]:
+        """
+        Return the HSS for ``team`` in ``year`` or None when no stats exist.
+        ``historical_only`` skips the current-data steps (used to replay past seasons).
+        """
+        self.refresh_if_stale()
+
+        total_count = None
+        if not historical_only:
+            total_count = self.current.year_totals.get((team, year))
+            if total_count is None:
+                total_count = self.current.team_totals.get(team)
+        if total_count is None:
+            total_count = self.historical.year_totals.get((team, year))
+        if total_count is None or total_count[1] == 0:
+            return None
+
+        total, count = total_count
+        return total / count
+
+    def metrics(self, team: str, year: int, historical: bool = False) -> Dict[str, List[float]]:
+        """Return the raw metric values stored for a team and year."""
+        self.refresh_if_stale()
+        source = self.historical if historical else self.current
+        return source.table.get(team, {}).get(year, {})
+
+
+# Global instances keyed by (historical_root, current_root)
+_indexes: Dict[Tuple[str, str], HSSIndex] = {}
+
+
+def get_hss_index(
+    historical_root: Path = HISTORICAL_DATA_ROOT,
+    current_root: Path = CURRENT_DATA_ROOT,
+) -> HSSIndex:
+    """Get or create the process-wide HSSIndex for the given data roots."""
+    key = (str(Path(historical_root).resolve()), str(Path(current_root).resolve()))
+    index = _indexes.get(key)
+    if index is None:
+        index = HSSIndex(historical_root, current_root)
+        _indexes[key] = index
+    return index
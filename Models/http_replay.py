@@ -0,0 +1,563 @@
+"""
+Offline record/replay of every HTTP call the HoopSight pipeline makes.
+
+All outbound traffic goes through either ``requests`` (ESPN scoreboard and
+gamecast pages, cdn.nba.com, nba_api, teamrankings.com) or ``aiohttp`` (the ESPN
+injuries page, nba-stories articles and the Groq API). ``install`` patches both
+clients:
+
+- ``record``: requests go to the real servers and every response is written to
+  the fixture store;
+- ``replay``: requests are rewritten to a local ``StandInServer`` that serves
+  the stored responses, with optional latency and error injection. Requests
+  with no fixture get a 404, so nothing ever reaches the network.
+
+Fixtures are keyed by method, URL (query parameters sorted) and request body
+(JSON bodies canonicalized) and stored as one JSON file per request under
+``HTTP_FIXTURE_DIR/<host>/<key>.json``. Latency and error injection are seeded
+per request key, so a replayed run sees the same failures every time.
+
+``--today`` pins the run date through ``HOOPSIGHT_TODAY`` (see ``config.today``)
+so a replay requests the same dates that were recorded. Replayed pipeline runs
+also get an empty scoreboard cache (``HOOPSIGHT_CACHE_DIR``) and skip the
+scripts' rate-limit sleeps.
+
+The pipeline scripts write into the project itself (Current_Data, injuries.csv,
+Front/CSVFiles exports, the prediction history, archive and rollups, and
+Models/artifacts). ``pipeline`` therefore copies the project into a sandbox
+directory and runs every step there, leaving the working tree untouched.
+``--sandbox DIR`` keeps the copy for inspection, and ``--in-place`` runs against
+the working tree as the workflow does.
+
+Usage:
+    # Capture a day's traffic, then replay it offline with a pinned date
+    python http_replay.py pipeline --mode record --today 2025-10-23
+    python http_replay.py pipeline --mode replay --today 2025-10-23 --latency 0.05 --error-rate 0.02
+    python http_replay.py pipeline --mode replay --today 2025-10-23 --sandbox /tmp/hoopsight-replay
+
+    # One script under replay, or a stand-alone stand-in server
+    python http_replay.py exec --mode replay --today 2025-10-23 -- RandomForest.py --quiet
+    python http_replay.py serve --port 8765 --latency 0.1
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import BASE_DIR, HTTP_FIXTURE_DIR, PROJECT_ROOT
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = (RECORD, REPLAY)
+
+# Response headers that describe the original transfer, not the stored body
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+# Steps of the daily GitHub Actions workflows as (working directory, script)
+DAILY_PIPELINE: Tuple[Tuple[Path, Path], ...] = (
+    (PROJECT_ROOT, PROJECT_ROOT / ".github" / "current_data_script.py"),
+    (PROJECT_ROOT / "Data_Gathering_&_Cleaning", PROJECT_ROOT / "Data_Gathering_&_Cleaning" / "FetchInjuryAndExternalNews.py"),
+    (BASE_DIR, BASE_DIR / "update_prediction_results.py"),
+    (BASE_DIR, BASE_DIR / "RandomForest.py"),
+)
+
+# Never copied into a pipeline sandbox
+_SANDBOX_IGNORED = (".git", "__pycache__", "node_modules", "*.lock")
+
+_real_sleep = time.sleep
+
+
+def canonical_url(url: str) -> str:
+    """URL with its query parameters sorted and the fragment dropped."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+def _canonical_body(body: Optional[bytes]) -> bytes:
+    if not body:
+        return b""
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        return body
+
+
+def fixture_key(method: str, url: str, body: Optional[bytes] = None) -> str:
+    digest = hashlib.sha256()
+    digest.update(method.upper().encode("ascii"))
+    digest.update(b"\n")
+    digest.update(canonical_url(url).encode("utf-8"))
+    digest.update(b"\n")
+    digest.update(_canonical_body(body))
+    return digest.hexdigest()[:32]
+
+
+@dataclass
+class Fixture:
+    """One recorded response."""
+    method: str
+    url: str
+    status: int
+    reason: str
+    headers: Dict[str, str]
+    body: bytes
+
+    def to_json(self) -> Dict[str, object]:
+        payload: Dict[str, object] = {
+            "method": self.method,
+            "url": canonical_url(self.url),
+            "status": self.status,
+            "reason": self.reason,
+            "headers": self.headers,
+        }
+        try:
+            payload["body"] = self.body.decode("utf-8")
+        except UnicodeDecodeError:
+            payload["body_b64"] = base64.b64encode(self.body).decode("ascii")
+        return payload
+
+    @classmethod
+    def from_json(cls, payload: Dict[str, object]) -> "Fixture":
+        if "body_b64" in payload:
+            body = base64.b64decode(payload["body_b64"])
+        else:
+            body = str(payload.get("body", "")).encode("utf-8")
+        return cls(
+            method=str(payload["method"]),
+            url=str(payload["url"]),
+            status=int(payload["status"]),
+            reason=str(payload.get("reason", "")),
+            headers=dict(payload.get("headers", {})),
+            body=body,
+        )
+
+
+class FixtureStore:
+    """Recorded responses on disk, one JSON file per request key."""
+
+    def __init__(self, root: Path = HTTP_FIXTURE_DIR):
+        self.root = Path(root)
+
+    def _path(self, url: str, key: str) -> Path:
+        host = urlsplit(url).netloc.lower().replace(":", "_") or "unknown"
+        return self.root / host / f"{key}.json"
+
+    def load(self, method: str, url: str, body: Optional[bytes] = None) -> Optional[Fixture]:
+        path = self._path(url, fixture_key(method, url, body))
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                return Fixture.from_json(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, fixture: Fixture, request_body: Optional[bytes] = None) -> Path:
+        path = self._path(fixture.url, fixture_key(fixture.method, fixture.url, request_body))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(fixture.to_json(), f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+        return path
+
+
+def standin_url_for(standin_url: str, url: str) -> str:
+    """URL on the stand-in server that serves the fixture for 'url'."""
+    parts = urlsplit(url)
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{standin_url.rstrip('/')}/{parts.scheme}/{parts.netloc}{parts.path or '/'}{query}"
+
+
+def original_url(path: str) -> str:
+    """Inverse of ``standin_url_for`` for the request path the stand-in server receives."""
+    scheme, _, rest = path.lstrip("/").partition("/")
+    return f"{scheme}://{rest}"
+
+
+def _stored_headers(headers) -> Dict[str, str]:
+    return {name: value for name, value in headers.items() if name.lower() not in _SKIPPED_HEADERS}
+
+
+class StandInServer:
+    """
+    Local HTTP server that answers ``/<scheme>/<host>/<path>?<query>`` with the
+    fixture recorded for ``<scheme>://<host>/<path>?<query>``.
+
+    Args:
+        store: Fixture store to serve from
+        latency: Seconds added before every response
+        jitter: Extra uniformly distributed latency, in seconds
+        error_rate: Share of requests answered with 'error_status' instead of the fixture
+        error_status: HTTP status used for injected errors
+        seed: Seed for latency jitter and error injection
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._attempts: Dict[str, int] = {}
+        self.served = 0
+        self.missing = 0
+        self.injected_errors = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rewrite(self, url: str) -> str:
+        return standin_url_for(self.url, url)
+
+    def _plan(self, key: str) -> Tuple[float, bool]:
+        """(delay, inject_error) for the next request with this key; same sequence every run."""
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+        rng = random.Random(f"{self.seed}:{key}:{attempt}")
+        delay = self.latency + (rng.uniform(0.0, self.jitter) if self.jitter else 0.0)
+        return delay, rng.random() < self.error_rate
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                url = original_url(self.path)
+                delay, inject_error = server._plan(fixture_key(self.command, url, body))
+                if delay > 0:
+                    _real_sleep(delay)
+
+                fixture = None if inject_error else server.store.load(self.command, url, body)
+                with server._lock:
+                    if inject_error:
+                        server.injected_errors += 1
+                    elif fixture is None:
+                        server.missing += 1
+                    else:
+                        server.served += 1
+
+                if inject_error:
+                    self._respond(server.error_status, {"Content-Type": "text/plain"}, b"injected error")
+                elif fixture is None:
+                    self._respond(404, {"Content-Type": "text/plain"}, f"no fixture for {self.command} {url}".encode())
+                else:
+                    self._respond(fixture.status, fixture.headers, fixture.body)
+
+            def _respond(self, status: int, headers: Dict[str, str], body: bytes) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    if name.lower() not in _SKIPPED_HEADERS:
+                        self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _serve
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="http-stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self) -> Dict[str, int]:
+        return {"served": self.served, "missing": self.missing, "injected_errors": self.injected_errors}
+
+
+def _install_requests(mode: str, store: FixtureStore, standin_url: Optional[str]) -> None:
+    import requests
+
+    original_send = requests.Session.send
+    if getattr(original_send, "_hoopsight_replay", False):
+        return
+
+    def send(session, request, **kwargs):
+        if mode == REPLAY:
+            original = request.url
+            request = request.copy()
+            request.url = standin_url_for(standin_url, original)
+            response = original_send(session, request, **kwargs)
+            response.url = original
+            return response
+
+        response = original_send(session, request, **kwargs)
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        store.save(
+            Fixture(request.method, request.url, response.status_code, response.reason or "",
+                    _stored_headers(response.headers), response.content),
+            body,
+        )
+        return response
+
+    send._hoopsight_replay = True
+    requests.Session.send = send
+
+
+def _install_aiohttp(mode: str, store: FixtureStore, standin_url: Optional[str]) -> None:
+    try:
+        import aiohttp
+    except ImportError:
+        return
+
+    original_request = aiohttp.ClientSession._request
+    if getattr(original_request, "_hoopsight_replay", False):
+        return
+
+    async def _request(session, method, str_or_url, **kwargs):
+        if mode == REPLAY:
+            return await original_request(session, method, standin_url_for(standin_url, str(str_or_url)), **kwargs)
+
+        response = await original_request(session, method, str_or_url, **kwargs)
+        body = await response.read()
+        if kwargs.get("json") is not None:
+            request_body = json.dumps(kwargs["json"]).encode("utf-8")
+        elif isinstance(kwargs.get("data"), (bytes, str)):
+            request_body = kwargs["data"].encode("utf-8") if isinstance(kwargs["data"], str) else kwargs["data"]
+        else:
+            request_body = None
+        store.save(
+            Fixture(method.upper(), str(response.request_info.url), response.status, response.reason or "",
+                    _stored_headers(response.headers), body),
+            request_body,
+        )
+        return response
+
+    _request._hoopsight_replay = True
+    aiohttp.ClientSession._request = _request
+
+
+def install(mode: str, store: Optional[FixtureStore] = None, standin_url: Optional[str] = None) -> None:
+    """Patch requests and aiohttp for 'record' or 'replay' (replay needs a stand-in URL)."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown HTTP mode '{mode}', expected one of {MODES}")
+    if mode == REPLAY and not standin_url:
+        raise ValueError("Replay mode needs a stand-in server URL")
+    store = store or FixtureStore()
+    _install_requests(mode, store, standin_url)
+    _install_aiohttp(mode, store, standin_url)
+
+
+def run_script(script: Path, args: Sequence[str] = ()) -> int:
+    """Run a pipeline script in this process as if it were __main__."""
+    script = Path(script).resolve()
+    sys.argv = [str(script), *args]
+    sys.path.insert(0, str(script.parent))
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+    except SystemExit as exc:
+        return exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+    return 0
+
+
+def _parse_day(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--fixtures", type=Path, default=HTTP_FIXTURE_DIR, help="Fixture store directory.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every replayed response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency per response, in seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of replayed requests that fail.")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of injected failures.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for jitter and error injection.")
+
+
+def _server_from_args(args, port: int = 0) -> StandInServer:
+    return StandInServer(
+        FixtureStore(args.fixtures),
+        port=port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+
+
+def _exec(args) -> int:
+    if args.today:
+        os.environ["HOOPSIGHT_TODAY"] = args.today.isoformat()
+    if args.mode == REPLAY and not args.keep_sleeps:
+        time.sleep = lambda seconds: None  # Rate-limit pauses only matter against real servers
+
+    server = None
+    standin_url = args.standin
+    if args.mode == REPLAY and not standin_url:
+        server = _server_from_args(args).start()
+        standin_url = server.url
+    install(args.mode, FixtureStore(args.fixtures), standin_url)
+
+    script_args = list(args.script_args)
+    if script_args and script_args[0] == "--":
+        script_args = script_args[1:]
+    try:
+        return run_script(args.script, script_args)
+    finally:
+        if server is not None:
+            print(f"[http_replay] {server.stats()}")
+            server.stop()
+
+
+def copy_project(destination: Path, fixtures: Path) -> Path:
+    """Copy the project (without VCS data, caches or the fixture store) to 'destination'."""
+    fixtures = Path(fixtures).resolve()
+    ignore_names = shutil.ignore_patterns(*_SANDBOX_IGNORED)
+
+    def ignore(directory: str, names: List[str]) -> set:
+        ignored = set(ignore_names(directory, names))
+        ignored.update(name for name in names if (Path(directory) / name).resolve() == fixtures)
+        return ignored
+
+    shutil.copytree(PROJECT_ROOT, destination, ignore=ignore, symlinks=True)
+    return Path(destination)
+
+
+def _pipeline(args) -> int:
+    root = PROJECT_ROOT
+    sandbox_dir = None
+    if not args.in_place:
+        if args.sandbox is not None:
+            if args.sandbox.exists():
+                print(f"[http_replay] sandbox {args.sandbox} already exists; pick a new directory")
+                return 2
+            root = copy_project(args.sandbox, args.fixtures)
+        else:
+            sandbox_dir = tempfile.TemporaryDirectory(prefix="hoopsight-pipeline-")
+            root = copy_project(Path(sandbox_dir.name) / PROJECT_ROOT.name, args.fixtures)
+        print(f"[http_replay] running the pipeline in {root}")
+
+    server = None
+    if args.mode == REPLAY:
+        server = _server_from_args(args).start()
+
+    env = dict(os.environ)
+    cache_dir = None
+    if args.mode == REPLAY:
+        # A fresh cache so every replayed run starts from the same state
+        cache_dir = tempfile.TemporaryDirectory(prefix="hoopsight-replay-cache-")
+        env["HOOPSIGHT_CACHE_DIR"] = cache_dir.name
+
+    # The sandbox's own copy, so every import resolves to the sandboxed config paths
+    replay_script = root / Path(__file__).resolve().relative_to(PROJECT_ROOT)
+    timings: List[Tuple[str, float, int]] = []
+    try:
+        for cwd, script in DAILY_PIPELINE:
+            cwd = root / cwd.relative_to(PROJECT_ROOT)
+            script = root / script.relative_to(PROJECT_ROOT)
+            command = [sys.executable, str(replay_script), "exec", "--mode", args.mode,
+                       "--fixtures", str(args.fixtures.resolve())]
+            if args.today:
+                command += ["--today", args.today.isoformat()]
+            if server is not None:
+                command += ["--standin", server.url]
+            if args.keep_sleeps:
+                command.append("--keep-sleeps")
+            command.append(str(script))
+
+            started = time.perf_counter()
+            returncode = subprocess.call(command, cwd=cwd, env=env)
+            timings.append((script.name, time.perf_counter() - started, returncode))
+    finally:
+        if server is not None:
+            server.stop()
+        if cache_dir is not None:
+            cache_dir.cleanup()
+        if sandbox_dir is not None:
+            sandbox_dir.cleanup()
+
+    for name, seconds, returncode in timings:
+        print(f"[http_replay] {name}: {seconds:.2f}s (exit {returncode})")
+    if server is not None:
+        print(f"[http_replay] stand-in: {server.stats()}")
+    return max((returncode for _, _, returncode in timings), default=0)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Record and replay the pipeline's HTTP traffic.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run a stand-in server for the fixture store.")
+    _add_server_arguments(serve)
+    serve.add_argument("--port", type=int, default=8765)
+
+    for name, help_text in (("exec", "Run one script under record or replay."),
+                            ("pipeline", "Run every step of the daily pipeline under record or replay.")):
+        command = commands.add_parser(name, help=help_text)
+        _add_server_arguments(command)
+        command.add_argument("--mode", choices=MODES, default=REPLAY)
+        command.add_argument("--today", type=_parse_day, help="Pin today's date (YYYY-MM-DD).")
+        command.add_argument("--keep-sleeps", action="store_true",
+                             help="Keep the scripts' rate-limit sleeps when replaying.")
+        if name == "exec":
+            command.add_argument("--standin", help="URL of a running stand-in server (replay only).")
+            command.add_argument("script", type=Path)
+            command.add_argument("script_args", nargs=argparse.REMAINDER)
+        else:
+            placement = command.add_mutually_exclusive_group()
+            placement.add_argument("--sandbox", type=Path,
+                                   help="Copy the project here and keep it after the run (default: a temporary copy).")
+            placement.add_argument("--in-place", action="store_true",
+                                   help="Run against the working tree, overwriting its data and exports.")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        server = _server_from_args(args, port=args.port)
+        print(f"Serving {args.fixtures} at {server.url}")
+        try:
+            server._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.command == "exec":
+        return _exec(args)
+    return _pipeline(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,17 +3,75 @@ Injury adjustment utilities for HoopSight AI predictions.
 
 This module loads injuries and player scores to compute team strength adjustments
 based on which players are unavailable for upcoming games.
+
+The injury list is compiled once per team into ``CompiledInjury`` entries. Each
+entry holds its penalty, with the player-score lookup and status rules already
+applied, and its return date. Batch callers get a dense team x date penalty
+table (``InjuryPenaltyTable``) for the whole prediction horizon, so per-game
+penalties are array lookups. The compiled data is dropped whenever
+injuries.csv or the player score file changes on disk.
 """
 
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 from config import PROJECT_ROOT
 from team_mappings import TEAM_NAME_LOOKUP
 
+# Share of a player's score that is removed from the team HSS while they are out
+INJURY_PENALTY_SCALE = 0.05
+PENALIZED_STATUSES = ("Out", "Day-To-Day")
+
+
+@dataclass
+class CompiledInjury:
+    """One penalized injury row of a team, ready to be summed."""
+    player: str
+    status: str
+    penalty: float
+    # Raw "Feb 7"-style return date; None when the row has none
+    return_text: Optional[str]
+
+    def applies_on(self, game_date: date) -> bool:
+        """False once the player is expected back before 'game_date'."""
+        if self.return_text is None:
+            return True
+        return_date = _parse_return_date(self.return_text, game_date.year)
+        return return_date is None or return_date >= game_date
+
+
+@lru_cache(maxsize=None)
+def _parse_return_date(text: str, year: int) -> Optional[date]:
+    """'Feb 7' in 'year' (or the next year if it does not exist in 'year'); None if unparseable."""
+    for candidate_year in (year, year + 1):
+        try:
+            return datetime.strptime(f"{text} {candidate_year}", "%b %d %Y").date()
+        except ValueError:
+            continue
+    return None
+
+
+@dataclass
+class InjuryPenaltyTable:
+    """Dense penalties[team, date] for a set of (normalized) teams and ISO dates."""
+    team_index: Dict[str, int]
+    date_index: Dict[str, int]
+    values: np.ndarray
+
+    def covers(self, teams: Sequence[str], dates: Sequence[str]) -> bool:
+        return all(team in self.team_index for team in teams) and all(iso in self.date_index for iso in dates)
+
+    def lookup(self, teams: Sequence[str], dates: Sequence[str]) -> np.ndarray:
+        rows = np.fromiter((self.team_index[team] for team in teams), dtype=np.intp, count=len(teams))
+        columns = np.fromiter((self.date_index[iso] for iso in dates), dtype=np.intp, count=len(dates))
+        return self.values[rows, columns]
+
 
 class InjuryAdjuster:
     """Manages injury-based HSS adjustments for teams."""
@@ -42,6 +100,35 @@ class InjuryAdjuster:
         # Build lookup structures
         self.team_player_scores: Dict[str, Dict[str, float]] = {}
         self._build_player_score_lookup()
+        self._source_signature = self._signature()
+        self._compiled: Dict[str, List[CompiledInjury]] = {}
+        self._normalized: Dict[str, str] = {}
+        self._table: Optional[InjuryPenaltyTable] = None
+
+    def _signature(self) -> Tuple[Tuple[int, int], ...]:
+        signature = []
+        for path in (self.injuries_csv, self.player_scores_csv):
+            try:
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((0, -1))
+        return tuple(signature)
+
+    def refresh(self) -> bool:
+        """Reload and drop compiled penalties if either source file changed on disk. Returns True if it did."""
+        signature = self._signature()
+        if signature == self._source_signature:
+            return False
+        print("Injury inputs changed on disk; reloading")
+        self._load_data()
+        self.team_player_scores = {}
+        self._build_player_score_lookup()
+        self._source_signature = signature
+        self._compiled = {}
+        self._normalized = {}
+        self._table = None
+        return True
 
     def _load_data(self) -> None:
         """Load injuries and player scores from CSV files."""
@@ -107,6 +194,67 @@ class InjuryAdjuster:
         # Return as-is if we can't normalize
         return team_name
 
+    def _normalized_team(self, team_name: str) -> str:
+        normalized = self._normalized.get(team_name)
+        if normalized is None:
+            normalized = self._normalized[team_name] = self._normalize_team_name(team_name)
+        return normalized
+
+    def _player_score(self, normalized_team: str, player: str) -> float:
+        for team_key, players in self.team_player_scores.items():
+            if normalized_team in team_key or team_key in normalized_team:
+                if player in players:
+                    return players[player]
+        return 0.0
+
+    def compiled_injuries(self, team_name: str) -> List[CompiledInjury]:
+        """
+        The team's penalized injuries in file order, compiled on first use.
+
+        Rows are matched on the exact team name first, then on a case-insensitive
+        search of the team column (injuries.csv uses full names).
+        """
+        return self._compile(self._normalized_team(team_name))
+
+    def _compile(self, normalized_team: str) -> List[CompiledInjury]:
+        compiled = self._compiled.get(normalized_team)
+        if compiled is not None:
+            return compiled
+
+        compiled = []
+        if self.injuries_df is not None and not self.injuries_df.empty:
+            team_column = self.injuries_df["team"]
+            team_injuries = self.injuries_df[team_column.str.strip() == normalized_team]
+            if team_injuries.empty:
+                team_injuries = self.injuries_df[team_column.str.contains(normalized_team, case=False, na=False)]
+
+            has_return_column = "estimated_return_date" in team_injuries.columns
+            for player, status, return_value in zip(
+                team_injuries["player"],
+                team_injuries["status"],
+                team_injuries["estimated_return_date"] if has_return_column else [""] * len(team_injuries),
+            ):
+                status = str(status).strip()
+                # Only penalize for "Out" and "Day-To-Day" statuses
+                if status not in PENALIZED_STATUSES:
+                    continue
+                player = str(player).strip()
+                player_score = self._player_score(normalized_team, player)
+
+                # If player score is 0, they might not be a significant contributor
+                # But we still count them with a small penalty for "Out" status
+                if player_score == 0.0 and status == "Out":
+                    player_score = 5.0  # Small baseline penalty for missing player
+                elif status == "Day-To-Day":
+                    # Day-to-Day players get 50% penalty (they might play)
+                    player_score *= 0.5
+
+                return_text = str(return_value).strip() if pd.notna(return_value) and return_value else None
+                compiled.append(CompiledInjury(player, status, player_score, return_text))
+
+        self._compiled[normalized_team] = compiled
+        return compiled
+
     def get_injury_penalty(self, team_name: str, game_date: Optional[str] = None) -> float:
         """
         Calculate the HSS penalty for a team based on current injuries.
@@ -121,83 +269,51 @@ class InjuryAdjuster:
         Returns:
             Total HSS penalty (sum of injured player scores)
         """
-        if self.injuries_df is None or self.injuries_df.empty:
-            return 0.0
-
-        # Normalize team name
-        normalized_team = self._normalize_team_name(team_name)
-
-        # Filter injuries for this team
-        team_injuries = self.injuries_df[
-            self.injuries_df["team"].str.strip() == normalized_team
-        ].copy()
-
-        if team_injuries.empty:
-            # Try matching against full team names in injuries.csv
-            team_injuries = self.injuries_df[
-                self.injuries_df["team"].str.contains(normalized_team, case=False, na=False)
-            ].copy()
-
-        if team_injuries.empty:
-            return 0.0
+        self.refresh()
+        if game_date and self._table is not None and self._table.covers((self._normalized_team(team_name),), (game_date,)):
+            return float(self._table.lookup((self._normalized_team(team_name),), (game_date,))[0])
 
+        game_day = datetime.strptime(game_date, "%Y-%m-%d").date() if game_date else None
         total_penalty = 0.0
-
-        for _, injury_row in team_injuries.iterrows():
-            player = str(injury_row["player"]).strip()
-            status = str(injury_row["status"]).strip()
-            
-            # Only penalize for "Out" and "Day-To-Day" statuses
-            if status not in ["Out", "Day-To-Day"]:
-                continue
-
-            # Check if injury is relevant for this game date
-            if game_date:
-                return_date_str = injury_row.get("estimated_return_date", "")
-                if pd.notna(return_date_str) and return_date_str:
-                    try:
-                        # Parse return date (format: "Jan 15", "Feb 20", etc.)
-                        # We'll assume current year or next year based on game_date
-                        game_dt = datetime.strptime(game_date, "%Y-%m-%d")
-                        
-                        # Try to parse the return date with year inference
-                        return_str = str(return_date_str).strip()
-                        try:
-                            # Try with current game year first
-                            return_dt = datetime.strptime(f"{return_str} {game_dt.year}", "%b %d %Y")
-                        except ValueError:
-                            # If that fails, try next year
-                            return_dt = datetime.strptime(f"{return_str} {game_dt.year + 1}", "%b %d %Y")
-                        
-                        # If player is expected back before the game, skip this injury
-                        if return_dt < game_dt:
-                            continue
-                    except (ValueError, TypeError):
-                        # If we can't parse the date, assume injury is still relevant
-                        pass
-
-            # Get player's score
-            player_score = 0.0
-            
-            # Try to find player score in our lookup
-            for team_key in self.team_player_scores:
-                if normalized_team in team_key or team_key in normalized_team:
-                    if player in self.team_player_scores[team_key]:
-                        player_score = self.team_player_scores[team_key][player]
-                        break
-            
-            # If player score is 0, they might not be a significant contributor
-            # But we still count them with a small penalty for "Out" status
-            if player_score == 0.0 and status == "Out":
-                player_score = 5.0  # Small baseline penalty for missing player
-            elif status == "Day-To-Day":
-                # Day-to-Day players get 50% penalty (they might play)
-                player_score *= 0.5
-
-            total_penalty += player_score
-
+        for injury in self.compiled_injuries(team_name):
+            if game_day is None or injury.applies_on(game_day):
+                total_penalty += injury.penalty
         return total_penalty
 
+    def penalty_table(self, team_names: Sequence[str], game_dates: Sequence[str]) -> InjuryPenaltyTable:
+        """
+        Dense penalty table over every given team and ISO date (e.g. a whole prediction
+        horizon). Reused until the source files change or a lookup falls outside it.
+        """
+        self.refresh()
+        teams = sorted({self._normalized_team(team) for team in team_names})
+        dates = sorted(set(game_dates))
+        if self._table is not None and self._table.covers(teams, dates):
+            return self._table
+        if self._table is not None:
+            # Grow the table so earlier teams / dates stay covered
+            teams = sorted(set(teams) | set(self._table.team_index))
+            dates = sorted(set(dates) | set(self._table.date_index))
+
+        days = [date.fromisoformat(iso) for iso in dates]
+        values = np.zeros((len(teams), len(dates)), dtype=float)
+        for row, team in enumerate(teams):
+            # Summed in file order, as get_injury_penalty does
+            for injury in self._compile(team):
+                active = np.fromiter((injury.applies_on(day) for day in days), dtype=bool, count=len(days))
+                values[row, active] += injury.penalty
+        self._table = InjuryPenaltyTable(
+            team_index={team: i for i, team in enumerate(teams)},
+            date_index={iso: i for i, iso in enumerate(dates)},
+            values=values,
+        )
+        return self._table
+
+    def penalties(self, team_names: Sequence[str], game_dates: Sequence[str]) -> np.ndarray:
+        """get_injury_penalty for each (team, ISO date) pair, as one table lookup."""
+        table = self.penalty_table(team_names, game_dates)
+        return table.lookup([self._normalized_team(team) for team in team_names], game_dates)
+
     def adjust_hss(
         self,
         team_name: str,
@@ -220,17 +336,33 @@ class InjuryAdjuster:
         if not apply_adjustment:
             return base_hss, 0.0
 
-        penalty = self.get_injury_penalty(team_name, game_date)
-        
+        if game_date:
+            penalty = float(self.penalties((team_name,), (game_date,))[0])
+        else:
+            penalty = self.get_injury_penalty(team_name)
+
         # Subtract penalty from HSS (injuries weaken the team)
         # We scale the penalty down since HSS values are typically 100-200
         # A major injury (100 player score) should reduce HSS by ~5-10%
-        scaled_penalty = penalty * 0.05  # 5% scaling factor
-        
+        scaled_penalty = penalty * INJURY_PENALTY_SCALE  # 5% scaling factor
+
         adjusted_hss = base_hss - scaled_penalty
-        
+
         return adjusted_hss, penalty
 
+    def adjust_hss_array(self, base_hss: np.ndarray, penalties: np.ndarray) -> np.ndarray:
+        """
+        Vectorized counterpart of adjust_hss for a batch of games.
+
+        Args:
+            base_hss: Base HSS values without injury adjustment
+            penalties: Injury penalties (as returned by get_injury_penalty) for the same rows
+
+        Returns:
+            Array of adjusted HSS values
+        """
+        return np.asarray(base_hss, dtype=float) - np.asarray(penalties, dtype=float) * INJURY_PENALTY_SCALE
+
 
 # Global instance for easy access
 _global_adjuster: Optional[InjuryAdjuster] = None
@@ -0,0 +1,138 @@
+"""
+Lightweight stage timing and counters for the HoopSight pipeline.
+
+Code wraps a unit of work in ``stage("name")`` (or decorates it with
+``timed("name")``) and bumps counters with ``count("name")``. Every stage keeps
+the duration of each call, so the per-run report can give count, total, mean,
+p50, p95 and max per stage. ``write_report`` dumps everything as JSON.
+
+Quiet mode turns off per-game console output. Code that prints once per game or
+per lookup should go through ``log`` instead of ``print``.
+"""
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+class Instrumentation:
+    """Collects stage durations and counters for a single run."""
+
+    def __init__(self):
+        self.started_at = datetime.now().astimezone()
+        self._started = time.perf_counter()
+        self.durations: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.quiet = False
+
+    def reset(self) -> None:
+        quiet = self.quiet
+        self.__init__()
+        self.quiet = quiet
+
+    def record(self, name: str, seconds: float) -> None:
+        self.durations.setdefault(name, []).append(seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def stage_summary(self, name: str) -> Dict[str, float]:
+        samples = np.asarray(self.durations.get(name, []), dtype=float)
+        if samples.size == 0:
+            return {"count": 0, "total_s": 0.0}
+        p50, p95 = np.percentile(samples, [50, 95])
+        return {
+            "count": int(samples.size),
+            "total_s": round(float(samples.sum()), 6),
+            "mean_s": round(float(samples.mean()), 6),
+            "p50_s": round(float(p50), 6),
+            "p95_s": round(float(p95), 6),
+            "max_s": round(float(samples.max()), 6),
+        }
+
+    def report(self) -> Dict[str, object]:
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_s": round(time.perf_counter() - self._started, 6),
+            "command": " ".join(sys.argv),
+            "stages": {name: self.stage_summary(name) for name in sorted(self.durations)},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def write_report(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as fp:
+            json.dump(self.report(), fp, indent=2)
+        return path
+
+    def print_summary(self) -> None:
+        """Prints one line per stage, slowest total first."""
+        summaries = [(name, self.stage_summary(name)) for name in self.durations]
+        summaries.sort(key=lambda item: item[1]["total_s"], reverse=True)
+        for name, summary in summaries:
+            print(
+                f"[timing] {name}: {summary['count']} call(s), total {summary['total_s']:.3f}s, "
+                f"p50 {summary['p50_s'] * 1000:.2f}ms, p95 {summary['p95_s'] * 1000:.2f}ms"
+            )
+
+
+# Global instance
+_instrumentation: Optional[Instrumentation] = None
+
+
+def get_instrumentation() -> Instrumentation:
+    """Get or create the global Instrumentation instance."""
+    global _instrumentation
+    if _instrumentation is None:
+        _instrumentation = Instrumentation()
+    return _instrumentation
+
+
+def stage(name: str):
+    """Context manager timing a block as one call of stage 'name'."""
+    return get_instrumentation().stage(name)
+
+
+def timed(name: str) -> Callable:
+    """Decorator timing every call of the wrapped function as stage 'name'."""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_instrumentation().stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name: str, amount: int = 1) -> None:
+    get_instrumentation().count(name, amount)
+
+
+def set_quiet(quiet: bool = True) -> None:
+    get_instrumentation().quiet = quiet
+
+
+def is_quiet() -> bool:
+    return get_instrumentation().quiet
+
+
+def log(*args, **kwargs) -> None:
+    """print() for per-game / per-lookup output; suppressed in quiet mode."""
+    if not get_instrumentation().quiet:
+        print(*args, **kwargs)
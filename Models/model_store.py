@@ -0,0 +1,185 @@
+"""
+Persisted, content-addressed model artifacts for HoopSight AI.
+
+A trained model is saved under ``MODEL_ARTIFACT_DIR`` with an id derived from a
+hash of the training files, the hyperparameters, ``MODEL_VERSION`` and the
+installed scikit-learn version. When a later run computes the same key the model
+is loaded from disk instead of being refit.
+
+Next to the pickled forest every artifact carries its compiled step-function form
+(see ``compiled_forest``). Loading the compiled form needs only NumPy, so
+prediction-only runs never import scikit-learn or joblib.
+"""
+
+import hashlib
+import json
+import os
+from importlib import metadata
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict
+
+from compiled_forest import CompiledForest, compile_forest
+from config import MODEL_ARTIFACT_DIR, MODEL_VERSION
+
+# Number of artifacts kept on disk after a new one is written
+ARTIFACTS_TO_KEEP = 3
+
+
+@dataclass
+class ModelArtifact:
+    """A fitted model together with the id of the artifact it was loaded from or saved to."""
+    model: object
+    artifact_id: str
+    key: str
+    path: Path
+    trained: bool
+
+
+def _sklearn_version() -> str:
+    """Installed scikit-learn version, read from package metadata without importing it."""
+    try:
+        return metadata.version("scikit-learn")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def training_inputs_digest(cleaned_data_path: Path) -> str:
+    """SHA-256 over the relative path and bytes of every training CSV under ``cleaned_data_path``."""
+    root = Path(cleaned_data_path)
+    digest = hashlib.sha256()
+    for team_file in sorted(root.glob("*/*.csv")):
+        digest.update(team_file.relative_to(root).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(team_file.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def artifact_key(
+    cleaned_data_path: Path,
+    hyperparameters: Dict[str, object],
+    model_version: str = MODEL_VERSION,
+) -> str:
+    """Content address of a model: training inputs + hyperparameters + model and library versions."""
+    payload = {
+        "training_inputs": training_inputs_digest(cleaned_data_path),
+        "hyperparameters": hyperparameters,
+        "model_version": model_version,
+        "sklearn_version": _sklearn_version(),
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _artifact_id(key: str, model_version: str) -> str:
+    return f"{model_version}-{key[:16]}"
+
+
+def _write_atomic(path: Path, writer: Callable[[Path], None]) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    writer(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def save_artifact(
+    model: object,
+    key: str,
+    hyperparameters: Dict[str, object],
+    model_version: str = MODEL_VERSION,
+    artifact_dir: Path = MODEL_ARTIFACT_DIR,
+) -> Path:
+    """
+    Write the model, its compiled form and a JSON manifest describing them.
+    Returns the model file path.
+    """
+    import joblib
+
+    artifact_dir = Path(artifact_dir)
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    artifact_id = _artifact_id(key, model_version)
+    model_path = artifact_dir / f"{artifact_id}.joblib"
+    compiled_path = artifact_dir / f"{artifact_id}.npz"
+    manifest_path = artifact_dir / f"{artifact_id}.json"
+    compiled = compile_forest(model)
+
+    manifest = {
+        "artifact_id": artifact_id,
+        "key": key,
+        "model_version": model_version,
+        "hyperparameters": hyperparameters,
+        "sklearn_version": _sklearn_version(),
+        "compiled_intervals": len(compiled),
+        "created_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+    }
+
+    _write_atomic(model_path, lambda tmp: joblib.dump(model, tmp, compress=3))
+    _write_atomic(compiled_path, compiled.save)
+    _write_atomic(manifest_path, lambda tmp: tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8"))
+    return model_path
+
+
+def prune_artifacts(artifact_dir: Path = MODEL_ARTIFACT_DIR, keep: int = ARTIFACTS_TO_KEEP) -> None:
+    """Delete all but the ``keep`` most recently written artifacts."""
+    artifact_dir = Path(artifact_dir)
+    if not artifact_dir.exists():
+        return
+    model_files = sorted(artifact_dir.glob("*.joblib"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for stale in model_files[keep:]:
+        for path in artifact_dir.glob(f"{stale.stem}.*"):
+            path.unlink(missing_ok=True)
+
+
+def load_or_train_model(
+    cleaned_data_path: Path,
+    train: Callable[[], object],
+    hyperparameters: Dict[str, object],
+    model_version: str = MODEL_VERSION,
+    artifact_dir: Path = MODEL_ARTIFACT_DIR,
+    force_retrain: bool = False,
+    compiled: bool = True,
+) -> ModelArtifact:
+    """
+    Return the model for the current training inputs, loading it from disk when an
+    artifact with a matching key exists and calling ``train`` (then saving) otherwise.
+
+    With ``compiled`` set the returned model is the CompiledForest, which predicts
+    exactly like the fitted forest; otherwise it is the fitted forest itself.
+    """
+    key = artifact_key(cleaned_data_path, hyperparameters, model_version)
+    artifact_id = _artifact_id(key, model_version)
+    model_path = Path(artifact_dir) / f"{artifact_id}.joblib"
+    compiled_path = model_path.with_suffix(".npz")
+
+    if not force_retrain:
+        if compiled and compiled_path.exists():
+            try:
+                model = CompiledForest.load(compiled_path)
+            except Exception as exc:  # pylint: disable=broad-except
+                print(f"Unable to load compiled model {compiled_path}: {exc}")
+            else:
+                print(f"Loaded compiled model artifact {artifact_id}")
+                return ModelArtifact(model, artifact_id, key, model_path, trained=False)
+
+        if model_path.exists():
+            import joblib
+
+            try:
+                model = joblib.load(model_path)
+            except Exception as exc:  # pylint: disable=broad-except
+                print(f"Unable to load model artifact {model_path}: {exc}")
+            else:
+                print(f"Loaded model artifact {artifact_id}")
+                if compiled:
+                    model = compile_forest(model)
+                    _write_atomic(compiled_path, model.save)
+                return ModelArtifact(model, artifact_id, key, model_path, trained=False)
+
+    model = train()
+    model_path = save_artifact(model, key, hyperparameters, model_version, artifact_dir)
+    prune_artifacts(artifact_dir)
+    print(f"Trained and saved model artifact {artifact_id}")
+    if compiled:
+        model = CompiledForest.load(compiled_path)
+    return ModelArtifact(model, artifact_id, key, model_path, trained=True)
@@ -0,0 +1,296 @@
+"""
+Playoff and play-in probability engine for HoopSight AI.
+
+Consumes simulated seasons from SeasonSimulator and, for a whole chunk of
+seasons at once:
+1. Ranks each conference by final wins, breaking ties on head-to-head record
+   among the tied teams and then by a random draw.
+2. Plays the 7-10 play-in (7 v 8 for the 7 seed, 9 v 10, then the 7/8 loser
+   v the 9/10 winner for the 8 seed) with single-game probabilities.
+3. Plays the bracket (1v8, 4v5, 2v7, 3v6, conference finals, finals) with
+   best-of-seven series probabilities in a 2-2-1-1-1 home-court format.
+
+Every step works on (simulations x teams) arrays; the only Python loops are
+over conferences and rounds.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from season_simulator import DEFAULT_SIMULATIONS, SeasonSimulator, chunk_plan
+
+# Home (True) / away (False) from the higher seed's side for games 1-7 of a series
+SERIES_HOME_PATTERN = (True, True, False, False, True, False, True)
+PLAYOFF_SEEDS = 8
+PLAY_IN_SEEDS = (7, 8, 9, 10)
+# Smaller than the season default: each chunk holds a (sims x teams x teams) head-to-head array
+PLAYOFF_CHUNK_SIZE = 2_000
+
+
+def series_win_probability(home_game_prob: np.ndarray, away_game_prob: np.ndarray) -> np.ndarray:
+    """
+    Probability that the team with home court wins a best-of-seven.
+
+    Args:
+        home_game_prob: P(team wins a game at home), any shape
+        away_game_prob: P(team wins a game on the road), same shape
+    """
+    # state[w][l]: probability of being at w wins and l losses with the series undecided
+    state = {(0, 0): np.ones_like(home_game_prob)}
+    won = np.zeros_like(home_game_prob)
+    for game_home in SERIES_HOME_PATTERN:
+        p = home_game_prob if game_home else away_game_prob
+        next_state: Dict[tuple, np.ndarray] = {}
+        for (wins, losses), prob in state.items():
+            for outcome_wins, outcome_losses, outcome_prob in ((wins + 1, losses, p), (wins, losses + 1, 1 - p)):
+                mass = prob * outcome_prob
+                if outcome_wins == 4:
+                    won = won + mass
+                elif outcome_losses < 4:
+                    key = (outcome_wins, outcome_losses)
+                    next_state[key] = next_state.get(key, 0) + mass
+        state = next_state
+    return won
+
+
+@dataclass
+class PlayoffOdds:
+    """Per-team postseason probabilities aggregated over all simulations."""
+    teams: List[str]
+    conferences: List[str]
+    n_simulations: int
+    seed_counts: np.ndarray  # teams x 15, conference seed before the play-in
+    play_in_counts: np.ndarray
+    playoff_counts: np.ndarray
+    second_round_counts: np.ndarray
+    conference_finals_counts: np.ndarray
+    finals_counts: np.ndarray
+    title_counts: np.ndarray
+
+    def _pct(self, counts: np.ndarray) -> np.ndarray:
+        return counts / max(self.n_simulations, 1) * 100.0
+
+    @property
+    def average_seed(self) -> np.ndarray:
+        seeds = np.arange(1, self.seed_counts.shape[1] + 1)
+        return (self.seed_counts @ seeds) / max(self.n_simulations, 1)
+
+    def to_rows(self) -> List[Dict[str, object]]:
+        rows = []
+        seed_pct = self._pct(self.seed_counts)
+        for idx, team in enumerate(self.teams):
+            row: Dict[str, object] = {
+                "Team": team,
+                "Conference": self.conferences[idx],
+                "Avg Seed": f"{self.average_seed[idx]:.2f}",
+                "Top 6 %": f"{seed_pct[idx, :6].sum():.2f}",
+                "Play-In %": f"{self._pct(self.play_in_counts)[idx]:.2f}",
+                "Playoffs %": f"{self._pct(self.playoff_counts)[idx]:.2f}",
+                "Conf Semis %": f"{self._pct(self.second_round_counts)[idx]:.2f}",
+                "Conf Finals %": f"{self._pct(self.conference_finals_counts)[idx]:.2f}",
+                "Finals %": f"{self._pct(self.finals_counts)[idx]:.2f}",
+                "Title %": f"{self._pct(self.title_counts)[idx]:.2f}",
+            }
+            for seed in range(seed_pct.shape[1]):
+                row[f"Seed {seed + 1} %"] = f"{seed_pct[idx, seed]:.2f}"
+            rows.append(row)
+        return rows
+
+
+class PlayoffSimulator:
+    """
+    Args:
+        teams: Team names in the same order as the SeasonSimulator
+        conferences: Team name -> conference label
+        home_win_prob: (teams x teams) matrix, P(row team beats column team at the row team's home)
+        base_head_to_head: Optional (teams x teams) wins already banked, row team over column team
+    """
+
+    def __init__(
+        self,
+        teams: Sequence[str],
+        conferences: Mapping[str, str],
+        home_win_prob: np.ndarray,
+        base_head_to_head: Optional[np.ndarray] = None,
+    ):
+        self.teams = list(teams)
+        n_teams = len(self.teams)
+        self.team_conferences = [conferences.get(team, "") for team in self.teams]
+        self.conference_names = sorted({conf for conf in self.team_conferences if conf})
+        self.conference_members = {
+            conf: np.array([i for i, c in enumerate(self.team_conferences) if c == conf], dtype=np.intp)
+            for conf in self.conference_names
+        }
+
+        game_prob = np.clip(np.asarray(home_win_prob, dtype=float), 0.0, 1.0)
+        self.game_prob = game_prob
+        # P(row team wins at the column team's home) = 1 - P(column team wins at home)
+        self.series_prob = series_win_probability(game_prob, 1.0 - game_prob.T)
+        self.base_head_to_head = (
+            np.zeros((n_teams, n_teams), dtype=np.int32)
+            if base_head_to_head is None
+            else np.asarray(base_head_to_head, dtype=np.int32)
+        )
+
+    @property
+    def n_teams(self) -> int:
+        return len(self.teams)
+
+    def _head_to_head(self, season: SeasonSimulator, home_won: np.ndarray) -> np.ndarray:
+        """(sims x teams x teams) wins of row team over column team, banked plus simulated."""
+        n_sims = home_won.shape[0]
+        n_teams = self.n_teams
+        winners = np.where(home_won, season.home_idx, season.away_idx)
+        losers = np.where(home_won, season.away_idx, season.home_idx)
+        codes = winners * n_teams + losers + (np.arange(n_sims)[:, None] * n_teams * n_teams)
+        counts = np.bincount(codes.ravel(), minlength=n_sims * n_teams * n_teams).astype(np.int32)
+        return counts.reshape(n_sims, n_teams, n_teams) + self.base_head_to_head
+
+    def _ranking_keys(self, wins: np.ndarray, head_to_head: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Sortable key per (sim, team): wins, then net head-to-head vs tied teams, then a coin flip."""
+        tied = wins[:, :, None] == wins[:, None, :]
+        net_vs_tied = ((head_to_head - head_to_head.transpose(0, 2, 1)) * tied).sum(axis=2)
+        span = 2 * int(np.abs(net_vs_tied).max(initial=0)) + 2
+        return (wins.astype(float) * span + net_vs_tied) * 2.0 + rng.random(wins.shape)
+
+    def _play_games(self, home: np.ndarray, away: np.ndarray, rng: np.random.Generator):
+        home_wins = rng.random(home.shape) < self.game_prob[home, away]
+        return np.where(home_wins, home, away), np.where(home_wins, away, home)
+
+    def _play_series(self, high: np.ndarray, low: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        high_wins = rng.random(high.shape) < self.series_prob[high, low]
+        return np.where(high_wins, high, low)
+
+    def simulate_chunk(self, season: SeasonSimulator, n_simulations: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """Simulate ``n_simulations`` seasons plus postseasons and return per-team counts."""
+        n_teams = self.n_teams
+        home_won, remaining_wins = season.simulate_chunk(n_simulations, rng)
+        wins = remaining_wins + season.base_wins
+        keys = self._ranking_keys(wins, self._head_to_head(season, home_won), rng)
+        sims = np.arange(n_simulations)[:, None]
+
+        max_seeds = max((len(members) for members in self.conference_members.values()), default=0)
+        counts = {
+            "seed": np.zeros((n_teams, max_seeds), dtype=np.int64),
+            "play_in": np.zeros(n_teams, dtype=np.int64),
+            "playoffs": np.zeros(n_teams, dtype=np.int64),
+            "second_round": np.zeros(n_teams, dtype=np.int64),
+            "conference_finals": np.zeros(n_teams, dtype=np.int64),
+            "finals": np.zeros(n_teams, dtype=np.int64),
+            "title": np.zeros(n_teams, dtype=np.int64),
+        }
+
+        def tally(name: str, teams: np.ndarray) -> None:
+            counts[name] += np.bincount(teams.ravel(), minlength=n_teams)
+
+        champions = []
+        for conf in self.conference_names:
+            members = self.conference_members[conf]
+            order = np.argsort(-keys[:, members], axis=1, kind="stable")
+            seeds = members[order]  # sims x conference size, seed 1 first
+            for seed in range(seeds.shape[1]):
+                counts["seed"][:, seed] += np.bincount(seeds[:, seed], minlength=n_teams)
+            if seeds.shape[1] < max(PLAY_IN_SEEDS):
+                continue
+
+            # Play-in: 7 v 8 for the 7 seed; 9 v 10, then loser(7v8) v winner(9v10) for the 8 seed
+            tally("play_in", seeds[:, 6:10])
+            seed7, loser78 = self._play_games(seeds[:, 6], seeds[:, 7], rng)
+            winner910, _ = self._play_games(seeds[:, 8], seeds[:, 9], rng)
+            seed8, _ = self._play_games(loser78, winner910, rng)
+
+            field = np.column_stack([seeds[:, :6], seed7, seed8])  # sims x 8, index = seed - 1
+            tally("playoffs", field)
+
+            # First round: 1v8, 4v5, 2v7, 3v6 (bracket order keeps 1/8 and 4/5 on the same side)
+            first_round = np.column_stack([
+                self._play_series(field[:, 0], field[:, 7], rng),
+                self._play_series(field[:, 3], field[:, 4], rng),
+                self._play_series(field[:, 1], field[:, 6], rng),
+                self._play_series(field[:, 2], field[:, 5], rng),
+            ])
+            tally("second_round", first_round)
+
+            second_round = np.column_stack([
+                self._bracket_series(first_round[:, 0], first_round[:, 1], keys, sims, rng),
+                self._bracket_series(first_round[:, 2], first_round[:, 3], keys, sims, rng),
+            ])
+            tally("conference_finals", second_round)
+
+            champion = self._bracket_series(second_round[:, 0], second_round[:, 1], keys, sims, rng)
+            tally("finals", champion)
+            champions.append(champion)
+
+        if len(champions) == 2:
+            tally("title", self._bracket_series(champions[0], champions[1], keys, sims, rng))
+        return counts
+
+    def _bracket_series(
+        self,
+        team_a: np.ndarray,
+        team_b: np.ndarray,
+        keys: np.ndarray,
+        sims: np.ndarray,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        """Series where home court goes to the team with the better regular season."""
+        a_home = keys[sims[:, 0], team_a] >= keys[sims[:, 0], team_b]
+        high = np.where(a_home, team_a, team_b)
+        low = np.where(a_home, team_b, team_a)
+        return self._play_series(high, low, rng)
+
+    def run(
+        self,
+        season: SeasonSimulator,
+        n_simulations: int = DEFAULT_SIMULATIONS,
+        chunk_size: int = PLAYOFF_CHUNK_SIZE,
+        workers: int = 1,
+        seed: Optional[int] = None,
+    ) -> PlayoffOdds:
+        plan = chunk_plan(n_simulations, chunk_size, seed)
+        totals: Optional[Dict[str, np.ndarray]] = None
+
+        if workers > 1 and len(plan) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_playoff_chunk_task, self, season, size, child) for size, child in plan]
+                results = [future.result() for future in futures]
+        else:
+            results = [_playoff_chunk_task(self, season, size, child) for size, child in plan]
+
+        for chunk_counts in results:
+            if totals is None:
+                totals = chunk_counts
+            else:
+                for name, values in chunk_counts.items():
+                    totals[name] += values
+
+        if totals is None:
+            zeros = np.zeros(self.n_teams, dtype=np.int64)
+            totals = {name: zeros.copy() for name in
+                      ("play_in", "playoffs", "second_round", "conference_finals", "finals", "title")}
+            totals["seed"] = np.zeros((self.n_teams, 0), dtype=np.int64)
+
+        return PlayoffOdds(
+            teams=self.teams,
+            conferences=self.team_conferences,
+            n_simulations=n_simulations,
+            seed_counts=totals["seed"],
+            play_in_counts=totals["play_in"],
+            playoff_counts=totals["playoffs"],
+            second_round_counts=totals["second_round"],
+            conference_finals_counts=totals["conference_finals"],
+            finals_counts=totals["finals"],
+            title_counts=totals["title"],
+        )
+
+
+def _playoff_chunk_task(
+    playoffs: PlayoffSimulator,
+    season: SeasonSimulator,
+    n_simulations: int,
+    seed: np.random.SeedSequence,
+) -> Dict[str, np.ndarray]:
+    return playoffs.simulate_chunk(season, n_simulations, np.random.default_rng(seed))
@@ -1,20 +1,144 @@
-import json
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from sys import intern, version_info
+from typing import ClassVar, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from config import MODEL_VERSION, PREDICTION_HISTORY_JSON
+from config import (
+    MODEL_VERSION,
+    PREDICTION_ARCHIVE_DIR,
+    PREDICTION_HISTORY_BACKEND,
+    PREDICTION_HISTORY_DIR,
+    PREDICTION_ROLLUPS_JSON,
+    now,
+)
+from history_archive import HistoryArchive
+from history_rollups import HistoryRollups
+from history_store import open_history_store
 from team_mappings import get_team_identity
 
 ISO_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+# Ungraded games stay in the hot history this many days past the prune cutoff so
+# update_prediction_results can still grade them
+PENDING_GRACE_DAYS = 7
 
 
 def _now_iso() -> str:
-    return datetime.now().astimezone().strftime(ISO_FORMAT)
+    return now().strftime(ISO_FORMAT)
 
 
-@dataclass
+# Field order of the published JSON
+JSON_FIELDS: Tuple[str, ...] = (
+    "season",
+    "game_date",
+    "display_date",
+    "game_tipoff_et",
+    "home_team",
+    "home_team_full",
+    "home_team_abbr",
+    "away_team",
+    "away_team_full",
+    "away_team_abbr",
+    "location",
+    "predicted_winner",
+    "predicted_winner_full",
+    "predicted_winner_abbr",
+    "predicted_win_pct",
+    "home_hss",
+    "away_hss",
+    "model_home_pct",
+    "model_away_pct",
+    "confidence_gap_pct",
+    "confidence_bucket",
+    "expected_margin",
+    "generated_at",
+    "model_version",
+    "model_artifact",
+    "actual_home_score",
+    "actual_away_score",
+    "actual_winner",
+    "completed",
+    "correct",
+    "actual_margin",
+    "margin_error",
+    "alignment_bucket",
+    "espn_game_id",
+    "espn_source_url",
+    "espn_home_pct",
+    "espn_away_pct",
+    "espn_favorite_full",
+    "espn_favorite_abbr",
+    "espn_confidence_gap",
+    "espn_model_delta_pct",
+    "espn_alignment",
+    "espn_last_checked",
+    "last_updated",
+    "snapshots",
+)
+
+# Fields versioned in PredictionRecord.snapshots, written by the prediction run and the ESPN fetch
+MODEL_SNAPSHOT_FIELDS: Tuple[str, ...] = (
+    "predicted_winner",
+    "predicted_win_pct",
+    "model_home_pct",
+    "model_away_pct",
+    "home_hss",
+    "away_hss",
+    "confidence_gap_pct",
+    "expected_margin",
+    "model_version",
+    "model_artifact",
+)
+ESPN_SNAPSHOT_FIELDS: Tuple[str, ...] = (
+    "espn_home_pct",
+    "espn_away_pct",
+    "espn_favorite_abbr",
+    "espn_confidence_gap",
+    "espn_model_delta_pct",
+)
+
+# Written when a game is graded (update_prediction_results), never by the prediction run
+RESULT_FIELDS: Tuple[str, ...] = (
+    "actual_home_score",
+    "actual_away_score",
+    "actual_winner",
+    "completed",
+    "correct",
+    "actual_margin",
+    "margin_error",
+    "alignment_bucket",
+)
+
+_INTERNED_FIELDS: Tuple[str, ...] = (
+    "season",
+    "game_date",
+    "display_date",
+    "game_tipoff_et",
+    "home_team",
+    "home_team_full",
+    "home_team_abbr",
+    "away_team",
+    "away_team_full",
+    "away_team_abbr",
+    "location",
+    "predicted_winner",
+    "predicted_winner_full",
+    "predicted_winner_abbr",
+    "confidence_bucket",
+    "model_version",
+    "model_artifact",
+    "actual_winner",
+    "alignment_bucket",
+    "espn_favorite_full",
+    "espn_favorite_abbr",
+    "espn_alignment",
+)
+
+# Records use __slots__ where dataclasses support it (Python 3.10+); 3.9 falls back to a __dict__
+_SLOTS = {"slots": True} if version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class PredictionRecord:
     season: str
     game_date: str  # ISO date (YYYY-MM-DD)
@@ -30,6 +154,7 @@ class PredictionRecord:
     model_home_pct: Optional[float] = None
     model_away_pct: Optional[float] = None
     model_version: str = MODEL_VERSION
+    model_artifact: Optional[str] = None
     game_tipoff_et: Optional[str] = None
     expected_margin: Optional[float] = None
     confidence_gap_pct: Optional[float] = None
@@ -59,88 +184,180 @@ class PredictionRecord:
     espn_alignment: Optional[str] = None
     espn_last_checked: Optional[str] = None
     last_updated: str = field(default_factory=_now_iso)
+    # Append-only [timestamp, {changed fields}] entries; each holds only what moved since the previous one
+    snapshots: List[List[object]] = field(default_factory=list)
+
+    JSON_FIELDS: ClassVar[Tuple[str, ...]] = JSON_FIELDS
 
     def key(self) -> Tuple[str, str, str, str]:
         return (self.season, self.game_date, self.home_team, self.away_team)
 
+    def __post_init__(self) -> None:
+        # Team names, abbreviations and bucket labels repeat across every record; share one copy
+        for name in _INTERNED_FIELDS:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, intern(value))
+
     def to_dict(self) -> Dict[str, object]:
-        return {
-            "season": self.season,
-            "game_date": self.game_date,
-            "display_date": self.display_date,
-            "game_tipoff_et": self.game_tipoff_et,
-            "home_team": self.home_team,
-            "home_team_full": self.home_team_full,
-            "home_team_abbr": self.home_team_abbr,
-            "away_team": self.away_team,
-            "away_team_full": self.away_team_full,
-            "away_team_abbr": self.away_team_abbr,
-            "location": self.location,
-            "predicted_winner": self.predicted_winner,
-            "predicted_winner_full": self.predicted_winner_full,
-            "predicted_winner_abbr": self.predicted_winner_abbr,
-            "predicted_win_pct": self.predicted_win_pct,
-            "home_hss": self.home_hss,
-            "away_hss": self.away_hss,
-            "model_home_pct": self.model_home_pct,
-            "model_away_pct": self.model_away_pct,
-            "confidence_gap_pct": self.confidence_gap_pct,
-            "confidence_bucket": self.confidence_bucket,
-            "expected_margin": self.expected_margin,
-            "generated_at": self.generated_at,
-            "model_version": self.model_version,
-            "actual_home_score": self.actual_home_score,
-            "actual_away_score": self.actual_away_score,
-            "actual_winner": self.actual_winner,
-            "completed": self.completed,
-            "correct": self.correct,
-            "actual_margin": self.actual_margin,
-            "margin_error": self.margin_error,
-            "alignment_bucket": self.alignment_bucket,
-            "espn_game_id": self.espn_game_id,
-            "espn_source_url": self.espn_source_url,
-            "espn_home_pct": self.espn_home_pct,
-            "espn_away_pct": self.espn_away_pct,
-            "espn_favorite_full": self.espn_favorite_full,
-            "espn_favorite_abbr": self.espn_favorite_abbr,
-            "espn_confidence_gap": self.espn_confidence_gap,
-            "espn_model_delta_pct": self.espn_model_delta_pct,
-            "espn_alignment": self.espn_alignment,
-            "espn_last_checked": self.espn_last_checked,
-            "last_updated": self.last_updated,
-        }
+        return {name: getattr(self, name) for name in JSON_FIELDS}
+
+    def snapshot_as_of(self, as_of: Optional[str] = None) -> Optional[Dict[str, object]]:
+        """
+        Versioned fields as they stood at 'as_of' (an ISO timestamp; a bare date means the
+        start of that day), or the latest values when None. None if no snapshot existed yet.
+        """
+        state: Optional[Dict[str, object]] = None
+        for timestamp, delta in self.snapshots:
+            if as_of is not None and timestamp > as_of:
+                break
+            state = {**state, **delta} if state is not None else dict(delta)
+        return state
 
-    def update_from_dict(self, payload: Dict[str, object]) -> None:
+    def line_movement(self, name: str) -> List[Tuple[str, object]]:
+        """(timestamp, value) for every snapshot that changed 'name', oldest first."""
+        return [(timestamp, delta[name]) for timestamp, delta in self.snapshots if name in delta]
+
+    def record_snapshot(self, timestamp: str, fields: Tuple[str, ...]) -> bool:
+        """Append the 'fields' that differ from the latest snapshot. Returns False when nothing moved."""
+        current = self.snapshot_as_of() or {}
+        delta = {}
+        for name in fields:
+            value = getattr(self, name)
+            if name not in current or current[name] != value:
+                delta[name] = value
+        if not delta:
+            return False
+        self.snapshots.append([timestamp, delta])
+        return True
+
+    def update_from_dict(self, payload: Dict[str, object], updated_at: Optional[str] = None) -> None:
         for key, value in payload.items():
             if hasattr(self, key):
+                if type(value) is str and key in _INTERNED_FIELDS:
+                    value = intern(value)
                 setattr(self, key, value)
-        self.last_updated = _now_iso()
+        self.last_updated = updated_at or _now_iso()
+
+
+@dataclass
+class PredictionBatch:
+    """Column-wise predictions for upsert_predictions_many; every column has one entry per game."""
+    display_date: Sequence[str]
+    iso_date: Sequence[str]
+    home_team: Sequence[str]
+    away_team: Sequence[str]
+    location: Sequence[str]
+    predicted_winner: Sequence[str]
+    predicted_win_pct: Sequence[float]
+    home_hss: Sequence[float]
+    away_hss: Sequence[float]
+    tipoff_et: Optional[Sequence[Optional[str]]] = None
+    model_home_pct: Optional[Sequence[Optional[float]]] = None
+    model_away_pct: Optional[Sequence[Optional[float]]] = None
+
+
+@dataclass
+class EspnBatch:
+    """Column-wise ESPN snapshots for update_espn_many."""
+    iso_date: Sequence[str]
+    home_team: Sequence[str]
+    away_team: Sequence[str]
+    game_id: Sequence[Optional[str]]
+    source_url: Sequence[Optional[str]]
+    home_pct: Sequence[Optional[float]]
+    away_pct: Sequence[Optional[float]]
+    favorite_full: Sequence[Optional[str]]
+    favorite_abbr: Sequence[Optional[str]]
+    confidence_gap: Sequence[Optional[float]]
+
+
+def _resolve_identities(teams: Iterable[str]) -> Tuple[Dict[str, Tuple[str, str]], Dict[str, KeyError]]:
+    """(full name, abbreviation) for each distinct team, plus the lookup error for unknown ones."""
+    identities: Dict[str, Tuple[str, str]] = {}
+    unknown: Dict[str, KeyError] = {}
+    for team in set(teams):
+        try:
+            identities[team] = get_team_identity(team)
+        except KeyError as exc:
+            unknown[team] = exc
+    return identities, unknown
+
+
+def _reconcile(theirs: PredictionRecord, mine: PredictionRecord) -> PredictionRecord:
+    """
+    Merge a record that another process saved while this one also changed it. A grade
+    recorded elsewhere is kept, snapshots from both sides are combined, and the rest is ours.
+    """
+    if theirs.completed and not mine.completed:
+        for name in RESULT_FIELDS:
+            setattr(mine, name, getattr(theirs, name))
+    extra = [entry for entry in theirs.snapshots if entry not in mine.snapshots]
+    if extra:
+        mine.snapshots = sorted(mine.snapshots + extra, key=lambda entry: entry[0])
+    return mine
 
 
 class PredictionHistoryManager:
-    def __init__(self, season: str, storage_path: Path = PREDICTION_HISTORY_JSON):
+    def __init__(
+        self,
+        season: str,
+        storage_path: Path = PREDICTION_HISTORY_DIR,
+        backend: str = PREDICTION_HISTORY_BACKEND,
+        archive_path: Path = PREDICTION_ARCHIVE_DIR,
+        rollups_path: Optional[Path] = PREDICTION_ROLLUPS_JSON,
+        db_path: Optional[Path] = None,
+    ):
+        """
+        'db_path' is the SQLite database used by the sqlite backend. It defaults to one
+        derived from 'storage_path', so managers over different directories never share it.
+        """
         self.season = season
         self.storage_path = storage_path
-        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        self._records: Dict[Tuple[str, str, str, str], PredictionRecord] = {}
-        self._load()
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        self._store = open_history_store(
+            backend, PredictionRecord, root=storage_path, db_path=db_path, reconcile=_reconcile
+        )
+        self._lock = self._store.partitions.lock
+        self.archive = HistoryArchive(archive_path)
+        self._to_archive: List[PredictionRecord] = []
+        self.rollups = HistoryRollups(rollups_path)
+        if not self.rollups.loaded:
+            self.rollups.rebuild(self._graded_records())
 
-    def _load(self) -> None:
-        if not self.storage_path.exists():
-            return
-        try:
-            with self.storage_path.open("r", encoding="utf-8") as fp:
-                payload = json.load(fp)
-        except json.JSONDecodeError:
-            return
-        for row in payload:
-            record = PredictionRecord(**row)
-            self._records[record.key()] = record
+    def _graded_records(self) -> List[PredictionRecord]:
+        """
+        Every graded record across the archive, records pruned since the last save and
+        the hot history (hot copy wins).
+        """
+        records = {}
+        for row in self.archive.read_rows():
+            if row.get("completed"):
+                record = PredictionRecord(**row)
+                records[record.key()] = record
+        for record in self._to_archive + list(self._store.records()):
+            if record.completed:
+                records[record.key()] = record
+        return list(records.values())
+
+    def completed_games(self) -> List[PredictionRecord]:
+        """This season's graded games, archived or not."""
+        return [record for record in self._graded_records() if record.season == self.season]
 
-    def prune_before_date(self, cutoff_iso: str) -> None:
-        keys_to_remove = [key for key, record in self._records.items() if record.game_date < cutoff_iso]
-        for key in keys_to_remove:
-            self._records.pop(key, None)
+    def prune_before_date(self, cutoff_iso: str) -> int:
+        """
+        Move records dated before cutoff_iso from the hot history to the archive on the next
+        save(): graded games right away, ungraded ones once PENDING_GRACE_DAYS have passed.
+        Returns the number of records moved.
+        """
+        pending_cutoff = (date.fromisoformat(cutoff_iso) - timedelta(days=PENDING_GRACE_DAYS)).isoformat()
+        moved = self._store.take_before(cutoff_iso, lambda r: r.completed or r.game_date < pending_cutoff)
+        self._to_archive.extend(moved)
+        return len(moved)
+
+    def archived_games(self, start_iso: Optional[str] = None, end_iso: Optional[str] = None) -> List[PredictionRecord]:
+        """This season's archived games dated start_iso..end_iso (inclusive, open-ended when None)."""
+        return [PredictionRecord(**row) for row in self.archive.read_rows(start_iso, end_iso, season=self.season)]
 
     def _confidence_bucket(self, gap_pct: float) -> str:
         if gap_pct >= 20:
@@ -164,73 +381,128 @@ class PredictionHistoryManager:
         tipoff_et: Optional[str] = None,
         model_home_pct: Optional[float] = None,
         model_away_pct: Optional[float] = None,
+        model_artifact: Optional[str] = None,
     ) -> None:
-        try:
-            home_full, home_abbr = get_team_identity(home_team)
-            away_full, away_abbr = get_team_identity(away_team)
-            winner_full, winner_abbr = get_team_identity(predicted_winner)
-        except KeyError as exc:
-            print(f"Skipping prediction history entry: {exc}")
-            return
+        self.upsert_predictions_many(
+            PredictionBatch(
+                display_date=[display_date],
+                iso_date=[iso_date],
+                home_team=[home_team],
+                away_team=[away_team],
+                location=[location],
+                predicted_winner=[predicted_winner],
+                predicted_win_pct=[predicted_win_pct],
+                home_hss=[home_hss],
+                away_hss=[away_hss],
+                tipoff_et=[tipoff_et],
+                model_home_pct=[model_home_pct],
+                model_away_pct=[model_away_pct],
+            ),
+            model_artifact=model_artifact,
+        )
 
-        if model_home_pct is not None and model_away_pct is not None:
-            confidence_gap_pct = abs(model_home_pct - model_away_pct) / 2.0
-        else:
-            confidence_gap_pct = abs(predicted_win_pct - 50.0)
-        expected_margin = round(confidence_gap_pct * 0.4, 2)
-        bucket = self._confidence_bucket(confidence_gap_pct)
+    def upsert_predictions_many(self, batch: PredictionBatch, model_artifact: Optional[str] = None) -> int:
+        """
+        Upsert a batch of predictions. Team identities are resolved once per distinct
+        team, every record shares one generated_at timestamp and existing records are
+        fetched in one lookup. Returns the number of records written.
+        """
+        size = len(batch.iso_date)
+        identities, unknown = _resolve_identities((*batch.home_team, *batch.away_team, *batch.predicted_winner))
+        existing_records = self._store.get_many((self.season, iso_date, home_team, away_team)
+                                                for iso_date, home_team, away_team
+                                                in zip(batch.iso_date, batch.home_team, batch.away_team))
         generated_at = _now_iso()
+        none_column = [None] * size
 
-        record = PredictionRecord(
-            season=self.season,
-            game_date=iso_date,
-            display_date=display_date,
-            game_tipoff_et=tipoff_et,
-            home_team=home_team,
-            away_team=away_team,
-            location=location,
-            predicted_winner=predicted_winner,
-            predicted_win_pct=round(predicted_win_pct, 3),
-            home_hss=round(home_hss, 5),
-            away_hss=round(away_hss, 5),
-            model_home_pct=round(model_home_pct, 3) if model_home_pct is not None else None,
-            model_away_pct=round(model_away_pct, 3) if model_away_pct is not None else None,
-            generated_at=generated_at,
-            expected_margin=expected_margin,
-            confidence_gap_pct=round(confidence_gap_pct, 3),
-            confidence_bucket=bucket,
-            home_team_full=home_full,
-            home_team_abbr=home_abbr,
-            away_team_full=away_full,
-            away_team_abbr=away_abbr,
-            predicted_winner_full=winner_full,
-            predicted_winner_abbr=winner_abbr,
-        )
+        written = 0
+        for (display_date, iso_date, home_team, away_team, location, predicted_winner, predicted_win_pct,
+             home_hss, away_hss, tipoff_et, model_home_pct, model_away_pct) in zip(
+            batch.display_date,
+            batch.iso_date,
+            batch.home_team,
+            batch.away_team,
+            batch.location,
+            batch.predicted_winner,
+            batch.predicted_win_pct,
+            batch.home_hss,
+            batch.away_hss,
+            batch.tipoff_et if batch.tipoff_et is not None else none_column,
+            batch.model_home_pct if batch.model_home_pct is not None else none_column,
+            batch.model_away_pct if batch.model_away_pct is not None else none_column,
+        ):
+            missing = next((team for team in (home_team, away_team, predicted_winner) if team in unknown), None)
+            if missing is not None:
+                print(f"Skipping prediction history entry: {unknown[missing]}")
+                continue
+            home_full, home_abbr = identities[home_team]
+            away_full, away_abbr = identities[away_team]
+            winner_full, winner_abbr = identities[predicted_winner]
+
+            if model_home_pct is not None and model_away_pct is not None:
+                confidence_gap_pct = abs(model_home_pct - model_away_pct) / 2.0
+            else:
+                confidence_gap_pct = abs(predicted_win_pct - 50.0)
+            expected_margin = round(confidence_gap_pct * 0.4, 2)
+            bucket = self._confidence_bucket(confidence_gap_pct)
+
+            record = PredictionRecord(
+                season=self.season,
+                game_date=iso_date,
+                display_date=display_date,
+                game_tipoff_et=tipoff_et,
+                home_team=home_team,
+                away_team=away_team,
+                location=location,
+                predicted_winner=predicted_winner,
+                predicted_win_pct=round(predicted_win_pct, 3),
+                home_hss=round(home_hss, 5),
+                away_hss=round(away_hss, 5),
+                model_home_pct=round(model_home_pct, 3) if model_home_pct is not None else None,
+                model_away_pct=round(model_away_pct, 3) if model_away_pct is not None else None,
+                generated_at=generated_at,
+                model_artifact=model_artifact,
+                expected_margin=expected_margin,
+                confidence_gap_pct=round(confidence_gap_pct, 3),
+                confidence_bucket=bucket,
+                home_team_full=home_full,
+                home_team_abbr=home_abbr,
+                away_team_full=away_full,
+                away_team_abbr=away_abbr,
+                predicted_winner_full=winner_full,
+                predicted_winner_abbr=winner_abbr,
+                last_updated=generated_at,
+            )
 
-        key = record.key()
-        existing = self._records.get(key)
-        if existing:
-            # If game is already completed, do NOT overwrite the prediction
-            # This preserves the original prediction that was made before the game
-            if existing.completed:
-                print(f"  ⚠️  Skipping prediction update for completed game: {home_team} vs {away_team} on {iso_date}")
-                return
-            
-            # Preserve existing actual results but refresh prediction snapshot
-            record.actual_home_score = existing.actual_home_score
-            record.actual_away_score = existing.actual_away_score
-            record.actual_winner = existing.actual_winner
-            record.completed = existing.completed
-            record.correct = existing.correct
-            record.actual_margin = existing.actual_margin
-            record.margin_error = existing.margin_error
-            record.alignment_bucket = existing.alignment_bucket
-            record.last_updated = existing.last_updated
-            if existing.model_home_pct is not None and record.model_home_pct is None:
-                record.model_home_pct = existing.model_home_pct
-            if existing.model_away_pct is not None and record.model_away_pct is None:
-                record.model_away_pct = existing.model_away_pct
-        self._records[key] = record
+            existing = existing_records.get(record.key())
+            if existing:
+                # If game is already completed, do NOT overwrite the prediction
+                # This preserves the original prediction that was made before the game
+                if existing.completed:
+                    print(f"  ⚠️  Skipping prediction update for completed game: {home_team} vs {away_team} on {iso_date}")
+                    continue
+
+                # Preserve existing actual results but refresh prediction snapshot
+                record.actual_home_score = existing.actual_home_score
+                record.actual_away_score = existing.actual_away_score
+                record.actual_winner = existing.actual_winner
+                record.completed = existing.completed
+                record.correct = existing.correct
+                record.actual_margin = existing.actual_margin
+                record.margin_error = existing.margin_error
+                record.alignment_bucket = existing.alignment_bucket
+                record.last_updated = existing.last_updated
+                if existing.model_home_pct is not None and record.model_home_pct is None:
+                    record.model_home_pct = existing.model_home_pct
+                if existing.model_away_pct is not None and record.model_away_pct is None:
+                    record.model_away_pct = existing.model_away_pct
+                record.snapshots = existing.snapshots
+            record.record_snapshot(generated_at, MODEL_SNAPSHOT_FIELDS)
+            self._store.put(record)
+            # A game listed twice in the batch merges into this record, as separate calls would
+            existing_records[record.key()] = record
+            written += 1
+        return written
 
     def upsert_actual_results(
         self,
@@ -241,11 +513,31 @@ class PredictionHistoryManager:
         home_score: int,
         away_score: int,
     ) -> None:
-        key = (self.season, iso_date, home_team, away_team)
-        record = self._records.get(key)
+        record = self._store.get((self.season, iso_date, home_team, away_team))
         if not record:
             return
+        self._apply_result(record, home_score, away_score)
+
+    def apply_results(self, results: Iterable[Tuple[str, str, str, int, int]]) -> int:
+        """
+        Apply many final scores in one pass.
+        'results' holds (iso_date, home_team, away_team, home_score, away_score) tuples.
+        Returns the number of records updated.
+        """
+        applied = 0
+        for iso_date, home_team, away_team, home_score, away_score in results:
+            record = self._store.get((self.season, iso_date, home_team, away_team))
+            if record is None:
+                continue
+            self._apply_result(record, home_score, away_score)
+            applied += 1
+        return applied
 
+    def _apply_result(self, record: PredictionRecord, home_score: int, away_score: int) -> None:
+        # A re-graded game replaces its earlier contribution to the rollups
+        self.rollups.remove(record)
+        home_team = record.home_team
+        away_team = record.away_team
         actual_margin = abs(home_score - away_score)
         predicted_favorite = record.predicted_winner
         actual_winner = home_team if home_score > away_score else away_team
@@ -272,14 +564,34 @@ class PredictionHistoryManager:
             "alignment_bucket": alignment,
         }
         record.update_from_dict(updated_fields)
+        self.rollups.add(record)
+        self._store.put(record)
 
     def to_list(self) -> List[Dict[str, object]]:
-        payload = [record.to_dict() for record in self._records.values()]
-        payload.sort(key=lambda item: (item["game_date"], item["game_tipoff_et"] or ""))
-        return payload
+        return [record.to_dict() for record in self._store.records()]
 
     def pending_games(self) -> List[PredictionRecord]:
-        return [record for record in self._records.values() if not record.completed]
+        return self._store.pending(self.season)
+
+    def games_between(self, start_iso: str, end_iso: str) -> List[PredictionRecord]:
+        """This season's games dated from start_iso to end_iso inclusive, in date order."""
+        return self._store.between(self.season, start_iso, end_iso)
+
+    def games_as_of(self, as_of: str, start_iso: str, end_iso: str) -> List[Tuple[PredictionRecord, Dict[str, object]]]:
+        """
+        This season's games dated start_iso..end_iso paired with their versioned fields as of
+        'as_of'. Games without a snapshot at that time are left out.
+        """
+        results = []
+        for record in self._store.between(self.season, start_iso, end_iso):
+            state = record.snapshot_as_of(as_of)
+            if state is not None:
+                results.append((record, state))
+        return results
+
+    def games_for_team(self, team: str) -> List[PredictionRecord]:
+        """This season's games involving 'team' (home or away), in date order."""
+        return self._store.for_team(self.season, team)
 
     def update_espn_prediction(
         self,
@@ -295,42 +607,98 @@ class PredictionHistoryManager:
         favorite_abbr: Optional[str],
         confidence_gap: Optional[float],
     ) -> None:
-        key = (self.season, iso_date, home_team, away_team)
-        record = self._records.get(key)
-        if not record:
-            return
+        self.update_espn_many(
+            EspnBatch(
+                iso_date=[iso_date],
+                home_team=[home_team],
+                away_team=[away_team],
+                game_id=[game_id],
+                source_url=[source_url],
+                home_pct=[home_pct],
+                away_pct=[away_pct],
+                favorite_full=[favorite_full],
+                favorite_abbr=[favorite_abbr],
+                confidence_gap=[confidence_gap],
+            )
+        )
 
-        espn_pct_for_model = None
-        model_reference_pct = None
-        if record.predicted_winner == home_team:
-            espn_pct_for_model = home_pct
-            model_reference_pct = record.model_home_pct if record.model_home_pct is not None else record.predicted_win_pct
-        elif record.predicted_winner == away_team:
-            espn_pct_for_model = away_pct
-            model_reference_pct = record.model_away_pct if record.model_away_pct is not None else record.predicted_win_pct
+    def update_espn_many(self, batch: EspnBatch) -> int:
+        """
+        Attach ESPN snapshots to existing records in one pass, all stamped with the
+        same check time. Games without a history record are ignored.
+        Returns the number of records updated.
+        """
+        keys = [
+            (self.season, iso_date, home_team, away_team)
+            for iso_date, home_team, away_team in zip(batch.iso_date, batch.home_team, batch.away_team)
+        ]
+        records = self._store.get_many(keys)
+        checked_at = _now_iso()
 
-        model_delta = None
-        if espn_pct_for_model is not None and model_reference_pct is not None:
-            model_delta = round(model_reference_pct - espn_pct_for_model, 3)
+        updated = 0
+        for key, game_id, source_url, home_pct, away_pct, favorite_full, favorite_abbr, confidence_gap in zip(
+            keys,
+            batch.game_id,
+            batch.source_url,
+            batch.home_pct,
+            batch.away_pct,
+            batch.favorite_full,
+            batch.favorite_abbr,
+            batch.confidence_gap,
+        ):
+            record = records.get(key)
+            if not record:
+                continue
+            home_team, away_team = key[2], key[3]
 
-        alignment = None
-        if favorite_abbr is not None and record.predicted_winner_abbr is not None:
-            alignment = "Agree" if favorite_abbr == record.predicted_winner_abbr else "Disagree"
-
-        payload = {
-            "espn_game_id": game_id,
-            "espn_source_url": source_url,
-            "espn_home_pct": home_pct,
-            "espn_away_pct": away_pct,
-            "espn_favorite_full": favorite_full,
-            "espn_favorite_abbr": favorite_abbr,
-            "espn_confidence_gap": confidence_gap,
-            "espn_model_delta_pct": model_delta,
-            "espn_alignment": alignment,
-            "espn_last_checked": _now_iso(),
-        }
-        record.update_from_dict(payload)
+            espn_pct_for_model = None
+            model_reference_pct = None
+            if record.predicted_winner == home_team:
+                espn_pct_for_model = home_pct
+                model_reference_pct = record.model_home_pct if record.model_home_pct is not None else record.predicted_win_pct
+            elif record.predicted_winner == away_team:
+                espn_pct_for_model = away_pct
+                model_reference_pct = record.model_away_pct if record.model_away_pct is not None else record.predicted_win_pct
+
+            model_delta = None
+            if espn_pct_for_model is not None and model_reference_pct is not None:
+                model_delta = round(model_reference_pct - espn_pct_for_model, 3)
+
+            alignment = None
+            if favorite_abbr is not None and record.predicted_winner_abbr is not None:
+                alignment = "Agree" if favorite_abbr == record.predicted_winner_abbr else "Disagree"
+
+            payload = {
+                "espn_game_id": game_id,
+                "espn_source_url": source_url,
+                "espn_home_pct": home_pct,
+                "espn_away_pct": away_pct,
+                "espn_favorite_full": favorite_full,
+                "espn_favorite_abbr": favorite_abbr,
+                "espn_confidence_gap": confidence_gap,
+                "espn_model_delta_pct": model_delta,
+                "espn_alignment": alignment,
+                "espn_last_checked": checked_at,
+            }
+            # Rollups count ESPN agreement for graded games, so swap out the old snapshot's share
+            self.rollups.remove(record)
+            record.update_from_dict(payload, updated_at=checked_at)
+            record.record_snapshot(checked_at, ESPN_SNAPSHOT_FIELDS)
+            self.rollups.add(record)
+            self._store.put(record)
+            updated += 1
+        return updated
 
     def save(self) -> None:
-        with self.storage_path.open("w", encoding="utf-8") as fp:
-            json.dump(self.to_list(), fp, ensure_ascii=False, indent=2)
\ No newline at end of file
+        """
+        Persist this process's changes. The history lock serialises saves from processes
+        sharing the history (prediction runs and result grading), and every tier merges
+        with what is on disk instead of overwriting it.
+        """
+        with self._lock:
+            # Archive first: a crash in between leaves a record in both tiers, never in neither
+            if self._to_archive:
+                self.archive.append(record.to_dict() for record in self._to_archive)
+                self._to_archive.clear()
+            self._store.commit()
+            self.rollups.save()
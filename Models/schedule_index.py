@@ -0,0 +1,203 @@
+"""
+League-wide schedule index for HoopSight AI predictions.
+
+Every game is stored once, keyed by (ISO date, home team, away team), with
+secondary indexes by date and by team. The index can be built from the league
+schedule CSV (``nba_schedule_<season>.csv``) or from the per-team files under
+``Schedule/<team>/<team>.csv``; games that appear in several team files are
+merged into a single entry.
+"""
+
+import bisect
+import csv
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import CURRENT_SEASON_START_YEAR, LEAGUE_SCHEDULE_CSV, SCHEDULE_ROOT
+
+GameKey = Tuple[str, str, str]
+
+
+def normalize_game_date(raw_date: str):
+    """Return the cleaned display string, ISO date, and season year for a game."""
+    cleaned = raw_date.strip().strip('"')
+    try:
+        parsed = datetime.strptime(cleaned, "%a, %b %d, %Y")
+    except ValueError:
+        fallback = f"{cleaned}, {CURRENT_SEASON_START_YEAR}"
+        parsed = datetime.strptime(fallback, "%a, %b %d, %Y")
+    return cleaned, parsed.date().isoformat(), parsed.year
+
+
+@dataclass(frozen=True)
+class ScheduledGame:
+    """A single league game seen from the home team's side."""
+    iso_date: str
+    display_date: str
+    start_time: str
+    home_team: str
+    away_team: str
+    year: int
+    neutral: bool = False
+
+    def key(self) -> GameKey:
+        return (self.iso_date, self.home_team, self.away_team)
+
+    @property
+    def game_date(self) -> date:
+        return date.fromisoformat(self.iso_date)
+
+    @property
+    def location(self) -> str:
+        """Location code from the home team's perspective ("H", or "N" for neutral sites)."""
+        return "N" if self.neutral else "H"
+
+
+class ScheduleIndex:
+    """Games keyed by (date, home, away) with date and team secondary indexes."""
+
+    def __init__(self):
+        self._games: Dict[GameKey, ScheduledGame] = {}
+        self._by_date: Dict[str, List[GameKey]] = {}
+        self._by_team: Dict[str, List[GameKey]] = {}
+        self._dates: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, key: GameKey) -> bool:
+        return key in self._games
+
+    def add_game(self, game: ScheduledGame) -> bool:
+        """Add a game to the index. Returns False if it was already present."""
+        key = game.key()
+        if key in self._games:
+            return False
+        self._games[key] = game
+        if game.iso_date not in self._by_date:
+            bisect.insort(self._dates, game.iso_date)
+        self._by_date.setdefault(game.iso_date, []).append(key)
+        self._by_team.setdefault(game.home_team, []).append(key)
+        self._by_team.setdefault(game.away_team, []).append(key)
+        return True
+
+    def add_league_schedule(self, schedule_csv: Path) -> int:
+        """
+        Load the league schedule CSV (Date, Start Time, Visitor, Home, Arena, Notes).
+        Rows whose date cannot be parsed (such as a header row) are skipped.
+        Returns the number of new games added.
+        """
+        added = 0
+        with Path(schedule_csv).open("r", encoding="utf-8-sig") as f:
+            for row in csv.reader(f):
+                if len(row) < 4:
+                    continue
+                try:
+                    display_date, iso_date, year = normalize_game_date(row[0])
+                except ValueError:
+                    continue
+                game = ScheduledGame(
+                    iso_date=iso_date,
+                    display_date=display_date,
+                    start_time=row[1].strip(),
+                    home_team=row[3].strip(),
+                    away_team=row[2].strip(),
+                    year=year,
+                )
+                added += self.add_game(game)
+        return added
+
+    def add_team_schedule(self, team_name: str, schedule_path: Path) -> int:
+        """
+        Load one team's schedule CSV (Date, Start Time, Opponent, Location, ...).
+        Returns the number of new games added.
+        """
+        added = 0
+        with Path(schedule_path).open("r", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            for row in reader:
+                if len(row) < 4:
+                    continue
+                display_date, iso_date, year = normalize_game_date(row[0])
+                start_time = row[1].strip()
+                opponent = row[2].strip()
+                location = row[3].strip().upper()
+
+                if location == "H":
+                    home_team, away_team, neutral = team_name, opponent, False
+                elif location == "A":
+                    home_team, away_team, neutral = opponent, team_name, False
+                else:
+                    home_team, away_team = sorted([team_name, opponent])
+                    neutral = True
+
+                game = ScheduledGame(
+                    iso_date=iso_date,
+                    display_date=display_date,
+                    start_time=start_time,
+                    home_team=home_team,
+                    away_team=away_team,
+                    year=year,
+                    neutral=neutral,
+                )
+                added += self.add_game(game)
+        return added
+
+    def get(self, key: GameKey) -> Optional[ScheduledGame]:
+        return self._games.get(key)
+
+    def dates(self) -> List[str]:
+        """All ISO dates with at least one game, in ascending order."""
+        return list(self._dates)
+
+    def teams(self) -> List[str]:
+        return sorted(self._by_team)
+
+    def games_on(self, game_date: date) -> List[ScheduledGame]:
+        return [self._games[key] for key in self._by_date.get(game_date.isoformat(), [])]
+
+    def games_between(self, start: Optional[date] = None, end: Optional[date] = None) -> List[ScheduledGame]:
+        """Games with start <= date <= end (either bound may be None), ordered by date."""
+        lo = 0 if start is None else bisect.bisect_left(self._dates, start.isoformat())
+        hi = len(self._dates) if end is None else bisect.bisect_right(self._dates, end.isoformat())
+        games: List[ScheduledGame] = []
+        for iso_date in self._dates[lo:hi]:
+            games.extend(self._games[key] for key in self._by_date[iso_date])
+        return games
+
+    def games_for_team(self, team_name: str) -> List[ScheduledGame]:
+        games = [self._games[key] for key in self._by_team.get(team_name, [])]
+        games.sort(key=lambda game: game.iso_date)
+        return games
+
+
+def build_schedule_index(
+    schedule_root: Path = SCHEDULE_ROOT,
+    league_csv: Optional[Path] = LEAGUE_SCHEDULE_CSV,
+    teams: Optional[Iterable[str]] = None,
+) -> ScheduleIndex:
+    """
+    Build a league index from the league schedule CSV when it exists,
+    otherwise from the per-team schedule files under ``schedule_root``.
+    """
+    index = ScheduleIndex()
+    if league_csv is not None and Path(league_csv).exists():
+        index.add_league_schedule(league_csv)
+        if len(index):
+            return index
+
+    schedule_root = Path(schedule_root)
+    if teams is None:
+        if not schedule_root.exists():
+            return index
+        teams = sorted(folder.name for folder in schedule_root.iterdir() if folder.is_dir())
+    for team in teams:
+        team_file = schedule_root / team / f"{team}.csv"
+        if team_file.exists():
+            index.add_team_schedule(team, team_file)
+        else:
+            print(f"Schedule file not found for {team}: {team_file}")
+    return index
@@ -0,0 +1,218 @@
+"""
+Persistent on-disk scoreboard cache shared by the predictor and the results updater.
+
+Entries are keyed by (source, date) and stored as one JSON file per key under
+``SCOREBOARD_CACHE_DIR/<source>/<YYYYMMDD>.json``. Each entry records whether
+every game on that date was final:
+
+- final entries never expire, since the scores can no longer change;
+- entries with live games expire after ``LIVE_TTL`` seconds;
+- entries with only scheduled games expire after ``SCHEDULED_TTL`` seconds.
+
+When the directory grows past ``max_bytes`` the least recently used entries
+are evicted, non-final ones first. Eviction scans the whole directory, so
+``put`` only runs it every ``EVICT_EVERY_PUTS`` writes; callers also run
+``evict`` once when they are done. Files may vanish while a scan runs (another
+thread or process evicting or replacing them); such files are skipped.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import SCOREBOARD_CACHE_DIR, SCOREBOARD_CACHE_MAX_BYTES
+
+FINAL = "final"
+LIVE = "live"
+SCHEDULED = "scheduled"
+
+LIVE_TTL = 60.0
+SCHEDULED_TTL = 30 * 60.0
+
+_TTL_BY_STATE: Dict[str, Optional[float]] = {FINAL: None, LIVE: LIVE_TTL, SCHEDULED: SCHEDULED_TTL}
+
+# put() checks the cache size once per this many writes
+EVICT_EVERY_PUTS = 50
+
+
+def _date_key(game_date) -> str:
+    if isinstance(game_date, date):
+        return game_date.strftime("%Y%m%d")
+    return str(game_date).replace("-", "")
+
+
+class ScoreboardCache:
+    """Read-through cache of raw scoreboard payloads."""
+
+    def __init__(self, cache_dir: Path = SCOREBOARD_CACHE_DIR, max_bytes: int = SCOREBOARD_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._puts_since_evict = 0
+
+    def _path(self, source: str, game_date) -> Path:
+        return self.cache_dir / source / f"{_date_key(game_date)}.json"
+
+    def get(self, source: str, game_date) -> Optional[object]:
+        """Return the cached payload, or None when missing or expired."""
+        path = self._path(source, game_date)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        ttl = _TTL_BY_STATE.get(entry.get("state"), 0.0)
+        if ttl is not None and time.time() - float(entry.get("fetched_at", 0)) > ttl:
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used for eviction
+        except OSError:
+            pass
+        self.hits += 1
+        return entry.get("payload")
+
+    def put(self, source: str, game_date, payload: object, state: str) -> None:
+        path = self._path(source, game_date)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "source": source,
+            "date": _date_key(game_date),
+            "state": state,
+            "fetched_at": time.time(),
+            "payload": payload,
+        }
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._puts_since_evict += 1
+            due = self._puts_since_evict >= EVICT_EVERY_PUTS
+        if due:
+            self.evict()
+
+    def get_or_fetch(
+        self,
+        source: str,
+        game_date,
+        fetch: Callable[[], Optional[object]],
+        classify: Callable[[object], str],
+    ) -> Optional[object]:
+        """
+        Return the cached payload for (source, date) or call 'fetch', cache its result under
+        the state 'classify' assigns to it, and return it. Failed fetches (None) are not cached.
+        """
+        payload = self.get(source, game_date)
+        if payload is not None:
+            return payload
+        payload = fetch()
+        if payload is not None:
+            self.put(source, game_date, payload, classify(payload))
+        return payload
+
+    def _entries(self) -> List[Tuple[bool, float, int, Path]]:
+        """(is_final, last_used, size, path) for every entry on disk."""
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            try:
+                with path.open("r", encoding="utf-8") as f:
+                    is_final = json.load(f).get("state") == FINAL
+            except (OSError, ValueError):
+                is_final = False  # Unreadable entries go first
+            entries.append((is_final, stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def total_bytes(self) -> int:
+        total = 0
+        if not self.cache_dir.exists():
+            return total
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue  # Evicted or replaced since the glob
+        return total
+
+    def evict(self) -> int:
+        """Delete least recently used entries (non-final first) until under max_bytes."""
+        with self._lock:
+            self._puts_since_evict = 0
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return 0
+
+        entries = self._entries()
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        removed = 0
+        for _, _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+
+def espn_scoreboard_state(payload: Dict[str, object]) -> str:
+    """State of a raw ESPN scoreboard payload."""
+    states = set()
+    for event in payload.get("events", []):
+        competitions = event.get("competitions") or [{}]
+        status = competitions[0].get("status") or event.get("status") or {}
+        states.add((status.get("type") or {}).get("state", "pre"))
+    if not states:
+        return SCHEDULED
+    if states == {"post"}:
+        return FINAL
+    return LIVE if "in" in states else SCHEDULED
+
+
+def cdn_scoreboard_state(payload: Dict[str, object]) -> str:
+    """State of a raw cdn.nba.com scoreboard payload (gameStatus 1 scheduled, 2 live, 3 final)."""
+    statuses = {game.get("gameStatus") for game in payload.get("scoreboard", {}).get("games", [])}
+    if not statuses:
+        return SCHEDULED
+    if statuses == {3}:
+        return FINAL
+    return LIVE if 2 in statuses else SCHEDULED
+
+
+def nba_stats_scoreboard_state(payload: Dict[str, object]) -> str:
+    """State of a normalized stats.nba.com ScoreboardV2 payload (GAME_STATUS_ID 1/2/3)."""
+    statuses = {header.get("GAME_STATUS_ID") for header in payload.get("GameHeader", [])}
+    if not statuses:
+        return SCHEDULED
+    if statuses == {3}:
+        return FINAL
+    return LIVE if 2 in statuses else SCHEDULED
+
+
+# Global instance
+_scoreboard_cache: Optional[ScoreboardCache] = None
+
+
+def get_scoreboard_cache() -> ScoreboardCache:
+    """Get or create the global ScoreboardCache instance."""
+    global _scoreboard_cache
+    if _scoreboard_cache is None:
+        _scoreboard_cache = ScoreboardCache()
+    return _scoreboard_cache
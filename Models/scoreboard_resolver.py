@@ -0,0 +1,207 @@
+"""
+Hedged, concurrent scoreboard resolution across several result sources.
+
+For each date the sources are tried in priority order with hedging: the best
+source starts first, and the next one starts as soon as the previous one fails,
+returns a non-final answer, or has not answered within ``hedge_delay`` seconds.
+The first lookup in which every game is final wins and the remaining requests
+are abandoned. If no source returns an all-final lookup, the first non-empty
+answer is used. Dates after today can never be all-final, so for those the
+first non-empty answer wins straight away. Dates are resolved concurrently.
+
+Source calls run on daemon threads, so an abandoned call never holds up
+interpreter exit. Fetchers are expected to bound their own requests with a
+timeout; ``settle`` waits (up to a deadline) for abandoned calls to finish so
+their latency is recorded before the stats are saved.
+
+Per-source latency and failure counts are persisted between runs. Sources that
+keep failing sink to the back of the priority order.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from config import SOURCE_STATS_JSON, today
+
+# game_id -> {"status", "home", "away", ...} as built by update_prediction_results
+GameLookup = Dict[str, Dict[str, object]]
+SourceFetcher = Callable[[date], Optional[GameLookup]]
+
+HEDGE_DELAY = 2.0
+MAX_CONCURRENT_DATES = 8
+# Longest settle() waits for abandoned source calls (fetchers time out after 15s)
+SETTLE_TIMEOUT = 20.0
+# Weight of the newest sample in the latency / failure moving averages
+EWMA_ALPHA = 0.3
+# Failure rate above which a source is tried only after all healthier ones
+CHRONIC_FAILURE_RATE = 0.5
+MIN_ATTEMPTS_FOR_DEMOTION = 3
+
+
+@dataclass
+class SourceStats:
+    """Running latency and failure statistics for one source."""
+    attempts: int = 0
+    failures: int = 0
+    empty: int = 0
+    avg_latency: float = 0.0
+    failure_rate: float = 0.0
+
+    def record(self, latency: float, failed: bool, empty: bool) -> None:
+        self.attempts += 1
+        self.failures += int(failed)
+        self.empty += int(empty)
+        if self.attempts == 1:
+            self.avg_latency = latency
+            self.failure_rate = float(failed)
+        else:
+            self.avg_latency += EWMA_ALPHA * (latency - self.avg_latency)
+            self.failure_rate += EWMA_ALPHA * (float(failed) - self.failure_rate)
+
+    @property
+    def chronic(self) -> bool:
+        return self.attempts >= MIN_ATTEMPTS_FOR_DEMOTION and self.failure_rate > CHRONIC_FAILURE_RATE
+
+
+def is_final_lookup(lookup: Optional[GameLookup]) -> bool:
+    """True when the lookup has games and every one of them is final."""
+    if not lookup:
+        return False
+    return all("final" in str(game.get("status", "")).lower() for game in lookup.values())
+
+
+class ScoreboardResolver:
+    """
+    Args:
+        sources: (name, fetcher) pairs in default priority order
+        hedge_delay: Seconds to wait on a source before also starting the next one
+        stats_path: JSON file holding per-source stats between runs (None to keep them in memory)
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[Tuple[str, SourceFetcher]],
+        hedge_delay: float = HEDGE_DELAY,
+        stats_path: Optional[Path] = SOURCE_STATS_JSON,
+        max_concurrent_dates: int = MAX_CONCURRENT_DATES,
+    ):
+        self.sources = list(sources)
+        self.hedge_delay = hedge_delay
+        self.stats_path = Path(stats_path) if stats_path is not None else None
+        self.max_concurrent_dates = max(1, max_concurrent_dates)
+        self._lock = threading.Lock()
+        self._in_flight: Set[threading.Thread] = set()
+        self.stats: Dict[str, SourceStats] = {name: SourceStats() for name, _ in self.sources}
+        self._load_stats()
+
+    def _load_stats(self) -> None:
+        if self.stats_path is None or not self.stats_path.exists():
+            return
+        try:
+            with self.stats_path.open("r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        for name, values in stored.items():
+            if name in self.stats and isinstance(values, dict):
+                self.stats[name] = SourceStats(**{key: values[key] for key in asdict(SourceStats()) if key in values})
+
+    def save_stats(self) -> None:
+        if self.stats_path is None:
+            return
+        self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.stats_path.with_name(f".{self.stats_path.name}.tmp")
+        with self._lock:
+            payload = {name: asdict(stats) for name, stats in self.stats.items()}
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, self.stats_path)
+
+    def ordered_sources(self) -> List[Tuple[str, SourceFetcher]]:
+        """Healthy sources first (in default order), chronically failing ones last."""
+        with self._lock:
+            chronic = {name for name, stats in self.stats.items() if stats.chronic}
+        return [source for source in self.sources if source[0] not in chronic] + [
+            source for source in self.sources if source[0] in chronic
+        ]
+
+    def _call(self, name: str, fetcher: SourceFetcher, game_date: date) -> Optional[GameLookup]:
+        started = time.perf_counter()
+        try:
+            lookup = fetcher(game_date)
+        except Exception as exc:  # pylint: disable=broad-except
+            print(f"Source {name} raised for {game_date}: {exc}")
+            lookup = None
+        latency = time.perf_counter() - started
+        with self._lock:
+            self.stats[name].record(latency, failed=lookup is None, empty=lookup == {})
+        return lookup
+
+    def _start(self, name: str, fetcher: SourceFetcher, game_date: date) -> Future:
+        """Run one source call on a daemon thread; the returned future gets its lookup."""
+        future: Future = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(self._call(name, fetcher, game_date))
+            except BaseException as exc:  # pylint: disable=broad-except
+                future.set_exception(exc)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(thread)
+
+        thread = threading.Thread(target=run, name=f"scoreboard-{name}-{game_date}", daemon=True)
+        with self._lock:
+            self._in_flight.add(thread)
+        thread.start()
+        return future
+
+    def resolve(self, game_date: date) -> GameLookup:
+        """Hedged resolution of one date. Returns {} when no source has games for it."""
+        queue = self.ordered_sources()
+        # Scheduled games are never final, so waiting for an all-final answer is pointless
+        need_final = game_date <= today()
+        pending: Dict[Future, str] = {}
+        fallback: Optional[GameLookup] = None
+        while queue or pending:
+            if queue:
+                name, fetcher = queue.pop(0)
+                pending[self._start(name, fetcher, game_date)] = name
+            # Hedge: give the running sources hedge_delay before starting another
+            done, _ = wait(pending, timeout=self.hedge_delay if queue else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                lookup = future.result()
+                if is_final_lookup(lookup) or (lookup and not need_final):
+                    return lookup
+                if lookup and fallback is None:
+                    fallback = lookup
+        return fallback or {}
+
+    def settle(self, timeout: float = SETTLE_TIMEOUT) -> int:
+        """
+        Wait up to 'timeout' seconds for source calls abandoned by resolve() to finish.
+        Returns the number still running; those are daemon threads and their stats are lost.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            threads = list(self._in_flight)
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        with self._lock:
+            return len(self._in_flight)
+
+    def resolve_many(self, dates: Iterable[date]) -> Dict[date, GameLookup]:
+        """Resolve every date concurrently."""
+        dates = list(dates)
+        if not dates:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrent_dates, len(dates))) as pool:
+            return dict(zip(dates, pool.map(self.resolve, dates)))
@@ -0,0 +1,232 @@
+"""
+Vectorized Monte Carlo season simulator for HoopSight AI projected records.
+
+Each remaining game is a Bernoulli trial with the model's home win probability.
+Simulated seasons are drawn in chunks as a (seasons x games) boolean matrix and
+turned into per-team win counts with one matrix product per chunk, so tens of
+thousands of seasons never go through a Python-level loop. Chunks can be spread
+across a process pool; every chunk gets its own child seed so results do not
+depend on the number of workers.
+"""
+
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import STANDINGS_CSV
+
+DEFAULT_SIMULATIONS = 50_000
+DEFAULT_CHUNK_SIZE = 5_000
+DEFAULT_PERCENTILES = (10, 50, 90)
+
+
+def load_standings(standings_csv: Path = STANDINGS_CSV) -> Dict[str, Tuple[int, int]]:
+    """Read Team,Wins,Losses from the standings CSV. Returns {} if the file is missing."""
+    standings: Dict[str, Tuple[int, int]] = {}
+    standings_csv = Path(standings_csv)
+    if not standings_csv.exists():
+        print(f"Warning: Standings file not found at {standings_csv}")
+        return standings
+
+    with standings_csv.open("r", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # Skip header
+        for row in reader:
+            if len(row) < 3:
+                continue
+            try:
+                standings[row[0].strip()] = (int(row[1]), int(row[2]))
+            except ValueError:
+                continue
+    return standings
+
+
+class SeasonSimulator:
+    """
+    Simulates the remaining schedule for a fixed set of teams.
+
+    Args:
+        teams: Team names; position i is team index i everywhere else
+        home_idx: Home team index for each remaining game
+        away_idx: Away team index for each remaining game
+        home_win_prob: Probability (0-1) that the home team wins each game
+        base_wins: Wins already banked per team (defaults to zero)
+        base_losses: Losses already banked per team (defaults to zero)
+    """
+
+    def __init__(
+        self,
+        teams: Sequence[str],
+        home_idx: Sequence[int],
+        away_idx: Sequence[int],
+        home_win_prob: Sequence[float],
+        base_wins: Optional[Sequence[int]] = None,
+        base_losses: Optional[Sequence[int]] = None,
+    ):
+        self.teams = list(teams)
+        n_teams = len(self.teams)
+        self.home_idx = np.asarray(home_idx, dtype=np.intp)
+        self.away_idx = np.asarray(away_idx, dtype=np.intp)
+        self.home_win_prob = np.clip(np.asarray(home_win_prob, dtype=np.float32), 0.0, 1.0)
+        self.base_wins = np.zeros(n_teams, dtype=np.int64) if base_wins is None else np.asarray(base_wins, dtype=np.int64)
+        self.base_losses = (
+            np.zeros(n_teams, dtype=np.int64) if base_losses is None else np.asarray(base_losses, dtype=np.int64)
+        )
+
+        n_games = len(self.home_idx)
+        # wins = draws @ (home_onehot - away_onehot) + away_onehot.sum(axis=0)
+        home_onehot = np.zeros((n_games, n_teams), dtype=np.float32)
+        away_onehot = np.zeros((n_games, n_teams), dtype=np.float32)
+        home_onehot[np.arange(n_games), self.home_idx] = 1.0
+        away_onehot[np.arange(n_games), self.away_idx] = 1.0
+        self._win_delta = home_onehot - away_onehot
+        self._away_wins_if_all_lost = away_onehot.sum(axis=0)
+        self.games_remaining = (home_onehot + away_onehot).sum(axis=0).astype(np.int64)
+
+    @property
+    def n_teams(self) -> int:
+        return len(self.teams)
+
+    @property
+    def n_games(self) -> int:
+        return len(self.home_idx)
+
+    def simulate_chunk(self, n_simulations: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw ``n_simulations`` seasons.
+
+        Returns (home_won, remaining_wins): a (n_simulations x games) bool matrix of game
+        outcomes and a (n_simulations x teams) int matrix of wins over the remaining games.
+        """
+        home_won = rng.random((n_simulations, self.n_games), dtype=np.float32) < self.home_win_prob
+        wins = home_won.astype(np.float32) @ self._win_delta + self._away_wins_if_all_lost
+        return home_won, np.rint(wins).astype(np.int32)
+
+    def iter_chunks(
+        self,
+        n_simulations: int = DEFAULT_SIMULATIONS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        seed: Optional[int] = None,
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield (home_won, remaining_wins) chunks in-process, e.g. for downstream bracket simulation."""
+        for size, child_seed in chunk_plan(n_simulations, chunk_size, seed):
+            yield self.simulate_chunk(size, np.random.default_rng(child_seed))
+
+    def win_histogram(self, n_simulations: int, seed: np.random.SeedSequence) -> np.ndarray:
+        """(teams x max_remaining+1) counts of remaining wins over ``n_simulations`` seasons."""
+        _, wins = self.simulate_chunk(n_simulations, np.random.default_rng(seed))
+        width = int(self.games_remaining.max(initial=0)) + 1
+        offsets = np.arange(self.n_teams, dtype=np.int64) * width
+        flat = (wins + offsets).ravel()
+        return np.bincount(flat, minlength=self.n_teams * width).reshape(self.n_teams, width)
+
+    def run(
+        self,
+        n_simulations: int = DEFAULT_SIMULATIONS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = 1,
+        seed: Optional[int] = None,
+    ) -> "SeasonSimulationResult":
+        """Simulate ``n_simulations`` seasons and aggregate per-team win distributions."""
+        plan = chunk_plan(n_simulations, chunk_size, seed)
+        width = int(self.games_remaining.max(initial=0)) + 1
+        histogram = np.zeros((self.n_teams, width), dtype=np.int64)
+
+        if workers > 1 and len(plan) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_win_histogram_task, self, size, child) for size, child in plan]
+                for future in futures:
+                    histogram += future.result()
+        else:
+            for size, child in plan:
+                histogram += self.win_histogram(size, child)
+
+        return SeasonSimulationResult(
+            teams=self.teams,
+            n_simulations=n_simulations,
+            base_wins=self.base_wins,
+            base_losses=self.base_losses,
+            games_remaining=self.games_remaining,
+            remaining_win_counts=histogram,
+        )
+
+
+def chunk_plan(n_simulations: int, chunk_size: int, seed: Optional[int]) -> List[Tuple[int, np.random.SeedSequence]]:
+    """Split ``n_simulations`` into chunk sizes, each paired with an independent child seed."""
+    chunk_size = max(1, chunk_size)
+    sizes = [chunk_size] * (n_simulations // chunk_size)
+    if n_simulations % chunk_size:
+        sizes.append(n_simulations % chunk_size)
+    children = np.random.SeedSequence(seed).spawn(len(sizes))
+    return list(zip(sizes, children))
+
+
+def _win_histogram_task(simulator: SeasonSimulator, n_simulations: int, seed: np.random.SeedSequence) -> np.ndarray:
+    return simulator.win_histogram(n_simulations, seed)
+
+
+@dataclass
+class SeasonSimulationResult:
+    """Aggregated output of a season simulation."""
+    teams: List[str]
+    n_simulations: int
+    base_wins: np.ndarray
+    base_losses: np.ndarray
+    games_remaining: np.ndarray
+    remaining_win_counts: np.ndarray  # teams x (max_remaining + 1)
+
+    @property
+    def mean_wins(self) -> np.ndarray:
+        """Expected final wins per team."""
+        wins = np.arange(self.remaining_win_counts.shape[1])
+        return self.base_wins + (self.remaining_win_counts @ wins) / max(self.n_simulations, 1)
+
+    @property
+    def mean_losses(self) -> np.ndarray:
+        """Expected final losses per team."""
+        return self.base_losses + self.base_wins + self.games_remaining - self.mean_wins
+
+    def win_percentiles(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[float, np.ndarray]:
+        """Final-win percentiles per team, read off the exact integer win distribution."""
+        cumulative = np.cumsum(self.remaining_win_counts, axis=1)
+        result: Dict[float, np.ndarray] = {}
+        for pct in percentiles:
+            threshold = pct / 100.0 * self.n_simulations
+            remaining = (cumulative < threshold).sum(axis=1)
+            result[pct] = self.base_wins + remaining
+        return result
+
+    def win_distribution(self, team: str) -> Dict[int, float]:
+        """Probability of each final win total for ``team`` (only non-zero entries)."""
+        idx = self.teams.index(team)
+        counts = self.remaining_win_counts[idx]
+        base = int(self.base_wins[idx])
+        return {
+            base + wins: count / self.n_simulations
+            for wins, count in enumerate(counts.tolist())
+            if count
+        }
+
+    def to_dict(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, object]:
+        pct_values = self.win_percentiles(percentiles)
+        mean_wins = self.mean_wins
+        mean_losses = self.mean_losses
+        teams = []
+        for idx, team in enumerate(self.teams):
+            teams.append({
+                "team": team,
+                "current_wins": int(self.base_wins[idx]),
+                "current_losses": int(self.base_losses[idx]),
+                "games_remaining": int(self.games_remaining[idx]),
+                "mean_wins": round(float(mean_wins[idx]), 3),
+                "mean_losses": round(float(mean_losses[idx]), 3),
+                "win_percentiles": {str(pct): int(values[idx]) for pct, values in pct_values.items()},
+                "win_distribution": {
+                    str(wins): round(prob, 6) for wins, prob in self.win_distribution(team).items()
+                },
+            })
+        return {"n_simulations": self.n_simulations, "teams": teams}
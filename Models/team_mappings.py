@@ -1,4 +1,4 @@
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 TEAM_NAME_LOOKUP: Dict[str, Tuple[str, str]] = {
     "Atlanta": ("Atlanta Hawks", "ATL"),
@@ -69,6 +69,72 @@ TEAM_NAME_LOOKUP["Brooklyn"] = TEAM_NAME_LOOKUP["Brooklyn"]
 TEAM_NAME_LOOKUP["LA Lakers"] = TEAM_NAME_LOOKUP["LA Lakers"]
 TEAM_NAME_LOOKUP["LA Clippers"] = TEAM_NAME_LOOKUP["LA Clippers"]
 
+EASTERN_CONFERENCE = (
+    "Atlanta", "Boston", "Brooklyn", "Charlotte", "Chicago", "Cleveland", "Detroit", "Indiana",
+    "Miami", "Milwaukee", "New York", "Orlando", "Philadelphia", "Toronto", "Washington",
+)
+WESTERN_CONFERENCE = (
+    "Dallas", "Denver", "Golden State", "Houston", "LA Clippers", "LA Lakers", "Memphis", "Minnesota",
+    "New Orleans", "Oklahoma City", "Phoenix", "Portland", "Sacramento", "San Antonio", "Utah",
+)
+TEAM_CONFERENCE: Dict[str, str] = {
+    **{team: "East" for team in EASTERN_CONFERENCE},
+    **{team: "West" for team in WESTERN_CONFERENCE},
+}
+
+# Abbreviation -> team name, including franchise abbreviations used in past seasons
+TEAM_BY_ABBREVIATION: Dict[str, str] = {
+    TEAM_NAME_LOOKUP[team][1]: team for team in EASTERN_CONFERENCE + WESTERN_CONFERENCE
+}
+TEAM_BY_ABBREVIATION.update({
+    "NJN": "Brooklyn",
+    "CHH": "Charlotte",
+    "SEA": "Oklahoma City",
+    "NOH": "New Orleans",
+    "NOK": "New Orleans",
+    "VAN": "Memphis",
+})
+
+# Abbreviations as used by ESPN, the NBA CDN and stats.nba.com -> the abbreviation used here
+ABBREVIATION_CANONICAL: Dict[str, str] = {
+    "ATL": "ATL",
+    "BOS": "BOS",
+    "BKN": "BKN",
+    "CHA": "CHA",
+    "CHI": "CHI",
+    "CLE": "CLE",
+    "DAL": "DAL",
+    "DEN": "DEN",
+    "DET": "DET",
+    "GS": "GSW",
+    "GSW": "GSW",
+    "HOU": "HOU",
+    "IND": "IND",
+    "LAC": "LAC",
+    "LAL": "LAL",
+    "MEM": "MEM",
+    "MIA": "MIA",
+    "MIL": "MIL",
+    "MIN": "MIN",
+    "NO": "NOP",
+    "NOP": "NOP",
+    "NY": "NYK",
+    "NYK": "NYK",
+    "OKC": "OKC",
+    "ORL": "ORL",
+    "PHI": "PHI",
+    "PHX": "PHX",
+    "POR": "POR",
+    "SAC": "SAC",
+    "SA": "SAS",
+    "SAS": "SAS",
+    "TOR": "TOR",
+    "UTA": "UTA",
+    "UTAH": "UTA",
+    "WAS": "WAS",
+    "WSH": "WAS",
+}
+
 
 def get_team_identity(team_name: str) -> Tuple[str, str]:
     """Return the full name and abbreviation for a given team alias."""
@@ -76,3 +142,19 @@ def get_team_identity(team_name: str) -> Tuple[str, str]:
     if normalized not in TEAM_NAME_LOOKUP:
         raise KeyError(f"Unrecognized team name: {team_name}")
     return TEAM_NAME_LOOKUP[normalized]
+
+
+def team_from_abbreviation(abbr: str) -> str:
+    """Return the team name used across the project for a current or past abbreviation."""
+    normalized = abbr.strip().upper()
+    if normalized not in TEAM_BY_ABBREVIATION:
+        raise KeyError(f"Unrecognized team abbreviation: {abbr}")
+    return TEAM_BY_ABBREVIATION[normalized]
+
+
+def canonical_abbreviation(abbr: Optional[str]) -> Optional[str]:
+    """Normalize a source-specific abbreviation (e.g. ESPN's "GS", "NY") to the project's form."""
+    if abbr is None:
+        return None
+    upper = abbr.strip().upper()
+    return ABBREVIATION_CANONICAL.get(upper, upper)
@@ -1,11 +1,23 @@
 from datetime import date, datetime, timedelta
-from typing import Dict, Iterable, Optional, Sequence
+from typing import Dict, Iterable, Optional, Sequence, Tuple
 
 import requests
 from nba_api.stats.endpoints import scoreboardv2
 
-from config import CURRENT_SEASON
+from config import CURRENT_SEASON, RUN_REPORT_DIR, today
+from instrumentation import count, get_instrumentation, stage, timed
 from prediction_history import PredictionHistoryManager
+from scoreboard_cache import (
+    cdn_scoreboard_state,
+    espn_scoreboard_state,
+    get_scoreboard_cache,
+    nba_stats_scoreboard_state,
+)
+from scoreboard_resolver import ScoreboardResolver
+from team_mappings import canonical_abbreviation, get_team_identity
+
+# (ISO date, canonical home abbr, canonical away abbr)
+GameKey = Tuple[str, Optional[str], Optional[str]]
 
 
 def _build_game_lookup(
@@ -99,17 +111,22 @@ def _fetch_espn_scoreboard(game_date: date) -> Optional[Dict[str, Dict[str, obje
         "Referer": "https://www.espn.com/",
     }
 
-    try:
-        response = requests.get(
-            "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard",
-            params=params,
-            headers=headers,
-            timeout=15,
-        )
-        response.raise_for_status()
-        payload = response.json()
-    except Exception as exc:  # pylint: disable=broad-except
-        print(f"Unable to fetch ESPN scoreboard for {params['dates']}: {exc}")
+    def download() -> Optional[Dict[str, object]]:
+        try:
+            response = requests.get(
+                "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard",
+                params=params,
+                headers=headers,
+                timeout=15,
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as exc:  # pylint: disable=broad-except
+            print(f"Unable to fetch ESPN scoreboard for {params['dates']}: {exc}")
+            return None
+
+    payload = get_scoreboard_cache().get_or_fetch("espn", game_date, download, espn_scoreboard_state)
+    if payload is None:
         return None
 
     events = payload.get("events", [])
@@ -168,12 +185,17 @@ def _fetch_cdn_scoreboard(game_date: date) -> Optional[Dict[str, Dict[str, objec
         "Accept": "application/json",
     }
 
-    try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        payload = response.json()
-    except Exception as exc:  # pylint: disable=broad-except
-        print(f"Unable to fetch CDN scoreboard for {ymd}: {exc}")
+    def download() -> Optional[Dict[str, object]]:
+        try:
+            response = requests.get(url, headers=headers, timeout=15)
+            response.raise_for_status()
+            return response.json()
+        except Exception as exc:  # pylint: disable=broad-except
+            print(f"Unable to fetch CDN scoreboard for {ymd}: {exc}")
+            return None
+
+    payload = get_scoreboard_cache().get_or_fetch("cdn", game_date, download, cdn_scoreboard_state)
+    if payload is None:
         return None
 
     games = payload.get("scoreboard", {}).get("games", [])
@@ -211,32 +233,77 @@ def _fetch_cdn_scoreboard(game_date: date) -> Optional[Dict[str, Dict[str, objec
     return lookup
 
 
-def _fetch_scoreboard_lookup(game_date: date) -> Dict[str, Dict[str, object]]:
-    """Fetch scoreboard data with fallback mechanisms."""
-
-    espn_lookup = _fetch_espn_scoreboard(game_date)
-    if espn_lookup is not None:
-        if espn_lookup:
-            return espn_lookup
-
-    cdn_lookup = _fetch_cdn_scoreboard(game_date)
-    if cdn_lookup is not None:
-        if cdn_lookup:
-            return cdn_lookup
+def _fetch_stats_scoreboard(game_date: date) -> Optional[Dict[str, Dict[str, object]]]:
+    """Fetch scoreboard data from stats.nba.com through nba_api's ScoreboardV2."""
 
     formatted_date = game_date.strftime("%m/%d/%Y")
-    try:
-        scoreboard = scoreboardv2.ScoreboardV2(game_date=formatted_date, league_id="00")
-    except Exception as exc:  # pylint: disable=broad-except
-        print(f"Unable to fetch NBA Stats scoreboard for {formatted_date}: {exc}")
-        return {}
 
-    normalized = scoreboard.get_normalized_dict()
+    def download() -> Optional[Dict[str, object]]:
+        try:
+            scoreboard = scoreboardv2.ScoreboardV2(game_date=formatted_date, league_id="00", timeout=15)
+        except Exception as exc:  # pylint: disable=broad-except
+            print(f"Unable to fetch NBA Stats scoreboard for {formatted_date}: {exc}")
+            return None
+        return scoreboard.get_normalized_dict()
+
+    normalized = get_scoreboard_cache().get_or_fetch("nba_stats", game_date, download, nba_stats_scoreboard_state)
+    if normalized is None:
+        return None
     line_scores = normalized.get("LineScore", [])
     game_headers = normalized.get("GameHeader", [])
     return _build_game_lookup(game_headers, line_scores)
 
 
+# Result sources in default priority order
+SCOREBOARD_SOURCES = (
+    ("espn", _fetch_espn_scoreboard),
+    ("cdn", _fetch_cdn_scoreboard),
+    ("nba_stats", _fetch_stats_scoreboard),
+)
+
+_resolver: Optional[ScoreboardResolver] = None
+
+
+def get_scoreboard_resolver() -> ScoreboardResolver:
+    """Get or create the global ScoreboardResolver over SCOREBOARD_SOURCES."""
+    global _resolver
+    if _resolver is None:
+        _resolver = ScoreboardResolver(SCOREBOARD_SOURCES)
+    return _resolver
+
+
+@timed("results_fetch")
+def _fetch_scoreboard_lookup(game_date: date) -> Dict[str, Dict[str, object]]:
+    """Fetch scoreboard data, hedging across all sources."""
+    return get_scoreboard_resolver().resolve(game_date)
+
+
+def index_scoreboard(game_date: date, lookup: Dict[str, Dict[str, object]]) -> Dict[GameKey, Dict[str, object]]:
+    """Key a scoreboard lookup by (ISO date, canonical home abbr, canonical away abbr)."""
+    iso_date = game_date.isoformat()
+    indexed: Dict[GameKey, Dict[str, object]] = {}
+    for game in lookup.values():
+        home = game.get("home")
+        away = game.get("away")
+        if not home or not away:
+            continue
+        key = (iso_date, canonical_abbreviation(home.get("abbr")), canonical_abbreviation(away.get("abbr")))
+        indexed.setdefault(key, game)
+    return indexed
+
+
+def _record_game_key(record) -> GameKey:
+    home_abbr = record.home_team_abbr
+    away_abbr = record.away_team_abbr
+    try:
+        home_abbr = home_abbr or get_team_identity(record.home_team)[1]
+        away_abbr = away_abbr or get_team_identity(record.away_team)[1]
+    except KeyError:
+        home_abbr = home_abbr or record.home_team
+        away_abbr = away_abbr or record.away_team
+    return (record.game_date, canonical_abbreviation(home_abbr), canonical_abbreviation(away_abbr))
+
+
 def _ensure_date_string(value: str) -> str:
     if "/" in value:
         # Already mm/dd/yyyy
@@ -248,8 +315,9 @@ def _ensure_date_string(value: str) -> str:
 
 
 def update_recent_results(days_back: int = 5, days_forward: int = 1) -> None:
-    manager = PredictionHistoryManager(CURRENT_SEASON)
-    today = date.today()
+    with stage("history_load"):
+        manager = PredictionHistoryManager(CURRENT_SEASON)
+    run_date = today()
     pending = manager.pending_games()
 
     if not pending:
@@ -259,56 +327,53 @@ def update_recent_results(days_back: int = 5, days_forward: int = 1) -> None:
     targets = {}
     for record in pending:
         record_date = datetime.strptime(record.game_date, "%Y-%m-%d").date()
-        if record_date < today - timedelta(days=days_back):
+        if record_date < run_date - timedelta(days=days_back):
             continue
-        if record_date > today + timedelta(days=days_forward):
+        if record_date > run_date + timedelta(days=days_forward):
             continue
         targets.setdefault(record_date, []).append(record)
 
-    for game_date, records in sorted(targets.items()):
-        lookup = _fetch_scoreboard_lookup(game_date)
-        if not lookup:
-            continue
+    resolver = get_scoreboard_resolver()
+    with stage("results_fetch"):
+        lookups = resolver.resolve_many(sorted(targets))
 
+    score_index: Dict[GameKey, Dict[str, object]] = {}
+    for game_date, lookup in lookups.items():
+        score_index.update(index_scoreboard(game_date, lookup))
+
+    results = []
+    for records in targets.values():
         for record in records:
-            match = None
-            for game in lookup.values():
-                home = game.get("home")
-                away = game.get("away")
-                if not home or not away:
-                    continue
-                record_home_abbr = (record.home_team_abbr or record.home_team).upper()
-                record_away_abbr = (record.away_team_abbr or record.away_team).upper()
-                home_abbr = (home.get("abbr") or "").upper()
-                away_abbr = (away.get("abbr") or "").upper()
-                if home_abbr == record_home_abbr and away_abbr == record_away_abbr:
-                    match = game
-                    break
+            match = score_index.get(_record_game_key(record))
             if not match:
                 continue
 
-            home_info = match.get("home")
-            away_info = match.get("away")
-            if not home_info or not away_info:
-                continue
-
-            home_pts = home_info.get("pts")
-            away_pts = away_info.get("pts")
+            home_pts = match["home"].get("pts")
+            away_pts = match["away"].get("pts")
             status = match.get("status", "").lower()
 
             if home_pts is None or away_pts is None or "final" not in status:
                 continue
 
-            manager.upsert_actual_results(
-                iso_date=record.game_date,
-                home_team=record.home_team,
-                away_team=record.away_team,
-                home_score=home_pts,
-                away_score=away_pts,
-            )
+            results.append((record.game_date, record.home_team, record.away_team, home_pts, away_pts))
+
+    count("results_applied", manager.apply_results(results))
+
+    with stage("history_save"):
+        manager.save()
+
+    # Hedged requests that lost the race may still be running; record them before saving
+    still_running = resolver.settle()
+    if still_running:
+        print(f"{still_running} abandoned scoreboard request(s) still running; their stats are not saved.")
+    resolver.save_stats()
 
-    manager.save()
+    cache = get_scoreboard_cache()
+    cache.evict()
+    count("scoreboard_cache_hits", cache.hits)
+    count("scoreboard_cache_misses", cache.misses)
 
 
 if __name__ == "__main__":
     update_recent_results()
+    get_instrumentation().write_report(RUN_REPORT_DIR / "results_update.json")
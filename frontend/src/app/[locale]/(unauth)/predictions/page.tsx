@@ -86,11 +86,34 @@ interface TeamSummary {
   upcoming: number;
 }
 
-async function loadPredictionHistory(): Promise<PredictionRecord[]> {
-  const historyPath = path.resolve(process.cwd(), '..', 'Front', 'CSVFiles', 'prediction_history.json');
+interface HistoryPartition {
+  season: string;
+  month: string;
+  path: string;
+  records: number;
+  first_date: string;
+  last_date: string;
+}
+
+// Reads only the history partitions overlapping [startDate, endDate] (YYYY-MM-DD, open when omitted).
+async function loadPredictionHistory(startDate?: string, endDate?: string): Promise<PredictionRecord[]> {
+  const historyDir = path.resolve(process.cwd(), '..', 'Front', 'CSVFiles', 'prediction_history');
   try {
-    const raw = await fs.readFile(historyPath, 'utf8');
-    const parsed: PredictionRecord[] = JSON.parse(raw);
+    const manifest: { partitions?: HistoryPartition[] } = JSON.parse(
+      await fs.readFile(path.join(historyDir, 'manifest.json'), 'utf8'),
+    );
+    const partitions = (manifest.partitions ?? []).filter(
+      (partition) => (!startDate || partition.last_date >= startDate) && (!endDate || partition.first_date <= endDate),
+    );
+    const chunks = await Promise.all(
+      partitions.map(async (partition) => {
+        const raw = await fs.readFile(path.join(historyDir, partition.path), 'utf8');
+        return JSON.parse(raw) as PredictionRecord[];
+      }),
+    );
+    const parsed = chunks
+      .flat()
+      .filter((entry) => (!startDate || entry.game_date >= startDate) && (!endDate || entry.game_date <= endDate));
     return parsed.map((entry) => ({
       ...entry,
       predicted_win_pct: Number(entry.predicted_win_pct ?? 0),
@@ -5,7 +5,7 @@ HoopSight AI - Automation Verification Script
 This script verifies that the automated prediction system is working correctly:
 1. Checks that completed games aren't being re-predicted
 2. Verifies only tomorrow's games are in prediction_results.csv
-3. Ensures prediction_history.json preserves actual results
+3. Ensures the prediction history preserves actual results
 4. Validates data freshness timestamps
 """
 
@@ -14,6 +14,30 @@ import csv
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
+# Days of history (before today) loaded for the completed-game checks
+HISTORY_WINDOW_DAYS = 30
+
+
+def load_history_window(history_dir, start_iso):
+    """
+    Load the history partitions whose date range reaches start_iso or later.
+    Returns (rows dated start_iso or later, total record count from the manifest).
+    Raises ValueError on a missing or invalid manifest or partition.
+    """
+    manifest_path = history_dir / "manifest.json"
+    if not manifest_path.exists():
+        raise ValueError("manifest.json not found")
+    with manifest_path.open("r", encoding="utf-8") as f:
+        partitions = json.load(f).get("partitions", [])
+
+    rows = []
+    for entry in partitions:
+        if entry["last_date"] < start_iso:
+            continue
+        with (history_dir / entry["path"]).open("r", encoding="utf-8") as f:
+            rows.extend(row for row in json.load(f) if row.get("game_date", "") >= start_iso)
+    return rows, sum(entry.get("records", 0) for entry in partitions)
+
 
 def main():
     print("=" * 70)
@@ -22,22 +46,21 @@ def main():
     print()
 
     project_root = Path(__file__).parent
-    history_file = project_root / "Front" / "CSVFiles" / "prediction_history.json"
+    history_dir = project_root / "Front" / "CSVFiles" / "prediction_history"
     results_file = project_root / "Front" / "CSVFiles" / "prediction_results.csv"
     injuries_file = project_root / "Data_Gathering_&_Cleaning" / "injuries.csv"
 
-    # Check 1: Verify prediction_history.json exists and is valid
-    print("[1/5] Checking prediction_history.json...")
-    if not history_file.exists():
-        print("  ❌ FAIL: prediction_history.json not found")
-        return False
-
+    # Check 1: Verify the prediction history exists and is valid
+    print("[1/5] Checking prediction history...")
+    window_start = (date.today() - timedelta(days=HISTORY_WINDOW_DAYS)).isoformat()
     try:
-        with history_file.open("r", encoding="utf-8") as f:
-            history = json.load(f)
-        print(f"  ✅ PASS: Loaded {len(history)} prediction records")
-    except json.JSONDecodeError as e:
-        print(f"  ❌ FAIL: Invalid JSON - {e}")
+        history, total_records = load_history_window(history_dir, window_start)
+        print(f"  ✅ PASS: Loaded {len(history)} prediction records since {window_start}")
+    except FileNotFoundError as e:
+        print(f"  ❌ FAIL: History partition not found - {e}")
+        return False
+    except (ValueError, KeyError) as e:
+        print(f"  ❌ FAIL: Invalid prediction history - {e}")
         return False
 
     # Check 2: Verify completed games have actual results
@@ -133,7 +156,7 @@ def main():
     print("\n" + "=" * 70)
     print("VERIFICATION SUMMARY")
     print("=" * 70)
-    print(f"Total predictions in history: {len(history)}")
+    print(f"Total predictions in history: {total_records}")
     print(f"Completed games: {len(completed_games)}")
     print(f"Active predictions in CSV: {len(rows)}")
     print(f"Prediction accuracy: {calculate_accuracy(completed_games):.1f}%")